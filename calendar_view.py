@@ -0,0 +1,193 @@
+"""
+Date-range lookup and HTML card rendering for the Calendar page.
+
+Events are fetched a month-aligned window at a time with a Notion date
+filter, then kept sorted by start time so week, month and custom ranges are
+binary searches. Card fields are resolved once per DataFrame and formatted
+with vectorised pandas string operations, so building the cards for a month
+of events costs about the same as for a week.
+"""
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from notion_cache import DATA_SOURCE_TTL_SECONDS, query_data_source
+
+# Length of the predefined ranges offered on the Calendar page.
+CALENDAR_RANGE_DAYS = {"Week": 7, "Month": 31}
+
+# Candidate column names for each card field, in order of preference.
+EVENT_COLUMNS = ["Event", "Name", "Title"]
+DESCRIPTION_COLUMNS = ["Description", "Discription", "Brief Description"]
+TAG_COLUMNS = ["Tag", "Tags"]
+TEAMS_URL_COLUMNS = ["Teams Link", "Teams URL", "Teams Url", "URL", "Link"]
+
+CALENDAR_CARD_STYLE = (
+    "<style>"
+    ".cal-wrap { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 12px; }"
+    ".cal-card { border: 1px solid #e3e8ef; border-radius: 12px; padding: 14px; background: linear-gradient(180deg, #ffffff 0%, #f8fbff 100%); }"
+    ".cal-date { font-size: 0.85rem; font-weight: 700; color: #4294c2; margin-bottom: 6px; }"
+    ".cal-event { font-size: 1.05rem; font-weight: 700; color: #14213d; margin-bottom: 6px; }"
+    ".cal-desc { font-size: 0.85rem; color: #2f3e46; margin-bottom: 8px; }"
+    ".cal-meta { font-size: 0.85rem; color: #495057; margin-bottom: 4px; }"
+    ".cal-link a { color: #4294c2; text-decoration: none; }"
+    ".cal-link a:hover { text-decoration: underline; }"
+    "</style>"
+)
+
+
+class CalendarIndex:
+    """
+    Calendar events sorted by start time.
+
+    Range lookups binary-search the sorted `DatetimeIndex` instead of
+    building a boolean mask over every row.
+    """
+
+    def __init__(self, events: pd.DataFrame):
+        events = events.copy()
+        if "Date" not in events.columns:
+            events["Date"] = pd.Series(dtype="datetime64[ns, UTC]")
+        events["Date"] = pd.to_datetime(events["Date"], format="mixed", dayfirst=False, utc=True, errors="coerce")
+        self.events = events.dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+        self._starts = pd.DatetimeIndex(self.events["Date"])
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def between(self, start: date, end: date) -> pd.DataFrame:
+        """Events whose UTC start date falls between `start` and `end`, inclusive."""
+        lo = self._starts.searchsorted(pd.Timestamp(start, tz="UTC"), side="left")
+        hi = self._starts.searchsorted(pd.Timestamp(end + timedelta(days=1), tz="UTC"), side="left")
+        return self.events.iloc[lo:hi]
+
+
+def calendar_fetch_window(start: date, end: date) -> tuple[date, date]:
+    """
+    Widen a requested range to whole months.
+
+    Week, month and custom ranges inside the same months then share one
+    cached fetch.
+    """
+    window_start = start.replace(day=1)
+    next_month = (end.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return window_start, next_month - timedelta(days=1)
+
+
+def date_range_filter(property_name: str, start: date, end: date) -> dict:
+    """Notion query filter for a date property within [start, end], padded a day for timezones."""
+    return {
+        "and": [
+            {"property": property_name, "date": {"on_or_after": (start - timedelta(days=1)).isoformat()}},
+            {"property": property_name, "date": {"on_or_before": (end + timedelta(days=1)).isoformat()}},
+        ]
+    }
+
+
+@st.cache_data(ttl=DATA_SOURCE_TTL_SECONDS, show_spinner=False)
+def load_calendar_index(data_source_id: str, window_start: date, window_end: date) -> CalendarIndex:
+    """
+    Fetch one window of calendar events (filtered by Notion) and index it.
+
+    The app never writes to the calendar, so the TTL is the only invalidation.
+    """
+    events = query_data_source(data_source_id, date_range_filter("Date", window_start, window_end))
+    return CalendarIndex(events)
+
+
+def _column_as_text(column: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Convert one column to text.
+
+    Returns:
+        (text, present) where `present` is False for missing values and empty
+        lists, mirroring how a missing cell falls through to the next candidate
+    """
+    if column.dtype == object:
+        is_list = column.map(lambda value: isinstance(value, (list, tuple, set)))
+        if is_list.any():
+            joined = column[is_list].map(
+                lambda items: ", ".join(str(item) for item in items if pd.notna(item))
+            )
+            column = column.where(~is_list, joined)
+            present = column.notna() & ~(is_list & (column == ""))
+            return column.fillna("").astype(str), present
+    present = column.notna()
+    return column.astype("string").fillna("").astype(str), present
+
+
+def resolve_text(events: pd.DataFrame, options: list[str]) -> pd.Series:
+    """
+    Return the first present value among candidate columns for every row.
+
+    Resolution happens once per DataFrame rather than once per cell.
+    """
+    result = pd.Series("", index=events.index, dtype=object)
+    found = pd.Series(False, index=events.index)
+    for name in options:
+        if name not in events.columns:
+            continue
+        text, present = _column_as_text(events[name])
+        take = present & ~found
+        result = result.where(~take, text)
+        found |= present
+        if found.all():
+            break
+    return result
+
+
+def escape_html(values: pd.Series) -> pd.Series:
+    """Vectorised equivalent of `html.escape(value, quote=True)`."""
+    return (
+        values.astype(str)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+        .str.replace("'", "&#x27;", regex=False)
+    )
+
+
+def format_start_datetimes(dates: pd.Series) -> pd.Series:
+    """Format UTC timestamps in the local timezone, in one pass over the column."""
+    local_tz = datetime.now().astimezone().tzinfo
+    if getattr(dates.dt, "tz", None) is not None:
+        dates = dates.dt.tz_convert(local_tz)
+    return dates.dt.strftime("%a %d %b %Y, %H:%M").fillna("No start date")
+
+
+def _or_default(values: pd.Series, default: str) -> pd.Series:
+    return values.where(values != "", default)
+
+
+def build_calendar_cards_html(events: pd.DataFrame) -> str:
+    """
+    Build the card grid HTML for calendar events.
+
+    Args:
+        events: Calendar rows with a timezone-aware `Date` column, already sorted
+
+    Returns:
+        HTML string for `st.html`
+    """
+    date_str = escape_html(format_start_datetimes(events["Date"]))
+    event = escape_html(_or_default(resolve_text(events, EVENT_COLUMNS), "Untitled Event"))
+    desc = escape_html(_or_default(resolve_text(events, DESCRIPTION_COLUMNS), "No description"))
+    tag = escape_html(_or_default(resolve_text(events, TAG_COLUMNS), "N/A"))
+    teams_url = resolve_text(events, TEAMS_URL_COLUMNS)
+
+    teams_html = (
+        '<a href="' + escape_html(teams_url) + '" target="_blank" rel="noopener noreferrer">Open Teams</a>'
+    ).where(teams_url != "", "N/A")
+
+    cards = (
+        '<div class="cal-card">'
+        + '<div class="cal-date">' + date_str + "</div>"
+        + '<div class="cal-event">' + event + "</div>"
+        + '<div class="cal-desc">' + desc + "</div>"
+        + '<div class="cal-meta"><b>Tag:</b> ' + tag + "</div>"
+        + '<div class="cal-meta cal-link"><b>Teams URL:</b> ' + teams_html + "</div>"
+        + "</div>"
+    )
+    return CALENDAR_CARD_STYLE + '<div class="cal-wrap">' + "".join(cards.tolist()) + "</div>"
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic NHS Jobs application exports with known answers.
+
+The text mirrors what `extract_pdf_text` returns for a real export: an
+index of applicants, then one page per section for each candidate, every
+page starting with the job heading and the candidate's name, reference and
+email. Three layouts are produced:
+
+- anchor: each candidate starts with an "Academic Qualifications" page
+- protected: no anchors; each candidate ends with the "Convictions/cautions
+  not protected" declaration, which the splitter falls back to
+- both: anchors and declarations, like the real exports
+
+The ground truth (name and reference per candidate, in order) is returned
+with the text, so split results can be checked exactly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+JOB_HEADING = "NHS GP - Health Care Assistant A4718-26-0003"
+LAYOUTS = ("anchor", "protected", "both")
+# latin: accented Latin names and typographic punctuation (round-trips through PDF);
+# mixed: also Greek, Cyrillic, Arabic and CJK phrases in free text (PDF extraction may reorder them).
+UNICODE_LEVELS = ("ascii", "latin", "mixed")
+LINES_PER_PAGE = 48
+
+ASCII_GIVEN = ["Bianca", "Clare", "Nikhil", "Summaiya", "Junaid", "Zahida", "Rheanne", "Kismat", "Caitlin", "Shola",
+               "Amir", "Grace", "Tomasz", "Priya", "Oluwaseun", "Hannah", "Mohammed", "Emily", "Kwame", "Sofia"]
+ASCII_FAMILY = ["Tennant", "McLeish", "Rai", "Rathod", "Manal", "Dost", "Nawazi", "Mohamed", "Ince", "Gurung",
+                "Forde", "Olasimoju", "Hussain", "Patel", "Williams", "Okafor", "Nowak", "Evans", "Begum", "O'Neill"]
+LATIN_GIVEN = ["Zoë", "Łukasz", "Siobhán", "José", "Ayşe", "Chloé", "Małgorzata", "Søren", "Renée", "Bogdán",
+               "Thị Hoa", "Ăn", "Jürgen", "Íde", "Nuño", "Anaïs", "Dóra", "Ștefan", "Agnė", "Gráinne"]
+LATIN_FAMILY = ["Brontë", "Wójcik", "Ní Bhriain", "Núñez", "Yılmaz", "Lefèvre", "Kowalczyk", "Ørsted", "Dubé",
+                "Nguyễn", "Müller", "Ó Súilleabháin", "García-Peña", "Čapek", "Dvořák", "Żuławski", "Şahin",
+                "Kovačić", "Ruíz", "Þórsdóttir"]
+MIXED_PHRASES = ["Ελληνικά για ασθενείς", "русский язык (разговорный)", "اللغة العربية", "中文 (普通话)", "हिन्दी", "اردو"]
+
+EMPLOYERS = ["Circle Health Group", "HCA Healthcare", "Barts Health NHS Trust", "Boots UK", "Bupa Care Homes",
+             "Guy's and St Thomas' NHS Foundation Trust", "Medway Practice", "Lloyds Pharmacy", "Care UK"]
+JOB_TITLES = ["Health Care Assistant", "Senior Health Care Assistant", "Phlebotomist", "Care Worker",
+              "Receptionist", "Pharmacy Assistant", "Support Worker", "Nursing Associate"]
+TASKS = [
+    "I performed ECGs, venepuncture and observations, recording results accurately in the clinical system.",
+    "I supported nurses and GPs in clinics, preparing rooms and restocking consumables.",
+    "I communicated with patients and families to explain procedures and obtain consent.",
+    "I followed infection prevention and control policies and completed daily cleaning audits.",
+    "I escalated deteriorating patients using NEWS2 and documented handovers.",
+    "I managed chronic disease recall lists and booked long-term condition reviews.",
+    "I carried out new patient health checks including height, weight, BP and urinalysis.",
+]
+
+
+@dataclass
+class CandidateTruth:
+    name: str
+    reference: str
+    email: str
+    first_page: int
+    page_count: int
+
+
+@dataclass
+class Corpus:
+    text: str
+    pages: list[str]
+    candidates: list[CandidateTruth] = field(default_factory=list)
+    layout: str = "both"
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.text.encode("utf-8"))
+
+    def truth(self) -> list[tuple[str, str]]:
+        """(name, reference) per candidate, in document order."""
+        return [(candidate.name, candidate.reference) for candidate in self.candidates]
+
+
+def _typography(text: str, unicode_level: str) -> str:
+    if unicode_level == "ascii":
+        return text
+    return text.replace("'", "’").replace(" - ", " – ")
+
+
+def _names(rng: random.Random, count: int, unicode_level: str) -> list[str]:
+    given, family = list(ASCII_GIVEN), list(ASCII_FAMILY)
+    if unicode_level != "ascii":
+        given += LATIN_GIVEN
+        family += LATIN_FAMILY
+    names: list[str] = []
+    seen: set[str] = set()
+    for index in range(count):
+        name = f"{rng.choice(given)} {rng.choice(family)}"
+        if name in seen:
+            name = f"{name} {index + 1}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _email(name: str, index: int) -> str:
+    local = "".join(character for character in name.casefold() if character.isascii() and character.isalnum())
+    return f"{local or 'candidate'}{index}@example.nhs.uk"
+
+
+def _section_lines(rng: random.Random, section: str, rows: int, unicode_level: str) -> list[str]:
+    if section == "academic":
+        lines = ["Subject Place of study Result Qualification Dates", "type"]
+        for _ in range(rows):
+            year = rng.randint(2005, 2024)
+            lines.append(f"{rng.choice(['English', 'Math', 'Biology', 'Health and Social Care'])} "
+                         f"{rng.choice(['Manley Summers', 'Inspire London College', 'City College'])} "
+                         f"Level {rng.randint(1, 5)} Diploma Sep {year} to Jul")
+            lines.append(str(year + 1))
+        return lines
+    if section == "professional":
+        lines = ["Course title Training provider Year obtained"]
+        for _ in range(rows):
+            lines.append(f"{rng.choice(['Venepuncture', 'Care Certificate', 'ECG Interpretation', 'Basic Life Support'])} "
+                         f"{rng.choice(['Vein Train', 'Caredemy', 'MK Training'])} {rng.randint(2010, 2026)}")
+        return lines
+    lines = []
+    job = 1
+    while len(lines) < rows:
+        start = rng.randint(2010, 2023)
+        lines += [f"Job {job}", f"Job title {rng.choice(JOB_TITLES)}", f"Employer {rng.choice(EMPLOYERS)}",
+                  f"Dates {rng.choice(['Jan', 'Apr', 'Sep'])} {start} to {rng.choice(['Mar', 'Jun', 'Dec'])} {start + rng.randint(1, 4)}"]
+        tasks = " ".join(rng.sample(TASKS, 3))
+        if unicode_level == "mixed":
+            tasks += f" Languages: {rng.choice(MIXED_PHRASES)}."
+        words = _typography(f"Key tasks {tasks}", unicode_level).split()
+        line = ""
+        for word in words:
+            if len(line) + len(word) > 68:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}".strip()
+        lines.append(line)
+        job += 1
+    return lines[:rows]
+
+
+def generate_corpus(
+    candidates: int = 13,
+    pages_per_candidate: int = 6,
+    layout: str = "both",
+    unicode_level: str = "latin",
+    lines_per_page: int = LINES_PER_PAGE,
+    seed: int = 0,
+) -> Corpus:
+    """
+    Build one synthetic export.
+
+    Args:
+        candidates: Number of applicants
+        pages_per_candidate: Pages per applicant, at least 2
+        layout: "anchor", "protected" or "both"
+        unicode_level: "ascii", "latin" or "mixed"
+        lines_per_page: Body lines per page, excluding the two header lines
+        seed: Seed for names, references and content
+
+    Returns:
+        Corpus: Page texts, the joined text and the ground truth
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}")
+    if unicode_level not in UNICODE_LEVELS:
+        raise ValueError(f"unicode_level must be one of {', '.join(UNICODE_LEVELS)}")
+    rng = random.Random(seed)
+    pages_per_candidate = max(2, pages_per_candidate)
+    names = _names(rng, candidates, unicode_level)
+    references = [f"AR-26{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}-{10000 + index * 7 + rng.randint(0, 6)}"
+                  for index in range(candidates)]
+    emails = [_email(name, index) for index, name in enumerate(names)]
+
+    pages: list[str] = []
+    index_rows = [f"{reference} {name} {email} 07{rng.randint(100000000, 999999999)}"
+                  for reference, name, email in zip(references, names, emails)]
+    index_header = [f"{candidates} applications for NHS GP - Health", "Care Assistant A4718-26-0003",
+                    "Downloaded on 11 July 2026", "Application Reference Name Email Phone"]
+    for start in range(0, max(1, len(index_rows)), lines_per_page):
+        rows = index_rows[start:start + lines_per_page]
+        header = index_header if start == 0 else []
+        pages.append("\n".join(header + rows + ["Contains confidential information"]))
+
+    truth: list[CandidateTruth] = []
+    for name, reference, email in zip(names, references, emails):
+        header = [JOB_HEADING, f"{name} {reference} {email}"]
+        first_heading = "Academic Qualifications" if layout in ("anchor", "both") else "Education and qualifications"
+        candidate_pages = [
+            [first_heading] + _section_lines(rng, "academic", min(6, lines_per_page // 2), unicode_level),
+            ["Professional and vocational qualification"] + _section_lines(rng, "professional", min(8, lines_per_page - 1), unicode_level),
+        ]
+        for _ in range(pages_per_candidate - 3):
+            candidate_pages.append(["Job history"] + _section_lines(rng, "jobs", lines_per_page - 1, unicode_level))
+        closing = ["Supporting information", _typography("I'd welcome the chance to join the practice team.", unicode_level),
+                   "Criminal record", _typography("You asked about If they've got When they'll tell you", unicode_level),
+                   "them", "Convictions/cautions not No"]
+        if layout in ("protected", "both"):
+            closing.append("protected")
+        if pages_per_candidate == 2:
+            candidate_pages[-1] += closing
+        else:
+            candidate_pages.append(closing)
+        truth.append(CandidateTruth(name, reference, email, len(pages) + 1, len(candidate_pages)))
+        pages += ["\n".join(header + body) for body in candidate_pages]
+
+    # extract_pdf_text joins page texts, each ending in a newline, with "\n".
+    text = "\n".join(page + "\n" for page in pages).strip()
+    return Corpus(text=text, pages=pages, candidates=truth, layout=layout)
+
+
+def corpus_to_pdf(corpus: Corpus, font_size: float = 8.0) -> bytes:
+    """
+    Render one PDF page per corpus page.
+
+    Text is laid out with PyMuPDF's HTML box so fallback fonts cover
+    non-Latin characters; long pages are scaled down to fit. A monospace
+    font is used because the proportional one forms ligatures ("ﬁ"), which
+    the NHS exports do not contain and which would hide the
+    "Academic Qualifications" anchors from the splitter.
+    """
+    import html
+
+    import fitz
+
+    doc = fitz.open()
+    try:
+        for page_text in corpus.pages:
+            page = doc.new_page(width=595, height=842)
+            body = html.escape(page_text)
+            page.insert_htmlbox(
+                fitz.Rect(36, 36, 559, 806),
+                f'<pre style="font-family: monospace; font-size: {font_size}pt">{body}</pre>',
+            )
+        doc.subset_fonts()
+        return doc.tobytes(garbage=3, deflate=True)
+    finally:
+        doc.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path("synthetic_corpus"), help="Output directory (default: ./synthetic_corpus)")
+    parser.add_argument("--candidates", type=int, default=13)
+    parser.add_argument("--pages-per-candidate", type=int, default=6)
+    parser.add_argument("--layout", choices=LAYOUTS, default="both")
+    parser.add_argument("--unicode", choices=UNICODE_LEVELS, default="latin", dest="unicode_level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf", action="store_true", help="Also write the export as a PDF")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.candidates, args.pages_per_candidate, args.layout, args.unicode_level, seed=args.seed)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    (args.output_dir / "candidates.txt").write_text(corpus.text, encoding="utf-8")
+    truth = {"layout": corpus.layout, "pages": len(corpus.pages), "candidates": [asdict(candidate) for candidate in corpus.candidates]}
+    (args.output_dir / "truth.json").write_text(json.dumps(truth, indent=2, ensure_ascii=False), encoding="utf-8")
+    written = ["candidates.txt", "truth.json"]
+    if args.pdf:
+        (args.output_dir / "applications.pdf").write_bytes(corpus_to_pdf(corpus))
+        written.append("applications.pdf")
+    print(f"{len(corpus.candidates)} candidates, {len(corpus.pages)} pages, {corpus.size_bytes / 1e6:.2f} MB of text "
+          f"in {args.output_dir.resolve()}: {', '.join(written)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Compare forecast chart renderers: first chart in a fresh process and repeat renders."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from weather_forecast import CHART_RENDERERS
+
+MARKER = "--forecast-chart-benchmark--"
+
+
+def _benchmark_script(renderer: str, hours: int, repeat: int, output_dir: str) -> str:
+    # Runs in a fresh interpreter so the first render includes import and
+    # style/font setup, exactly as on the first forecast after a restart.
+    return f"""
+import json, time
+import numpy as np
+import pandas as pd
+import weather_forecast as wf
+wf.DATA_PATH = wf.Path({output_dir!r})
+hours = np.arange({hours})
+frame = pd.DataFrame({{
+    "date": pd.date_range("2026-01-01", periods={hours}, freq="h", tz="UTC"),
+    "temperature_2m": 10 + 5 * np.sin(hours / 24 * 2 * np.pi),
+    "apparent_temperature": 8 + 5 * np.sin(hours / 24 * 2 * np.pi),
+    "rain": np.clip(np.sin(hours / 7), 0, None),
+    "cloud_cover": 50 + 50 * np.sin(hours / 11),
+}})
+start = time.perf_counter()
+wf.create_forecast_charts(frame, "first", renderer={renderer!r})
+first = time.perf_counter() - start
+runs = []
+for index in range({repeat}):
+    start = time.perf_counter()
+    wf.create_forecast_charts(frame, f"run-{{index}}", renderer={renderer!r})
+    runs.append(time.perf_counter() - start)
+print({MARKER!r}, json.dumps({{"first": first, "runs": runs}}))
+"""
+
+
+def run_benchmark(renderer: str, hours: int = 168, repeat: int = 10) -> dict:
+    """
+    Render the two forecast charts with `renderer` in a fresh interpreter.
+
+    Returns:
+        dict: "first" (seconds for the first pair of charts, imports included)
+        and "runs" (seconds per pair for `repeat` further renders)
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        completed = subprocess.run(
+            [sys.executable, "-c", _benchmark_script(renderer, hours, repeat, output_dir)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    result_lines = [line for line in completed.stdout.splitlines() if line.startswith(MARKER)]
+    if not result_lines:
+        last_line = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise RuntimeError(f"{renderer} benchmark failed: {last_line[0]}")
+    return json.loads(result_lines[-1][len(MARKER):])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=int, default=168, help="Hourly points per chart (default: 168, 7 days)")
+    parser.add_argument("--repeat", type=int, default=10, help="Renders after the first one (default: 10)")
+    parser.add_argument("--renderers", nargs="+", default=list(CHART_RENDERERS), choices=CHART_RENDERERS)
+    args = parser.parse_args()
+
+    print(f"Two charts per render, {args.hours} hourly points, {args.repeat} repeat renders\n")
+    print(f"{'renderer':<12} {'first (cold)':>13} {'repeat median':>14} {'repeat min':>11}")
+    print("-" * 53)
+    for renderer in args.renderers:
+        result = run_benchmark(renderer, args.hours, args.repeat)
+        runs = sorted(result["runs"]) or [float("nan")]
+        median = runs[len(runs) // 2]
+        print(f"{renderer:<12} {result['first'] * 1000:>10.0f} ms {median * 1000:>11.0f} ms {runs[0] * 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
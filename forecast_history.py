@@ -0,0 +1,132 @@
+"""
+Append-only history of weather forecast runs.
+
+Every run's hourly forecast is written as one Parquet file per site under a
+`run_date=YYYY-MM-DD` partition, so the whole history can be read as a
+partitioned dataset while finding the previous run for a site only needs a
+directory listing. Also keeps the Notion page created for each site per day
+so a later run can update that page instead of adding another.
+"""
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_HISTORY_PATH = Path("weather-images") / "forecast-history"
+# Leading underscore keeps the index out of the Parquet dataset.
+PAGE_INDEX_FILE = "_pages.json"
+FORECAST_COLUMNS = ["temperature_2m", "apparent_temperature", "rain", "cloud_cover"]
+# File-name part written by run_path for the run time (%H%M%S).
+RUN_TIME_GLOB = "[0-9]" * 6
+
+
+def site_slug(site: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", site.lower()).strip("-")
+
+
+def run_path(site: str, run_at: datetime, root: Path = DEFAULT_HISTORY_PATH) -> Path:
+    return Path(root) / f"run_date={run_at:%Y-%m-%d}" / f"{site_slug(site)}-{run_at:%H%M%S}.parquet"
+
+
+def store_run(site: str, hourly_dataframe: pd.DataFrame, run_at: datetime, root: Path = DEFAULT_HISTORY_PATH) -> Path:
+    """
+    Write one site's forecast for a run. Existing runs are never modified.
+
+    Returns:
+        Path: The Parquet file written
+    """
+    path = run_path(site, run_at, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame = hourly_dataframe[["date", *FORECAST_COLUMNS]].assign(site=site, run_at=pd.Timestamp(run_at))
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".parquet")
+    os.close(fd)
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def previous_run_path(site: str, before: datetime, root: Path = DEFAULT_HISTORY_PATH) -> Path | None:
+    """Latest stored run for `site` earlier than `before`, found from file names alone."""
+    root = Path(root)
+    if not root.exists():
+        return None
+    cutoff = f"run_date={before:%Y-%m-%d}/{site_slug(site)}-{before:%H%M%S}"
+    for partition in sorted(root.glob("run_date=*"), reverse=True):
+        if partition.name > f"run_date={before:%Y-%m-%d}":
+            continue
+        # Exactly HHMMSS after the slug, so "site" does not pick up runs of "site-2".
+        candidates = sorted(partition.glob(f"{site_slug(site)}-{RUN_TIME_GLOB}.parquet"), reverse=True)
+        for candidate in candidates:
+            if f"{partition.name}/{candidate.stem}" < cutoff:
+                return candidate
+    return None
+
+
+def load_run(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def load_history(root: Path = DEFAULT_HISTORY_PATH, site: str | None = None) -> pd.DataFrame:
+    """Read every stored run (optionally for one site) as a single DataFrame with a run_date column."""
+    filters = [("site", "==", site)] if site else None
+    return pd.read_parquet(root, filters=filters)
+
+
+def diff_runs(current: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two runs hour by hour over the hours both forecast.
+
+    Returns:
+        DataFrame: date, each forecast column from the current run, and a
+        `<column>_change` column (current minus previous)
+    """
+    merged = current[["date", *FORECAST_COLUMNS]].merge(
+        previous[["date", *FORECAST_COLUMNS]], on="date", how="inner", suffixes=("", "_previous")
+    )
+    changes = merged[FORECAST_COLUMNS].to_numpy() - merged[[f"{name}_previous" for name in FORECAST_COLUMNS]].to_numpy()
+    diff = merged[["date", *FORECAST_COLUMNS]].copy()
+    diff[[f"{name}_change" for name in FORECAST_COLUMNS]] = changes
+    return diff
+
+
+def summarize_diff(diff: pd.DataFrame) -> dict:
+    """Headline changes between two runs."""
+    if diff.empty:
+        return {"hours_compared": 0}
+    temperature_change = diff["temperature_2m_change"]
+    largest = temperature_change.abs().idxmax()
+    return {
+        "hours_compared": len(diff),
+        "max_temperature_change": round(float(temperature_change[largest]), 1),
+        "max_temperature_change_at": diff.at[largest, "date"].isoformat(),
+        "mean_temperature_change": round(float(temperature_change.mean()), 2),
+        "rain_total_change": round(float(diff["rain_change"].sum()), 1),
+        "mean_cloud_cover_change": round(float(diff["cloud_cover_change"].mean()), 1),
+    }
+
+
+def _load_page_index(root: Path) -> dict:
+    try:
+        return json.loads((Path(root) / PAGE_INDEX_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def page_for(site: str, notion_date: str, root: Path = DEFAULT_HISTORY_PATH) -> str | None:
+    """Notion page created for `site` on `notion_date`, if this machine created one."""
+    return _load_page_index(root).get(notion_date, {}).get(site)
+
+
+def record_page(site: str, notion_date: str, page_id: str, root: Path = DEFAULT_HISTORY_PATH) -> None:
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    index = _load_page_index(root)
+    index.setdefault(notion_date, {})[site] = page_id
+    fd, tmp_path = tempfile.mkstemp(dir=root, prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(index, handle, indent=2)
+    os.replace(tmp_path, root / PAGE_INDEX_FILE)
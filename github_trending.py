@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Fetch GitHub trending repositories for several languages and periods at once.
+
+Each (language, period) pair of the fetch matrix is scraped concurrently,
+then the lists are merged in memory so a repository trending in several
+lists appears once with its stars for every period. Each run's star counts
+are appended to a local history file, from which trending velocity is
+computed without querying GitHub again.
+
+Set GITHUB_TRENDING_FIXTURE to a JSON file recorded with `--record` to run
+everything offline against a fixed snapshot.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+TRENDING_LANGUAGES = ["python"]
+TRENDING_PERIODS = ["daily"]
+# Shortest period first; used to pick the most recent star count for a repo.
+PERIOD_ORDER = ["daily", "weekly", "monthly"]
+TRENDING_PER_LIST = 20
+SPOKEN_LANGUAGE = "en"
+FETCH_WORKERS = 6
+
+DEFAULT_HISTORY_PATH = Path(".github-trending-history.csv")
+HISTORY_COLUMNS = ["date", "repo", "language", "stars", "daily", "weekly", "monthly"]
+FIXTURE_ENV_VAR = "GITHUB_TRENDING_FIXTURE"
+
+Fetcher = Callable[[str, str], list]
+
+
+def gtrending_fetcher(language: str, period: str) -> list:
+    """Scrape one trending list from GitHub."""
+    import gtrending
+
+    return gtrending.fetch_repos(language=language, spoken_language_code=SPOKEN_LANGUAGE, since=period)
+
+
+def fixture_key(language: str, period: str) -> str:
+    return f"{language}/{period}"
+
+
+class FixtureFetcher:
+    """
+    Serve trending lists from a JSON snapshot instead of GitHub.
+
+    The file maps "language/period" to the list gtrending returned; missing
+    lists are served as empty.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.lists = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def __call__(self, language: str, period: str) -> list:
+        return self.lists.get(fixture_key(language, period), [])
+
+
+def default_fetcher() -> Fetcher:
+    """The fixture named by GITHUB_TRENDING_FIXTURE if set, otherwise live GitHub."""
+    fixture_path = os.getenv(FIXTURE_ENV_VAR)
+    return FixtureFetcher(fixture_path) if fixture_path else gtrending_fetcher
+
+
+def fetch_matrix(languages: list[str], periods: list[str], fetcher: Fetcher | None = None,
+                 max_workers: int = FETCH_WORKERS) -> dict[tuple[str, str], list]:
+    """
+    Fetch every (language, period) list concurrently.
+
+    Returns:
+        dict: Raw repository lists keyed by (language, period)
+    """
+    fetcher = fetcher or default_fetcher()
+    cells = [(language, period) for language in languages for period in periods]
+    if not cells:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(cells))) as executor:
+        results = executor.map(lambda cell: fetcher(*cell), cells)
+        return dict(zip(cells, results))
+
+
+def merge_trending(lists: dict[tuple[str, str], list], per_list: int = TRENDING_PER_LIST) -> list[dict]:
+    """
+    Merge trending lists into one entry per repository.
+
+    Each entry keeps gtrending's fields and adds the stars gained in every
+    period the repo trended in. `currentPeriodStars` is the daily count, or
+    None when the repo only trended weekly or monthly.
+
+    Args:
+        lists: Output of fetch_matrix
+        per_list: Number of repositories taken from the top of each list
+
+    Returns:
+        list: Merged repositories in first-seen order (matrix order, then rank)
+    """
+    merged: dict[str, dict] = {}
+    for (language, period), repos in lists.items():
+        for repo in repos[:per_list]:
+            entry = merged.get(repo["fullname"])
+            if entry is None:
+                entry = {**repo, "language": repo.get("language") or language, "period_stars": {}}
+                merged[repo["fullname"]] = entry
+            entry["stars"] = max(int(entry["stars"]), int(repo["stars"]))
+            entry["period_stars"][period] = int(repo["currentPeriodStars"])
+    for entry in merged.values():
+        entry["currentPeriodStars"] = entry["period_stars"].get("daily")
+    return list(merged.values())
+
+
+def fetch_trending(languages: list[str] | None = None, periods: list[str] | None = None,
+                   per_list: int = TRENDING_PER_LIST, fetcher: Fetcher | None = None) -> list[dict]:
+    """Fetch the configured matrix and return merged, de-duplicated repositories."""
+    lists = fetch_matrix(languages or TRENDING_LANGUAGES, periods or TRENDING_PERIODS, fetcher)
+    return merge_trending(lists, per_list)
+
+
+def history_rows(repos: list[dict], run_date: date) -> pd.DataFrame:
+    """One history row per merged repository for a run."""
+    rows = [
+        {
+            "date": run_date.isoformat(),
+            "repo": repo["fullname"],
+            "language": repo.get("language") or "",
+            "stars": int(repo["stars"]),
+            **{period: repo["period_stars"].get(period) for period in PERIOD_ORDER},
+        }
+        for repo in repos
+    ]
+    return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+
+def load_history(path: Path = DEFAULT_HISTORY_PATH) -> pd.DataFrame:
+    """Return the stored star history, or an empty frame if there is none."""
+    if not Path(path).exists():
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    return pd.read_csv(path, parse_dates=["date"])
+
+
+def record_history(repos: list[dict], run_date: date | None = None, path: Path = DEFAULT_HISTORY_PATH) -> int:
+    """
+    Append a run to the star history.
+
+    Re-running on the same day replaces that day's rows for the repos seen,
+    so the file holds at most one observation per repo per day.
+
+    Returns:
+        int: Rows written for this run
+    """
+    rows = history_rows(repos, run_date or date.today())
+    if rows.empty:
+        return 0
+    path = Path(path)
+    history = load_history(path)
+    if not history.empty:
+        history["date"] = history["date"].dt.date.astype(str)
+        history = pd.concat([history, rows], ignore_index=True)
+        history = history.drop_duplicates(subset=["date", "repo"], keep="last")
+        history.to_csv(path, index=False)
+    else:
+        rows.to_csv(path, index=False)
+    return len(rows)
+
+
+def star_velocity(history: pd.DataFrame, window_days: int = 7) -> pd.DataFrame:
+    """
+    Stars gained per day over the last `window_days`, from stored history.
+
+    Velocity is the change in total stars between a repo's first and last
+    observation in the window, divided by the days between them. Repos seen
+    only once in the window fall back to their latest daily star count.
+
+    Returns:
+        DataFrame: repo, language, stars, observations, stars_per_day; fastest first
+    """
+    if history.empty:
+        return pd.DataFrame(columns=["repo", "language", "stars", "observations", "stars_per_day"])
+    history = history.assign(date=pd.to_datetime(history["date"]))
+    cutoff = history["date"].max() - pd.Timedelta(days=window_days)
+    recent = history[history["date"] >= cutoff].sort_values("date")
+
+    grouped = recent.groupby("repo", sort=False)
+    summary = grouped.agg(
+        language=("language", "last"),
+        first_date=("date", "first"),
+        last_date=("date", "last"),
+        first_stars=("stars", "first"),
+        stars=("stars", "last"),
+        observations=("stars", "size"),
+        latest_daily=("daily", "last"),
+    )
+    days = (summary["last_date"] - summary["first_date"]).dt.days
+    summary["stars_per_day"] = ((summary["stars"] - summary["first_stars"]) / days.where(days > 0)).fillna(
+        summary["latest_daily"]
+    )
+    return (
+        summary.reset_index()[["repo", "language", "stars", "observations", "stars_per_day"]]
+        .sort_values("stars_per_day", ascending=False, ignore_index=True)
+    )
+
+
+def record_fixture(path: Path, languages: list[str], periods: list[str]) -> int:
+    """Save live trending lists to `path` for offline runs; returns the number of lists saved."""
+    lists = fetch_matrix(languages, periods, gtrending_fetcher)
+    snapshot = {fixture_key(language, period): repos for (language, period), repos in lists.items()}
+    Path(path).write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+    return len(snapshot)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fetch GitHub trending repositories for a language x period matrix.")
+    parser.add_argument("--languages", nargs="+", default=TRENDING_LANGUAGES, help="Languages to fetch (default: python)")
+    parser.add_argument("--periods", nargs="+", default=TRENDING_PERIODS, choices=PERIOD_ORDER, help="Periods to fetch (default: daily)")
+    parser.add_argument("--per-list", type=int, default=TRENDING_PER_LIST, help="Repositories taken from each list")
+    parser.add_argument("--fixture", type=Path, help=f"Serve lists from a recorded snapshot (or set {FIXTURE_ENV_VAR})")
+    parser.add_argument("--record", type=Path, help="Record the live lists to this snapshot file and exit")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH, help="Star history file")
+    parser.add_argument("--save-history", action="store_true", help="Append this run to the star history")
+    parser.add_argument("--velocity", type=int, metavar="DAYS", help="Print star velocity over DAYS from history")
+    args = parser.parse_args()
+
+    if args.record:
+        saved = record_fixture(args.record, args.languages, args.periods)
+        print(f"Recorded {saved} lists to {args.record}")
+        return
+
+    if args.velocity:
+        print(star_velocity(load_history(args.history), args.velocity).to_string(index=False))
+        return
+
+    fetcher = FixtureFetcher(args.fixture) if args.fixture else None
+    repos = fetch_trending(args.languages, args.periods, args.per_list, fetcher)
+    for repo in repos:
+        periods = ", ".join(f"{period} +{stars}" for period, stars in repo["period_stars"].items())
+        print(f"{repo['fullname']:<45} {repo['stars']:>8} stars  ({periods})")
+    if args.save_history:
+        written = record_history(repos, path=args.history)
+        print(f"Saved {written} rows to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Local `Repo` -> page_id index for the GitHub trending data source.
+
+The index is kept in a small JSON file and refreshed incrementally: only
+pages edited since the last sync are queried from Notion, so keeping it up to
+date costs a request or two regardless of how much history the data source
+holds. A missing or unreadable file triggers a single full rebuild.
+"""
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from notionhelper import NotionHelper
+
+from notion_cache import iter_query_pages
+
+DEFAULT_INDEX_PATH = Path(".github-trending-index.json")
+# Notion reports last_edited_time to the minute, so incremental syncs overlap
+# the previous one by this much to avoid missing edits.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+def _page_title(page: dict, property_name: str) -> str:
+    title = page.get("properties", {}).get(property_name, {}).get("title", [])
+    return "".join(part.get("plain_text", "") for part in title)
+
+
+def _page_date(page: dict, property_name: str) -> str:
+    date_field = page.get("properties", {}).get(property_name, {}).get("date") or {}
+    return date_field.get("start") or ""
+
+
+class RepoIndex:
+    """
+    Maps repository full names to the Notion page that tracks them.
+
+    When a data source already holds duplicates, the page with the latest
+    `Date` wins, matching the page `delete_duplicate_pages` keeps.
+    """
+
+    def __init__(self, data_source_id: str, path: Path = DEFAULT_INDEX_PATH,
+                 title_property: str = "Repo", date_property: str = "Date"):
+        self.data_source_id = data_source_id
+        self.path = Path(path)
+        self.title_property = title_property
+        self.date_property = date_property
+        self.pages: dict[str, dict] = {}
+        self.synced_at: str | None = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if state.get("data_source_id") != self.data_source_id:
+            return
+        self.pages = state.get("pages", {})
+        self.synced_at = state.get("synced_at")
+
+    def save(self) -> None:
+        """Write the index atomically so an interrupted run never leaves a partial file."""
+        state = {
+            "data_source_id": self.data_source_id,
+            "synced_at": self.synced_at,
+            "pages": self.pages,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self.path)
+
+    def get(self, repo: str) -> str | None:
+        """Page ID tracking `repo`, if any."""
+        entry = self.pages.get(repo)
+        return entry["page_id"] if entry else None
+
+    def set(self, repo: str, page_id: str, date: str = "") -> None:
+        self.pages[repo] = {"page_id": page_id, "date": date}
+
+    def _apply(self, page: dict) -> None:
+        repo = _page_title(page, self.title_property)
+        if not repo:
+            return
+        current = self.pages.get(repo)
+        date = _page_date(page, self.date_property)
+        if current is None or current["page_id"] == page["id"] or date >= current.get("date", ""):
+            self.set(repo, page["id"], date)
+
+    def refresh(self, nh: NotionHelper) -> int:
+        """
+        Bring the index up to date with Notion.
+
+        Args:
+            nh: NotionHelper used for the query
+
+        Returns:
+            int: Number of pages read from Notion
+        """
+        started = datetime.now(timezone.utc)
+        query_filter = None
+        if self.synced_at:
+            since = datetime.fromisoformat(self.synced_at) - SYNC_OVERLAP
+            query_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": since.isoformat()},
+            }
+        else:
+            self.pages = {}
+
+        pages_read = 0
+        for page in iter_query_pages(nh, self.data_source_id, query_filter):
+            self._apply(page)
+            pages_read += 1
+        self.synced_at = started.isoformat()
+        self.save()
+        return pages_read
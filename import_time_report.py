@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Report import cost of each Streamlit page to compare eager vs lazy page loading."""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from typing import NamedTuple
+
+
+# Modules every rerun of streamlit_app.py imports regardless of the page shown.
+BASE_MODULES = ["streamlit", "pandas", "notionhelper", "llm_client", "profiling"]
+
+# What each sidebar page imports the first time it is selected.
+PAGE_MODULES = {
+    "Python Script Runner": ["main", "weather_forecast"],
+    "Partners' Agenda": ["main"],
+    "Team Agenda": ["main"],
+    "Tasks": ["main", "task_context", "llm_cache", "notion_blockify"],
+    "Calendar": [],
+    "Human Resources": [],
+    "Notion Interview Database": ["notion_interviews"],
+    "Write to URL": ["razor_db_create_new_page"],
+    "PDF to PNG": ["pdf_to_png"],
+    "Performance": ["tracing"],
+    "Background Jobs": ["jobs"],
+}
+
+# Heavy dependencies that are deferred until the code path that needs them runs.
+DEFERRED_MODULES = ["fitz", "matplotlib.pyplot", "seaborn", "gtrending"]
+
+# Everything streamlit_app.py imported at the top before pages were loaded lazily.
+EAGER_MODULES = [
+    "groq",
+    "notion_blockify",
+    "main",
+    "notion_interviews",
+    "fitz",
+    "pdf_to_png",
+    "razor_db_create_new_page",
+    "weather_forecast",
+]
+
+MARKER = "--import-time-report--"
+
+
+class ImportTiming(NamedTuple):
+    cold_ms: float
+    rerun_us: float
+    error: str
+
+
+def _measure_script(modules: list[str]) -> str:
+    # Page modules read st.secrets at import; failures after the imports have
+    # run are reported but do not invalidate the timing.
+    return f"""
+import importlib, sys, time
+for name in {BASE_MODULES!r}:
+    importlib.import_module(name)
+sys.stderr.write({MARKER!r} + "\\n")
+error = ""
+start = time.perf_counter()
+for name in {modules!r}:
+    try:
+        importlib.import_module(name)
+    except Exception as exc:
+        error = f"{{name}}: {{type(exc).__name__}}"
+cold = time.perf_counter() - start
+start = time.perf_counter()
+for name in {modules!r}:
+    if name in sys.modules:
+        importlib.import_module(name)
+rerun = time.perf_counter() - start
+print({MARKER!r}, cold * 1000, rerun * 1_000_000, error, sep="\\t")
+"""
+
+
+def measure_imports(modules: list[str], python: str = sys.executable) -> ImportTiming:
+    """
+    Import `modules` in a fresh interpreter on top of BASE_MODULES.
+
+    Returns:
+        Cold import time (ms), repeat-import time as seen on a rerun (µs),
+        and the first import error, if any
+    """
+    if not modules:
+        return ImportTiming(0.0, 0.0, "")
+    completed = subprocess.run(
+        [python, "-c", _measure_script(modules)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    # Some packages print on import, so only the marked result line is parsed.
+    result_lines = [line for line in completed.stdout.splitlines() if line.startswith(MARKER)]
+    fields = result_lines[-1].split("\t")[1:] if result_lines else []
+    if len(fields) != 3:
+        last_line = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        return ImportTiming(float("nan"), float("nan"), last_line[0])
+    cold_ms, rerun_us, error = fields
+    return ImportTiming(float(cold_ms), float(rerun_us), error)
+
+
+def top_imports(modules: list[str], limit: int = 10, python: str = sys.executable) -> list[tuple[str, int]]:
+    """Return the slowest top-level imports (cumulative µs) pulled in by `modules`."""
+    if not modules:
+        return []
+    code = (
+        "import importlib, sys\n"
+        f"for name in {BASE_MODULES!r}: importlib.import_module(name)\n"
+        f"sys.stderr.write({MARKER!r} + '\\n')\n"
+        f"for name in {modules!r}:\n"
+        "    try: importlib.import_module(name)\n"
+        "    except Exception: pass\n"
+    )
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    _, _, after_marker = completed.stderr.partition(MARKER)
+    timings = []
+    for line in after_marker.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, package = line.split("|")
+        # Nested imports are indented two extra spaces per level.
+        if cumulative.strip().isdigit() and not package.startswith("   "):
+            timings.append((package.strip(), int(cumulative)))
+    return sorted(timings, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Fresh interpreters per measurement; the fastest run is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="List the slowest top-level imports for each page",
+    )
+    args = parser.parse_args()
+
+    def best(modules: list[str]) -> ImportTiming:
+        runs = [measure_imports(modules) for _ in range(max(1, args.repeat))]
+        return min(runs, key=lambda timing: timing.cold_ms)
+
+    print(f"Measured on top of base imports: {', '.join(BASE_MODULES)}\n")
+    print(f"{'Page':<28} {'cold import':>12} {'rerun':>10}  modules")
+    print("-" * 80)
+    page_timings = {}
+    for page, modules in PAGE_MODULES.items():
+        timing = best(modules)
+        page_timings[page] = timing
+        note = f"  ({timing.error})" if timing.error else ""
+        print(
+            f"{page:<28} {timing.cold_ms:>9.1f} ms {timing.rerun_us:>7.1f} µs  "
+            f"{', '.join(modules) or '-'}{note}"
+        )
+        if args.details:
+            for name, cumulative in top_imports(modules):
+                print(f"{'':<30}{cumulative / 1000:>8.1f} ms  {name}")
+
+    print("\nDeferred until used:")
+    for module in DEFERRED_MODULES:
+        timing = best([module])
+        print(f"  {module:<26} {timing.cold_ms:>9.1f} ms")
+
+    eager = best(EAGER_MODULES)
+    default_page = next(iter(PAGE_MODULES))
+    lazy = page_timings[default_page]
+    print("\nCold start (first script run):")
+    print(f"  eager, all page modules    {eager.cold_ms:>9.1f} ms")
+    print(f"  lazy, default page only    {lazy.cold_ms:>9.1f} ms  ({default_page})")
+    print("Rerun (modules already in sys.modules):")
+    print(f"  eager import block         {eager.rerun_us:>9.1f} µs")
+    print(f"  lazy page import           {lazy.rerun_us:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed queue for workflows that outlive a Streamlit run.
+
+The app submits a job (a kind from JOB_KINDS plus JSON parameters) and
+polls its status, progress and log lines; closing the tab or rerunning the
+script does not affect it. `python jobs.py worker` runs the worker: a
+supervisor that claims queued jobs and runs each in its own process, up to
+--processes at a time. Run it from the app directory so the jobs can read
+.streamlit/secrets.toml.
+
+Cancelling a queued job removes it from the queue. A running job is asked
+to stop at its next progress update and is terminated if it has not stopped
+after CANCEL_GRACE_SECONDS. A job's params are cleared once it finishes, so
+inputs such as candidate application texts are not kept in the database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import traceback
+from contextlib import closing, redirect_stderr, redirect_stdout
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+JOBS_DB_PATH = Path(os.environ.get("JOBS_DB_PATH", ".jobs.sqlite"))
+DEFAULT_PROCESSES = 2
+POLL_SECONDS = 0.5
+CANCEL_GRACE_SECONDS = 10.0
+# Progress updates closer together than this are not written, except the last.
+PROGRESS_WRITE_INTERVAL = 0.5
+# A worker whose heartbeat is older than this is treated as stopped.
+WORKER_STALE_SECONDS = 15.0
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT NOT NULL DEFAULT '',
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    updated_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS job_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_logs_job ON job_logs (job_id, id);
+CREATE TABLE IF NOT EXISTS workers (
+    pid INTEGER NOT NULL,
+    host TEXT NOT NULL,
+    processes INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    heartbeat_at REAL NOT NULL,
+    PRIMARY KEY (pid, host)
+);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+def _now() -> str:
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+def connect(path: Path = JOBS_DB_PATH) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA busy_timeout=30000")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def submit_job(kind: str, params: dict | None = None, path: Path = JOBS_DB_PATH) -> int:
+    """
+    Queue a job.
+
+    Args:
+        kind: One of JOB_KINDS
+        params: JSON-serialisable keyword arguments for the job; never secrets,
+            which the job reads from st.secrets or the environment in the worker.
+            They are cleared when the job finishes.
+
+    Returns:
+        int: Job id
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind {kind!r}; expected one of {', '.join(JOB_KINDS)}")
+    with closing(connect(path)) as connection:
+        cursor = connection.execute(
+            "INSERT INTO jobs (kind, params, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            (kind, json.dumps(params or {}), _now(), _now()),
+        )
+        return cursor.lastrowid
+
+
+def get_job(job_id: int, path: Path = JOBS_DB_PATH) -> dict | None:
+    with closing(connect(path)) as connection:
+        row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def list_jobs(limit: int = 50, path: Path = JOBS_DB_PATH) -> list[dict]:
+    """Most recent jobs first, without their parameters or results."""
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT id, kind, status, progress, message, error, created_at, started_at, finished_at "
+            "FROM jobs ORDER BY id DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def job_logs(job_id: int, after_id: int = 0, path: Path = JOBS_DB_PATH) -> list[dict]:
+    """Log lines for a job with ids greater than `after_id`, oldest first."""
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT id, ts, message FROM job_logs WHERE job_id = ? AND id > ? ORDER BY id",
+            (job_id, after_id),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def request_cancel(job_id: int, path: Path = JOBS_DB_PATH) -> str | None:
+    """
+    Cancel a job: queued jobs are cancelled at once, running ones are asked to stop.
+
+    Returns:
+        str | None: The job's status afterwards, or None if it does not exist
+    """
+    with closing(connect(path)) as connection:
+        connection.execute(
+            "UPDATE jobs SET status = 'cancelled', params = '{}', finished_at = ?, updated_at = ? WHERE id = ? AND status = 'queued'",
+            (_now(), _now(), job_id),
+        )
+        connection.execute(
+            "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status = 'running'",
+            (_now(), job_id),
+        )
+        row = connection.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return row["status"] if row else None
+
+
+def active_workers(path: Path = JOBS_DB_PATH) -> list[dict]:
+    """Workers that have sent a heartbeat within WORKER_STALE_SECONDS."""
+    with closing(connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT * FROM workers WHERE heartbeat_at >= ?", (time.time() - WORKER_STALE_SECONDS,)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+class JobContext:
+    """
+    Handed to a running job to report progress and log lines.
+
+    `progress(value, text=...)` matches st.progress's signature, so the
+    context can stand in for a progress bar. Every progress update checks
+    for cancellation and raises JobCancelled if it was requested.
+    """
+
+    def __init__(self, job_id: int, connection: sqlite3.Connection):
+        self.job_id = job_id
+        self._connection = connection
+        self._last_write = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        row = self._connection.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (self.job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def progress(self, value: float, text: str | None = None) -> None:
+        now = time.monotonic()
+        if value < 1.0 and now - self._last_write < PROGRESS_WRITE_INTERVAL:
+            return
+        self._last_write = now
+        self._connection.execute(
+            "UPDATE jobs SET progress = ?, message = COALESCE(?, message), updated_at = ? WHERE id = ?",
+            (max(0.0, min(1.0, float(value))), text, _now(), self.job_id),
+        )
+        if text:
+            self.log(text)
+        self.check_cancelled()
+
+    def log(self, message: str) -> None:
+        for line in str(message).rstrip().splitlines() or [""]:
+            self._connection.execute(
+                "INSERT INTO job_logs (job_id, ts, message) VALUES (?, ?, ?)", (self.job_id, _now(), line)
+            )
+
+
+class _LogWriter(io.TextIOBase):
+    """File-like object sending complete lines to the job log, for print() and logging output."""
+
+    def __init__(self, context: JobContext):
+        self._context = context
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            if line.strip():
+                self._context.log(line)
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer.strip():
+            self._context.log(self._buffer)
+        self._buffer = ""
+
+
+# Job implementations. Each takes the context and the job's params and
+# returns a JSON-serialisable result; workflows are imported here so the
+# worker supervisor itself stays light.
+
+def run_interview_summaries_job(context: JobContext, params: dict) -> dict:
+    import streamlit as st
+
+    from notion_cache import get_notion_helper
+    from notion_interviews import summarize_candidates_to_notion_pages
+    from split_candidates import CandidateRecord
+    from summarize_candidates_to_notion import LocalLLMSettings
+
+    candidates = [CandidateRecord(**candidate) for candidate in params["candidates"]]
+    llm_settings = LocalLLMSettings(**{name: value for name, value in params["llm_settings"].items() if name != "api_key"})
+    api_key = st.secrets.get("LLM_API_KEY") or os.environ.get("LLM_API_KEY")
+    if api_key:
+        llm_settings = replace(llm_settings, api_key=api_key)
+    context.log(f"Summarising {len(candidates)} candidates with {llm_settings.model}")
+    succeeded, failed = summarize_candidates_to_notion_pages(
+        get_notion_helper(st.secrets["NOTION_TOKEN"]),
+        params["data_source_id"],
+        candidates,
+        llm_settings,
+        params["job_role"],
+        params["assessment_prompt"],
+        context,
+        log=context.log,
+    )
+    return {"succeeded": succeeded, "failed": failed}
+
+
+def run_github_trending_job(context: JobContext, params: dict) -> dict:
+    from main import run_github_trending_workflow
+
+    context.progress(0.0, text=f"Fetching trending repositories for {', '.join(params.get('languages') or ['all languages'])}")
+    created, updated = run_github_trending_workflow(params.get("languages"), params.get("periods"))
+    context.progress(1.0, text=f"Added {created} and updated {updated} repositories")
+    return {"created": created, "updated": updated}
+
+
+def run_weather_forecast_job(context: JobContext, params: dict) -> list[dict]:
+    import streamlit as st
+
+    from weather_forecast import DEFAULT_WEATHER_DATABASE_ID, run_forecasts
+
+    sites = {name: tuple(coords) for name, coords in (params.get("sites") or {}).items()} or None
+    context.progress(0.0, text=f"Running forecasts for {', '.join(sites or ['the default site'])}")
+    forecasts = run_forecasts(
+        st.secrets["NOTION_TOKEN"],
+        params.get("database_id") or DEFAULT_WEATHER_DATABASE_ID,
+        sites,
+        use_cache=params.get("use_cache", True),
+        update_today=params.get("update_today", False),
+    )
+    context.progress(1.0, text=f"Wrote {len(forecasts)} forecast page(s)")
+    return forecasts
+
+
+JOB_KINDS: dict[str, Callable[[JobContext, dict], Any]] = {
+    "interview_summaries": run_interview_summaries_job,
+    "github_trending": run_github_trending_job,
+    "weather_forecast": run_weather_forecast_job,
+}
+
+
+def _quiet_streamlit() -> None:
+    """Jobs call st.* outside `streamlit run`; keep the bare-mode warnings out of the job logs."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+
+def execute_job(job_id: int, path: Path = JOBS_DB_PATH) -> None:
+    """Run one claimed job to completion in this process and record the outcome."""
+    with closing(connect(path)) as connection:
+        job = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        context = JobContext(job_id, connection)
+        writer = _LogWriter(context)
+        handler = logging.StreamHandler(writer)
+        handler.setLevel(logging.INFO)
+        logging.getLogger().addHandler(handler)
+        status, result, error = "succeeded", None, ""
+        try:
+            _quiet_streamlit()
+            with redirect_stdout(writer), redirect_stderr(writer):
+                result = JOB_KINDS[job["kind"]](context, json.loads(job["params"]))
+        except JobCancelled as exc:
+            status, error = "cancelled", str(exc)
+        except Exception as exc:
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+            context.log(traceback.format_exc())
+        finally:
+            writer.flush()
+            logging.getLogger().removeHandler(handler)
+        connection.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, progress = CASE WHEN ? = 'succeeded' THEN 1 ELSE progress END, "
+            "params = '{}', finished_at = ?, updated_at = ? WHERE id = ?",
+            (status, json.dumps(result, default=str) if result is not None else None, error, status, _now(), _now(), job_id),
+        )
+
+
+def _claim_next(connection: sqlite3.Connection) -> int | None:
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        row = connection.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1").fetchone()
+        if row is not None:
+            connection.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, updated_at = ? WHERE id = ?",
+                (_now(), _now(), row["id"]),
+            )
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    return row["id"] if row else None
+
+
+def _finish_abandoned(connection: sqlite3.Connection, job_id: int, status: str, error: str) -> None:
+    """Record the outcome of a job whose process exited without doing so itself."""
+    connection.execute(
+        "UPDATE jobs SET status = ?, error = ?, params = '{}', finished_at = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+        (status, error, _now(), _now(), job_id),
+    )
+
+
+def run_worker(processes: int = DEFAULT_PROCESSES, path: Path = JOBS_DB_PATH, once: bool = False) -> None:
+    """
+    Claim and run queued jobs until interrupted, each in its own process.
+
+    Jobs left 'running' by a worker on this host that is no longer alive are
+    marked failed at start-up.
+
+    Args:
+        processes: Jobs run at the same time
+        once: Exit when the queue is empty and no job is running
+    """
+    spawn = multiprocessing.get_context("spawn")
+    host = socket.gethostname()
+    running: dict[int, tuple[Any, float | None]] = {}
+    with closing(connect(path)) as connection:
+        for row in connection.execute("SELECT id, pid FROM jobs WHERE status = 'running'").fetchall():
+            if row["pid"] is None or not _pid_alive(row["pid"]):
+                _finish_abandoned(connection, row["id"], "failed", "The worker running this job stopped")
+        connection.execute(
+            "INSERT OR REPLACE INTO workers VALUES (?, ?, ?, ?, ?)", (os.getpid(), host, processes, _now(), time.time())
+        )
+        print(f"Job worker {os.getpid()} on {host}: {processes} process(es), queue {path.resolve()}", flush=True)
+        try:
+            while True:
+                connection.execute(
+                    "UPDATE workers SET heartbeat_at = ? WHERE pid = ? AND host = ?", (time.time(), os.getpid(), host)
+                )
+                for job_id, (process, cancel_deadline) in list(running.items()):
+                    if not process.is_alive():
+                        process.join()
+                        if cancel_deadline is not None:
+                            _finish_abandoned(connection, job_id, "cancelled", "Terminated after cancellation")
+                        else:
+                            _finish_abandoned(connection, job_id, "failed", f"Job process exited with code {process.exitcode}")
+                        print(f"Job {job_id} finished", flush=True)
+                        del running[job_id]
+                        continue
+                    if cancel_deadline is None:
+                        row = connection.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                        if row and row["cancel_requested"]:
+                            running[job_id] = (process, time.monotonic() + CANCEL_GRACE_SECONDS)
+                    elif time.monotonic() >= cancel_deadline:
+                        print(f"Job {job_id} did not stop after cancellation; terminating it", flush=True)
+                        process.terminate()
+                while len(running) < processes:
+                    job_id = _claim_next(connection)
+                    if job_id is None:
+                        break
+                    process = spawn.Process(target=execute_job, args=(job_id, path), name=f"job-{job_id}", daemon=False)
+                    process.start()
+                    connection.execute("UPDATE jobs SET pid = ? WHERE id = ?", (process.pid, job_id))
+                    running[job_id] = (process, None)
+                    print(f"Job {job_id} started in process {process.pid}", flush=True)
+                if once and not running:
+                    return
+                time.sleep(POLL_SECONDS)
+        except KeyboardInterrupt:
+            print("Stopping: asking running jobs to cancel", flush=True)
+            for job_id, (process, _) in running.items():
+                connection.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            for job_id, (process, _) in running.items():
+                process.join(CANCEL_GRACE_SECONDS)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+                _finish_abandoned(connection, job_id, "cancelled", "The worker was stopped")
+        finally:
+            connection.execute("DELETE FROM workers WHERE pid = ? AND host = ?", (os.getpid(), host))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=JOBS_DB_PATH, help=f"Queue database (default: {JOBS_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Run queued jobs until interrupted")
+    worker.add_argument("--processes", type=int, default=DEFAULT_PROCESSES, help=f"Jobs run at once (default: {DEFAULT_PROCESSES})")
+    worker.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    submit = commands.add_parser("submit", help="Queue a job")
+    submit.add_argument("kind", choices=list(JOB_KINDS))
+    submit.add_argument("--params", default="{}", help="Job parameters as JSON")
+    commands.add_parser("list", help="Show recent jobs")
+    logs = commands.add_parser("logs", help="Print a job's log")
+    logs.add_argument("job_id", type=int)
+    cancel = commands.add_parser("cancel", help="Cancel a queued or running job")
+    cancel.add_argument("job_id", type=int)
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        run_worker(max(1, args.processes), args.db, once=args.once)
+    elif args.command == "submit":
+        print(submit_job(args.kind, json.loads(args.params), args.db))
+    elif args.command == "list":
+        for job in list_jobs(path=args.db):
+            print(f"{job['id']:>5} {job['kind']:<20} {job['status']:<10} {job['progress']:>4.0%} {job['message'] or job['error']}")
+    elif args.command == "logs":
+        for line in job_logs(args.job_id, path=args.db):
+            print(f"{line['ts']} {line['message']}")
+    elif args.command == "cancel":
+        status = request_cancel(args.job_id, args.db)
+        if status is None:
+            sys.exit(f"No job {args.job_id}")
+        print(f"Job {args.job_id}: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+In-memory cache of LLM responses with a TTL and LRU eviction.
+
+Keys combine the model, the prompt template and a hash of the data the prompt
+was built from, so a response is reused only while all three are unchanged.
+Each entry can also remember the Notion page the response was saved to, so a
+cached answer is not saved again.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Responses older than this are fetched again.
+LLM_CACHE_TTL_SECONDS = 30 * 60
+LLM_CACHE_MAX_ENTRIES = 64
+
+
+@dataclass
+class CachedResponse:
+    response: str
+    created_at: float
+    page_id: str | None = None
+
+
+def response_cache_key(model: str, template: str, data: str) -> tuple[str, str, str]:
+    """Cache key for a prompt: (model, template hash, data hash)."""
+    return (
+        model,
+        hashlib.sha256(template.encode("utf-8")).hexdigest()[:16],
+        hashlib.sha256(data.encode("utf-8")).hexdigest(),
+    )
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    Shared across Streamlit sessions through st.cache_resource.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl: float = LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        """Return a fresh entry and mark it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry.created_at > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, response: str) -> CachedResponse:
+        """Store a response, evicting the least recently used entries beyond max_entries."""
+        entry = CachedResponse(response, time.time())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def set_page(self, key: tuple, page_id: str) -> None:
+        """Record the Notion page a cached response was saved to."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.page_id = page_id
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
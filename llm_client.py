@@ -0,0 +1,233 @@
+"""
+One client for every OpenAI-compatible chat endpoint the app talks to.
+
+Groq and the local LLM server are both reached through `get_llm_client`,
+which hands out one client per (endpoint, key). Each client keeps a pooled
+keep-alive `requests.Session`, applies the same timeout and retry/backoff
+rules, and limits how many requests run against its endpoint at once. Every
+call's timing and token usage is kept in `recent_calls` for inspection.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tracing import span
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 180.0
+DEFAULT_MAX_RETRIES = 2
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 8.0
+RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# Concurrent requests allowed per endpoint, shared by every client for it.
+ENDPOINT_CONCURRENCY = {GROQ_BASE_URL: 4}
+DEFAULT_ENDPOINT_CONCURRENCY = 2
+
+# Number of recent calls kept for metrics.
+CALL_HISTORY_SIZE = 500
+
+
+class LLMError(RuntimeError):
+    """An LLM request failed after all retries or returned no content."""
+
+
+@dataclass
+class CallMetrics:
+    endpoint: str
+    model: str
+    started_at: str
+    latency_s: float = 0.0
+    queued_s: float = 0.0
+    attempts: int = 0
+    status: int | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    error: str = ""
+
+
+@dataclass
+class ChatResult:
+    text: str
+    metrics: CallMetrics
+    raw: dict = field(default_factory=dict, repr=False)
+
+
+recent_calls: deque[CallMetrics] = deque(maxlen=CALL_HISTORY_SIZE)
+
+_endpoint_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_clients: dict[tuple, "LLMClient"] = {}
+_registry_lock = threading.Lock()
+
+
+def _endpoint_semaphore(base_url: str) -> threading.BoundedSemaphore:
+    with _registry_lock:
+        semaphore = _endpoint_semaphores.get(base_url)
+        if semaphore is None:
+            limit = ENDPOINT_CONCURRENCY.get(base_url, DEFAULT_ENDPOINT_CONCURRENCY)
+            semaphore = threading.BoundedSemaphore(limit)
+            _endpoint_semaphores[base_url] = semaphore
+        return semaphore
+
+
+def set_endpoint_concurrency(base_url: str, limit: int) -> None:
+    """
+    Change how many requests may run against `base_url` at once.
+
+    Requests already in flight finish under the old limit; existing clients
+    for the endpoint get a connection pool of the new size.
+    """
+    base_url = base_url.rstrip("/")
+    limit = max(1, int(limit))
+    with _registry_lock:
+        if ENDPOINT_CONCURRENCY.get(base_url) == limit and base_url in _endpoint_semaphores:
+            return
+        ENDPOINT_CONCURRENCY[base_url] = limit
+        _endpoint_semaphores[base_url] = threading.BoundedSemaphore(limit)
+        clients = [client for client in _clients.values() if client.base_url == base_url]
+    for client in clients:
+        client._mount_adapter(limit)
+
+
+class LLMClient:
+    """
+    Chat completions against one OpenAI-compatible endpoint.
+
+    Safe to share between threads; concurrency is capped by the endpoint's
+    semaphore and the connection pool is sized to match.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        self._mount_adapter(ENDPOINT_CONCURRENCY.get(self.base_url, DEFAULT_ENDPOINT_CONCURRENCY))
+        self.session.headers.update(
+            {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        )
+
+    def _mount_adapter(self, pool_size: int) -> None:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int, response: requests.Response | None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+        return min(BACKOFF_BASE_SECONDS * 2**attempt, BACKOFF_MAX_SECONDS)
+
+    def complete(self, messages: list[dict], model: str, **params) -> ChatResult:
+        """
+        Send a chat completion request.
+
+        Args:
+            messages: OpenAI-style chat messages
+            model: Model name on this endpoint
+            **params: Extra request fields, e.g. temperature, max_tokens
+
+        Returns:
+            ChatResult: Response text, call metrics and the raw JSON
+
+        Raises:
+            LLMError: When every attempt failed or the response had no content
+        """
+        url = f"{self.base_url}/chat/completions"
+        payload = {"model": model, "messages": messages, **params}
+        metrics = CallMetrics(self.base_url, model, datetime.now().astimezone().isoformat(timespec="seconds"))
+        queued = time.perf_counter()
+        try:
+            with span("llm.chat", endpoint=self.base_url, model=model) as llm_span:
+                with _endpoint_semaphore(self.base_url):
+                    started = time.perf_counter()
+                    metrics.queued_s = started - queued
+                    data = self._post_with_retries(url, payload, metrics)
+                    metrics.latency_s = time.perf_counter() - started
+                usage = data.get("usage") or {}
+                metrics.prompt_tokens = usage.get("prompt_tokens")
+                metrics.completion_tokens = usage.get("completion_tokens")
+                llm_span.set(
+                    attempts=metrics.attempts,
+                    prompt_tokens=metrics.prompt_tokens,
+                    completion_tokens=metrics.completion_tokens,
+                )
+                try:
+                    text = data["choices"][0]["message"]["content"]
+                except (KeyError, IndexError, TypeError) as exc:
+                    raise LLMError(f"Unexpected response from {self.base_url}: {exc}") from exc
+                if not text or not text.strip():
+                    raise LLMError("The model returned an empty response")
+                return ChatResult(text, metrics, data)
+        except LLMError as exc:
+            metrics.error = str(exc)
+            raise
+        finally:
+            recent_calls.append(metrics)
+
+    def _post_with_retries(self, url: str, payload: dict, metrics: CallMetrics) -> dict:
+        for attempt in range(self.max_retries + 1):
+            metrics.attempts = attempt + 1
+            response = None
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                metrics.status = response.status_code
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    time.sleep(self._backoff(attempt, response))
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"LLM request to {self.base_url} failed: {exc}") from exc
+                time.sleep(self._backoff(attempt, None))
+            except (requests.HTTPError, ValueError) as exc:
+                raise LLMError(f"LLM request to {self.base_url} failed: {exc}") from exc
+        raise LLMError(f"LLM request to {self.base_url} failed after {self.max_retries + 1} attempts")
+
+    def ask(self, prompt: str, model: str, system_prompt: str | None = None, **params) -> str:
+        """Send a single user prompt (optionally with a system prompt) and return the text."""
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        return self.complete(messages, model, **params).text
+
+
+def get_llm_client(base_url: str, api_key: str, **options) -> LLMClient:
+    """
+    Shared client for an endpoint, key and options, created on first use.
+
+    Clients with different `options` (timeouts, max_retries) still share the
+    endpoint's concurrency limit.
+    """
+    key = (base_url.rstrip("/"), api_key, tuple(sorted(options.items())))
+    with _registry_lock:
+        client = _clients.get(key)
+    if client is None:
+        client = LLMClient(base_url, api_key, **options)
+        with _registry_lock:
+            client = _clients.setdefault(key, client)
+    return client
+
+
+def call_metrics() -> list[dict]:
+    """Recent call metrics, oldest first."""
+    return [asdict(metrics) for metrics in list(recent_calls)]
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Measure candidate summarisation throughput against the worker count.
+
+Drives `summarize_candidates_to_notion.py` (in process, with its CLI
+arguments) and `notion_interviews.summarize_candidates_to_notion_pages`
+against the mock LLM server and the mock Notion API, once per worker count,
+and reports candidates/minute, LLM latency and how busy the server's slots
+were. Use it to pick --workers for a real server with the same slot count,
+speed and failure rate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_llm_server import MockLLMServer
+from mock_notion_server import MockNotionServer, redirect_notion_api
+
+REPO_ROOT = Path(__file__).resolve().parent
+FLOWS = ["cli", "pages"]
+DATA_SOURCE_ID = "00000000-0000-4000-8000-000000000046"
+CANDIDATE_SOURCE = REPO_ROOT / "candidates.txt"
+
+
+def load_candidates(source: Path, count: int) -> list:
+    """`count` candidate records from `source`, cycled with unique names and references when it has fewer."""
+    from split_candidates import CandidateRecord, split_candidate_records
+
+    records = split_candidate_records(source.read_text(encoding="utf-8-sig"))
+    if not records:
+        raise SystemExit(f"No candidate records found in {source}")
+    candidates = []
+    for index in range(count):
+        record = records[index % len(records)]
+        copy = index // len(records)
+        if copy == 0:
+            candidates.append(record)
+            continue
+        candidates.append(
+            CandidateRecord(
+                name=f"{record.name} {copy + 1}",
+                reference=f"{record.reference}{copy + 1:02d}",
+                text=record.text,
+            )
+        )
+    return candidates
+
+
+def seed_notion(server: MockNotionServer, candidates: list) -> None:
+    server.seed_pages(
+        DATA_SOURCE_ID,
+        [
+            {
+                "Fullname": {"title": [{"text": {"content": candidate.name}}]},
+                "Application Reference": {"rich_text": [{"text": {"content": candidate.reference}}]},
+            }
+            for candidate in candidates
+        ],
+    )
+
+
+def run_cli(llm_url: str, candidates: list, workers: int, workdir: Path) -> tuple[int, int]:
+    """Run summarize_candidates_to_notion.main() on one .txt file per candidate."""
+    import summarize_candidates_to_notion
+    from split_candidates import safe_filename
+
+    input_dir = workdir / f"cli-{workers}"
+    input_dir.mkdir(exist_ok=True)
+    for candidate in candidates:
+        (input_dir / f"{safe_filename(candidate.name)}.txt").write_text(candidate.text, encoding="utf-8")
+    argv = [
+        "summarize_candidates_to_notion.py", str(input_dir),
+        "--base-url", llm_url,
+        "--data-source-id", DATA_SOURCE_ID,
+        "--workers", str(workers),
+    ]
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()), \
+            _patched(sys, "argv", argv):
+        summarize_candidates_to_notion.main()
+    finished = output.getvalue().rsplit("Finished: ", 1)[-1].split()
+    return int(finished[0]), int(finished[2])
+
+
+def run_pages(llm_url: str, candidates: list, workers: int) -> tuple[int, int]:
+    """Run summarize_candidates_to_notion_pages as the Interviews page does."""
+    import streamlit as st
+    from notionhelper import NotionHelper
+
+    import notion_interviews
+    from summarize_candidates_to_notion import LocalLLMSettings
+
+    nh = NotionHelper(os.environ["NOTION_TOKEN"])
+    settings = LocalLLMSettings(base_url=llm_url, workers=workers)
+    return notion_interviews.summarize_candidates_to_notion_pages(
+        nh,
+        DATA_SOURCE_ID,
+        candidates,
+        settings,
+        notion_interviews.DEFAULT_JOB_ROLE,
+        notion_interviews.ASSESSMENT_PROMPT,
+        st.progress(0.0),
+    )
+
+
+@contextlib.contextmanager
+def _patched(target, name: str, value):
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+def measure(flow: str, workers: int, llm: MockLLMServer, notion: MockNotionServer, candidates: list,
+            workdir: Path) -> dict:
+    """
+    Run one flow with `workers` parallel requests.
+
+    Returns:
+        dict: succeeded/failed counts, wall time, candidates per minute, LLM
+        request and latency figures from both sides, and Notion requests
+    """
+    import llm_client
+
+    llm.reset_stats()
+    notion.reset_stats()
+    llm_client.recent_calls.clear()
+    start = time.perf_counter()
+    try:
+        if flow == "cli":
+            succeeded, failed = run_cli(llm.url, candidates, workers, workdir)
+        else:
+            succeeded, failed = run_pages(llm.url, candidates, workers)
+    except Exception as exc:
+        return {"flow": flow, "workers": workers, "error": f"{type(exc).__name__}: {exc}"}
+    wall = time.perf_counter() - start
+
+    calls = [call for call in llm_client.recent_calls if call.endpoint == llm.url]
+    latencies = sorted(call.latency_s for call in calls if not call.error)
+    server = llm.stats()
+    return {
+        "flow": flow,
+        "workers": workers,
+        "succeeded": succeeded,
+        "failed": failed,
+        "wall_s": round(wall, 3),
+        "per_minute": round(succeeded / wall * 60, 1) if wall else None,
+        "llm_requests": server["requests"],
+        "llm_errors": server["failed"] + server["rejected"],
+        "peak_active": server["peak_active"],
+        "server_queued_s": server["queued_s"],
+        "client_queued_s": round(sum(call.queued_s for call in calls), 3),
+        "p50_latency_s": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_latency_s": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        "completion_tokens": server["completion_tokens"],
+        "notion_requests": notion.stats()["requests"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", default=FLOWS, choices=FLOWS)
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8], help="Worker counts to try (default: 1 2 4 8)")
+    parser.add_argument("--candidates", type=int, default=16, help="Candidates per run (default: 16)")
+    parser.add_argument("--source", type=Path, default=CANDIDATE_SOURCE, help="Extracted application text to split (default: candidates.txt)")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="LLM time to first token (default: 300)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="LLM generation speed per slot (default: 80)")
+    parser.add_argument("--completion-tokens", type=int, default=250, help="Tokens per summary (default: 250)")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="LLM server slots; 0 for unlimited (default: 4)")
+    parser.add_argument("--reject-when-busy", action="store_true", help="LLM server answers 503 instead of queueing")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of LLM requests answered with 500 (default: 0)")
+    parser.add_argument("--notion-latency-ms", type=float, default=80.0, help="Mock Notion API latency per request (default: 80)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the scratch directory for inspection")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_ROOT))
+    from notion_benchmark import prepare_workdir
+
+    candidates = load_candidates(args.source, args.candidates)
+    workdir = Path(tempfile.mkdtemp(prefix="llm-load-test-"))
+    cwd = os.getcwd()
+    prepare_workdir(workdir)
+    os.environ["NOTION_TOKEN"] = "mock-notion-token"
+    results = []
+    try:
+        with MockLLMServer(args.latency_ms, args.tokens_per_second, args.completion_tokens, args.max_concurrency,
+                           args.reject_when_busy, args.failure_rate) as llm, \
+                MockNotionServer(args.notion_latency_ms) as notion, redirect_notion_api(notion.url):
+            seed_notion(notion, candidates)
+            slots = args.max_concurrency or "unlimited"
+            print(f"Mock LLM at {llm.url}: {args.latency_ms:.0f} ms to first token, {args.tokens_per_second:g} tok/s, "
+                  f"{args.completion_tokens} tokens, {slots} slots, {args.failure_rate:.0%} failures; "
+                  f"{len(candidates)} candidates\n")
+            print(f"{'flow':<6} {'workers':>7} {'ok':>4} {'fail':>4} {'wall':>8} {'cand/min':>9} {'llm req':>8} "
+                  f"{'errors':>6} {'peak':>5} {'p50':>7} {'p95':>7}")
+            print("-" * 84)
+            for flow in args.flows:
+                for workers in args.workers:
+                    result = measure(flow, workers, llm, notion, candidates, workdir)
+                    results.append(result)
+                    if "error" in result:
+                        print(f"{flow:<6} {workers:>7} failed: {result['error']}")
+                        continue
+                    print(f"{flow:<6} {workers:>7} {result['succeeded']:>4} {result['failed']:>4} {result['wall_s']:>7.2f}s "
+                          f"{result['per_minute'] or 0:>9.1f} {result['llm_requests']:>8} {result['llm_errors']:>6} "
+                          f"{result['peak_active']:>5} {result['p50_latency_s'] or 0:>6.2f}s {result['p95_latency_s'] or 0:>6.2f}s")
+    finally:
+        os.chdir(cwd)
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"\nScratch directory kept at {workdir}")
+
+    if args.json:
+        settings = {key: value for key, value in vars(args).items() if key != "json"}
+        args.json.write_text(json.dumps({"settings": settings, "results": results}, indent=2, default=str), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,22 @@
 import pandas as pd
 import streamlit as st
 from notionhelper import NotionHelper
+from notion_cache import get_notion_helper, invalidate_data_source, load_data_source
+from tracing import span
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 notion = st.secrets["NOTION_TOKEN"]
 resend_api = st.secrets["RESEND_API_KEY"]
 partners_db_id = st.secrets["PARTNERS_AGENDA_ID"]
 team_db_id = st.secrets["TEAM_AGENDA_ID"]
 tasks_db_id = st.secrets["TASKS_ID"]
-nh = NotionHelper(notion)
+github_trending_db_id = '2f4fdfd6-8a97-805b-a6e9-000b8149b31f'
+# Concurrent Notion writes; the shared rate limiter still caps requests/sec.
+NOTION_WRITE_WORKERS = 4
+nh = get_notion_helper(notion)
 
 import os, requests, json, sys
 from notionhelper import NotionHelper
@@ -25,9 +31,11 @@ def send_email(to, subject, text, reply_to='jan.duplessis@nhs.net', from_email='
     headers={'Authorization':f'Bearer {resend_api}','Content-Type':'application/json'}
     data={'from': from_email, 'to':[to], 'subject':subject, 'html':text}
     if reply_to: data['reply_to']=reply_to
-    r=requests.post(URL, headers=headers, data=json.dumps(data))
-    r.raise_for_status()
-    return r.json()
+    body=json.dumps(data)
+    with span("email.send", bytes=len(body)):
+        r=requests.post(URL, headers=headers, data=body)
+        r.raise_for_status()
+        return r.json()
 
 def get_agenda(database_id: str, subject: str = "Meeting Agenda"):
     """
@@ -41,7 +49,9 @@ def get_agenda(database_id: str, subject: str = "Meeting Agenda"):
         Tuple of (subject, html_body)
     """
     # Fetch the data
-    work = nh.get_data_source_pages_as_dataframe(database_id)
+    with span("agenda.fetch") as fetch_span:
+        work = nh.get_data_source_pages_as_dataframe(database_id)
+        fetch_span.set(rows=len(work))
 
     print("✅ Data fetched successfully!")
     current = work[work['Completed'] == False]
@@ -123,121 +133,264 @@ def run_team_agenda(date_of_meeting: str, email_list: list, preview_agenda: bool
     return run_agenda(team_db_id, date_of_meeting, email_list, preview_agenda, "SMW Team Meeting")
 
 
-def get_github_trending_page():
+def trending_repo_properties(repo: dict, todaytime: str, include_identity: bool = True):
     """
-    Fetch trending Python repositories from GitHub and add them to Notion database.
+    Build Notion properties for a trending repository.
+
+    Args:
+        repo: Repository dict from gtrending
+        todaytime: ISO 8601 date (YYYY-MM-DD) of the run
+        include_identity: Include Repo, URL and Icon, which only need setting on creation
 
     Returns:
-        int: Number of repositories processed
+        dict: Notion page properties
     """
-    import gtrending
-    from datetime import datetime
-
-    # Fetch trending python repositories for the day
-    repos = gtrending.fetch_repos(language="python", spoken_language_code="en", since="daily")
-
-    processed_count = 0
-    for repo in repos[:20]:
-        owner = repo['fullname'].split('/')[0]
-        # Reliable way to get the icon (GitHub redirects this to the real image)
-        icon_url = f"https://github.com/{owner}.png"
-
-        print(f"Stars today: +{repo['currentPeriodStars']}")
-        print(f"Total Stars: {repo['stars']}")
-        print(f"URL: {repo['url']}")
-        print("-" * 20)
-
-        # Ensure todaytime is in ISO 8601 format (YYYY-MM-DD)
-        todaytime = datetime.now().date().isoformat()
-
-        properties = {
-            'Repo': {
-                'title': [
-                    {
-                        'text': {
-                            'content': repo['fullname']
-                        }
+    properties = {
+        'Total Stars': {
+            'number': int(repo['stars'])
+        },
+        'Date': {
+            'date': {
+                'start': todaytime
+            }
+        },
+    }
+    # Repos that only trended weekly or monthly have no daily count.
+    if repo['currentPeriodStars'] is not None:
+        properties['Stars Today'] = {'number': int(repo['currentPeriodStars'])}
+    if not include_identity:
+        return properties
+
+    owner = repo['fullname'].split('/')[0]
+    # Reliable way to get the icon (GitHub redirects this to the real image)
+    icon_url = f"https://github.com/{owner}.png"
+    properties.update({
+        'Repo': {
+            'title': [
+                {
+                    'text': {
+                        'content': repo['fullname']
                     }
-                ]
-            },
-            'URL': {
-                'url': repo['url']
-            },
-            'Stars Today': {
-                'number': int(repo['currentPeriodStars'])
-            },
-            'Total Stars': {
-                'number': int(repo['stars'])
-            },
-            'Date': {
-                'date': {
-                    'start': todaytime
                 }
-            },
-            'Icon': {
-                'files': [
-                    {
-                        'type': 'external',
-                        'name': 'GitHub Icon',
-                        'external': {
-                            'url': icon_url
-                        }
+            ]
+        },
+        'URL': {
+            'url': repo['url']
+        },
+        'Icon': {
+            'files': [
+                {
+                    'type': 'external',
+                    'name': 'GitHub Icon',
+                    'external': {
+                        'url': icon_url
                     }
-                ]
-            }
+                }
+            ]
         }
-        nh.new_page_to_data_source('2f4fdfd6-8a97-805b-a6e9-000b8149b31f', page_properties=properties)
-        print("✅")
-        processed_count += 1
+    })
+    return properties
 
-    return processed_count
+
+def upsert_trending_repo(repo: dict, page_id: str | None, todaytime: str):
+    """
+    Update the page tracking a repository, or create one.
+
+    Args:
+        repo: Merged repository dict from github_trending
+        page_id: Page already tracking the repo, if any
+        todaytime: ISO 8601 date (YYYY-MM-DD) of the run
+
+    Returns:
+        tuple: (page_id, created)
+    """
+    from notionhelper import NotFoundError, ValidationError
+
+    if page_id:
+        try:
+            nh._make_request(
+                "PATCH",
+                f"https://api.notion.com/v1/pages/{page_id}",
+                {"properties": trending_repo_properties(repo, todaytime, include_identity=False)},
+            )
+            return page_id, False
+        except NotFoundError:
+            # Page was deleted since the last sync; recreate it.
+            pass
+        except ValidationError as e:
+            # Notion rejects edits to trashed pages as "archived"; anything else is a real error.
+            if "archived" not in str(e).lower():
+                raise
+    page = nh.new_page_to_data_source(github_trending_db_id, page_properties=trending_repo_properties(repo, todaytime))
+    return page['id'], True
+
+
+def get_github_trending_page(languages: list | None = None, periods: list | None = None):
+    """
+    Fetch trending repositories from GitHub and upsert them into the Notion database.
+
+    Every (language, period) list is fetched concurrently and merged, so a repo
+    trending in several lists is written once. Repositories already in the
+    database have their star counts and date updated in place; only
+    repositories seen for the first time get a new page.
+
+    Args:
+        languages: Languages to fetch (default: github_trending.TRENDING_LANGUAGES)
+        periods: Periods to fetch, from daily/weekly/monthly (default: daily)
+
+    Returns:
+        tuple: (repos_created, repos_updated)
+    """
+    from datetime import datetime
+    from github_trending import fetch_trending, record_history
+    from github_trending_index import RepoIndex
+
+    with span("trending.fetch") as fetch_span:
+        repos = fetch_trending(languages, periods)
+        fetch_span.set(repos=len(repos))
+    record_history(repos)
+
+    index = RepoIndex(github_trending_db_id)
+    with span("trending.index_refresh") as refresh_span:
+        pages_read = index.refresh(nh)
+        refresh_span.set(pages_read=pages_read)
+    print(f"Repo index synced ({pages_read} pages read, {len(index.pages)} repos indexed)")
+
+    # Ensure todaytime is in ISO 8601 format (YYYY-MM-DD)
+    todaytime = datetime.now().date().isoformat()
+
+    created_count = 0
+    updated_count = 0
+    try:
+        with span("trending.upsert", repos=len(repos)) as upsert_span, ThreadPoolExecutor(max_workers=NOTION_WRITE_WORKERS) as executor:
+            futures = {
+                executor.submit(upsert_trending_repo, repo, index.get(repo['fullname']), todaytime): repo
+                for repo in repos
+            }
+            # The index is only touched from this thread.
+            for future in as_completed(futures):
+                repo = futures[future]
+                page_id, created = future.result()
+                index.set(repo['fullname'], page_id, todaytime)
+                if created:
+                    created_count += 1
+                else:
+                    updated_count += 1
+                upsert_span.set(created=created_count, updated=updated_count)
+                print(f"{'✅ created' if created else '✅ updated'} {repo['fullname']} ({repo['stars']} stars)")
+    finally:
+        index.save()
+        if created_count or updated_count:
+            invalidate_data_source(github_trending_db_id)
+    return created_count, updated_count
 
 
 def delete_duplicate_pages():
     """
-    Find and delete duplicate repository entries in the Notion database.
+    Find duplicate repository entries in the Notion database.
+
+    Upserts no longer create duplicates; this clears entries left by the
+    previous insert-only ingestion and reads the whole database.
 
     Returns:
-        list: List of page IDs that were deleted
+        list: Page IDs of the older duplicates
     """
-    data = nh.get_data_source_pages_as_dataframe('2f4fdfd6-8a97-805b-a6e9-000b8149b31f')
+    data = load_data_source(github_trending_db_id)
     data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d')
     data.sort_values(by='Date', ascending=False, inplace=True)
     duplicate_ids = data.loc[data.duplicated(subset=['Repo'], keep='first'), 'notion_page_id'].tolist()
     return duplicate_ids
 
 
-def run_github_trending_workflow():
+def trash_pages(page_ids: list, max_workers: int = NOTION_WRITE_WORKERS, dry_run: bool = False, progress_text: str = "Trashing pages..."):
     """
-    Complete workflow: Fetch trending GitHub repos and clean up duplicates.
+    Trash many Notion pages with a bounded worker pool.
+
+    Requests are paced by the shared Notion rate limiter on `nh`, and a single
+    progress bar is updated from the script thread as pages complete.
+
+    Args:
+        page_ids: Notion page IDs to trash
+        max_workers: Maximum concurrent trash requests
+        dry_run: List the pages that would be trashed without changing Notion
+        progress_text: Label for the progress bar
 
     Returns:
-        tuple: (repos_added, duplicates_removed)
+        list: One dict per page with page_id, status ('trashed', 'failed' or 'dry run') and error
     """
-    st.toast("Getting Trending GitHub repos...", icon=":material/favorite:", duration='long')
+    if dry_run:
+        return [{'page_id': page_id, 'status': 'dry run', 'error': ''} for page_id in page_ids]
+    if not page_ids:
+        return []
+
+    results = []
+    total = len(page_ids)
+    progress_bar = st.progress(0.0, text=progress_text)
+    with span("notion.trash_pages", pages=total) as trash_span, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(nh.trash_page, page_id): page_id for page_id in page_ids}
+        for done, future in enumerate(as_completed(futures), start=1):
+            page_id = futures[future]
+            try:
+                future.result()
+                results.append({'page_id': page_id, 'status': 'trashed', 'error': ''})
+            except Exception as e:
+                results.append({'page_id': page_id, 'status': 'failed', 'error': str(e)})
+                trash_span.add('failed')
+            progress_bar.progress(done / total, text=f"{progress_text} {done}/{total}")
+    progress_bar.empty()
+    return results
+
+
+def show_trash_results(results: list, dry_run: bool = False):
+    """Show per-page trash results in a single expander."""
+    if not results:
+        return
+    failed = sum(1 for result in results if result['status'] == 'failed')
+    label = f"Duplicates that would be trashed ({len(results)})" if dry_run else f"Trash results ({len(results) - failed} trashed, {failed} failed)"
+    with st.expander(label, icon=":material/delete:", expanded=dry_run or failed > 0):
+        st.dataframe(pd.DataFrame(results), hide_index=True, width='stretch')
+
+
+def clean_up_duplicate_pages(dry_run: bool = False):
+    """
+    Trash duplicate repository entries in the GitHub trending database.
 
-    # Step 1: Fetch and add trending repos
-    repos_added = get_github_trending_page()
-    print(f"\n✅ Added {repos_added} repositories")
+    Args:
+        dry_run: Only list the duplicates
 
-    # Step 2: Remove duplicates
-    st.toast("Cleaning up duplicates...", icon=":material/mop:", duration='long')
+    Returns:
+        list: Per-page results from trash_pages
+    """
     duplicate_ids = delete_duplicate_pages()
+    results = trash_pages(duplicate_ids, dry_run=dry_run, progress_text="Trashing duplicates...")
+    if any(result['status'] == 'trashed' for result in results):
+        invalidate_data_source(github_trending_db_id)
+    show_trash_results(results, dry_run=dry_run)
+    return results
+
+
+def run_github_trending_workflow(languages: list | None = None, periods: list | None = None):
+    """
+    Complete workflow: Fetch trending GitHub repos and upsert them into Notion.
 
-    duplicates_removed = 0
-    for dup in duplicate_ids:
-        outcome = nh.trash_page(dup)
-        st.toast(f"Trashed ID: {dup}", icon=":material/delete:", duration='short')
-        duplicates_removed += 1
+    Args:
+        languages: Languages to fetch
+        periods: Periods to fetch, from daily/weekly/monthly
+
+    Returns:
+        tuple: (repos_created, repos_updated)
+    """
+    st.toast("Getting Trending GitHub repos...", icon=":material/favorite:", duration='long')
 
-    print(f"\n✅ Removed {duplicates_removed} duplicate entries")
+    repos_created, repos_updated = get_github_trending_page(languages, periods)
+    print(f"\n✅ Added {repos_created} repositories, updated {repos_updated}")
     print("🎉 GitHub Trending workflow completed!")
 
-    return repos_added, duplicates_removed
+    return repos_created, repos_updated
 
 
 def show_tasks():
-    tasks = nh.get_data_source_pages_as_dataframe(tasks_db_id, utc=True)
+    tasks = load_data_source(tasks_db_id)
     f_tasks = tasks[['Date','Status','Priority','Task','Formula', 'notion_page_id']].copy()
     f_tasks['Date'] = pd.to_datetime(f_tasks['Date'], format='ISO8601', utc=True, errors='coerce')
     not_done = f_tasks[f_tasks['Status'] != 'Done']
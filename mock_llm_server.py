@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+In-process stand-in for an OpenAI-compatible LLM server, for load tests.
+
+Serves POST /v1/chat/completions (plain JSON, or server-sent events when the
+request sets "stream": true) and GET /v1/models. Replies are deterministic
+for a given prompt and follow the candidate assessment format, ending with a
+"Suitability score: X/10" line, so the summarisation flows run end to end.
+
+Time to first token, generation speed, the number of requests decoded at
+once (further requests queue, or get a 503 with `reject_when_busy`) and a
+seeded failure rate are configurable, which is enough to model a GPU box
+with a fixed number of parallel slots.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+MOCK_MODEL = "mock-llm"
+# Whitespace-led words; each counts as one token.
+_TOKEN = re.compile(r"\s*\S+")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+def _reply_text(prompt: str, target_tokens: int) -> str:
+    """A Markdown assessment derived from a hash of the prompt, padded to about `target_tokens`."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    # Candidate records give the name just before the application reference.
+    name_match = re.search(r"^(\S.*?)\s+AR-\d{6}-\d+", prompt, re.MULTILINE)
+    name = name_match.group(1).strip() if name_match else f"Candidate {digest[:3].hex()}"
+    score = digest[0] % 11
+    head = (
+        f"### Candidate Name\n{name}\n\n"
+        "### Employment History (Current role first)\n- Not evidenced\n\n"
+        "### Education & Professional Training\nNot evidenced.\n\n"
+        "### Core Experience\n- The period of relevant experience cannot be determined reliably.\n\n"
+        "### Key Competencies\n"
+    )
+    tail = (
+        "\n\n### Suitability for the role\n- Assessment generated by the mock LLM server.\n"
+        f"- **Suitability score: {score}/10** - Deterministic mock score."
+    )
+    filler = []
+    remaining = target_tokens - estimate_tokens(head) - estimate_tokens(tail)
+    while True:
+        line = f"- Evidence point {len(filler) + 1}: reference {digest[len(filler) % len(digest)]:03d} noted."
+        if estimate_tokens(line) > remaining:
+            break
+        filler.append(line)
+        remaining -= estimate_tokens(line)
+    return head + "\n".join(filler) + tail
+
+
+class MockLLMServer:
+    """
+    Threaded HTTP server emulating an OpenAI-compatible chat endpoint.
+
+    Args:
+        latency_ms: Time to first token, covering queueing-free prompt processing
+        tokens_per_second: Generation speed of each slot
+        completion_tokens: Tokens generated per reply, capped by the request's max_tokens
+        max_concurrency: Requests decoded at once; further requests wait for a slot (0: unlimited)
+        reject_when_busy: Answer 503 with Retry-After instead of queueing when every slot is busy
+        failure_rate: Fraction of requests answered with a 500 after the first-token delay
+        retry_after: Seconds advertised in the Retry-After header of a 503
+        seed: Seed for the failure draws, for repeatable runs
+    """
+
+    def __init__(self, latency_ms: float = 300.0, tokens_per_second: float = 50.0, completion_tokens: int = 300,
+                 max_concurrency: int = 2, reject_when_busy: bool = False, failure_rate: float = 0.0,
+                 retry_after: float = 1.0, host: str = "127.0.0.1", port: int = 0, seed: int | None = 0):
+        self.latency_ms = latency_ms
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.max_concurrency = max_concurrency
+        self.reject_when_busy = reject_when_busy
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._active = 0
+        self.reset_stats()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as an OpenAI-compatible endpoint, including /v1."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """Request, failure and token counts, peak parallel requests and time spent queued for a slot."""
+        with self._stats_lock:
+            return {
+                "requests": self._requests,
+                "completed": self._completed,
+                "streamed": self._streamed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "peak_active": self._peak_active,
+                "queued_s": round(self._queued_s, 3),
+                "prompt_tokens": self._prompt_tokens,
+                "completion_tokens": self._completion_tokens,
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._requests = self._completed = self._streamed = self._failed = self._rejected = 0
+            self._peak_active = self._active
+            self._queued_s = 0.0
+            self._prompt_tokens = self._completion_tokens = 0
+
+    def _count(self, **amounts: int | float) -> None:
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                setattr(self, f"_{name}", getattr(self, f"_{name}") + amount)
+
+    def _acquire_slot(self) -> bool:
+        if self._slots is None:
+            acquired = True
+        elif self.reject_when_busy:
+            acquired = self._slots.acquire(blocking=False)
+        else:
+            queued = time.perf_counter()
+            acquired = self._slots.acquire()
+            self._count(queued_s=time.perf_counter() - queued)
+        if acquired:
+            with self._stats_lock:
+                self._active += 1
+                self._peak_active = max(self._peak_active, self._active)
+        return acquired
+
+    def _release_slot(self) -> None:
+        with self._stats_lock:
+            self._active -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _should_fail(self) -> bool:
+        if self.failure_rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.failure_rate
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _respond(self, status: int, body: dict, headers: dict | None = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") in ("/v1/models", "/models"):
+                    self._respond(200, {"object": "list", "data": [{"id": MOCK_MODEL, "object": "model", "owned_by": "mock"}]})
+                else:
+                    self._respond(404, _error("not_found", f"No route for GET {self.path}"))
+
+            def do_POST(self) -> None:
+                size = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(size) if size else b""
+                if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+                    self._respond(404, _error("not_found", f"No route for POST {self.path}"))
+                    return
+                try:
+                    payload = json.loads(raw)
+                    messages = payload["messages"]
+                except (ValueError, KeyError, TypeError):
+                    self._respond(400, _error("invalid_request_error", "Body must be JSON with a messages list"))
+                    return
+                server._count(requests=1)
+                if not server._acquire_slot():
+                    server._count(rejected=1)
+                    self._respond(503, _error("server_busy", "All slots are busy"),
+                                  {"Retry-After": str(max(1, round(server.retry_after)))})
+                    return
+                try:
+                    server._complete(self, payload, messages)
+                finally:
+                    server._release_slot()
+
+        return Handler
+
+    def _complete(self, handler: BaseHTTPRequestHandler, payload: dict, messages: list) -> None:
+        prompt = "\n".join(str(message.get("content") or "") for message in messages if isinstance(message, dict))
+        target = self.completion_tokens
+        if payload.get("max_tokens"):
+            target = min(target, int(payload["max_tokens"]))
+        tokens = _TOKEN.findall(_reply_text(prompt, target))
+        finish_reason = "length" if len(tokens) > target else "stop"
+        tokens = tokens[:target]
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": len(tokens),
+                 "total_tokens": estimate_tokens(prompt) + len(tokens)}
+        model = payload.get("model") or MOCK_MODEL
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        started = time.perf_counter()
+        time.sleep(max(0.0, self.latency_ms) / 1000)
+        if self._should_fail():
+            self._count(failed=1)
+            handler._respond(500, _error("server_error", "Injected failure"))
+            return
+
+        if payload.get("stream"):
+            self._stream(handler, tokens, finish_reason, usage, model, completion_id, payload)
+            self._count(streamed=1)
+        else:
+            self._wait_for_tokens(started, len(tokens))
+            handler._respond(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                             "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+        self._count(completed=1, prompt_tokens=usage["prompt_tokens"], completion_tokens=usage["completion_tokens"])
+
+    def _wait_for_tokens(self, started: float, count: int) -> None:
+        """Sleep until `count` tokens would have been generated after the first-token delay."""
+        if self.tokens_per_second <= 0:
+            return
+        due = started + self.latency_ms / 1000 + count / self.tokens_per_second
+        time.sleep(max(0.0, due - time.perf_counter()))
+
+    def _stream(self, handler: BaseHTTPRequestHandler, tokens: list[str], finish_reason: str, usage: dict,
+                model: str, completion_id: str, payload: dict) -> None:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        started = time.perf_counter() - self.latency_ms / 1000
+
+        def send(delta: dict | None, reason: str | None = None, **extra: Any) -> None:
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model, "choices": [] if delta is None else
+                     [{"index": 0, "delta": delta, "finish_reason": reason}], **extra}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        for index, token in enumerate(tokens, start=1):
+            self._wait_for_tokens(started, index)
+            send({"content": token})
+        send({}, finish_reason)
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            send(None, usage=usage)
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+def _error(error_type: str, message: str) -> dict:
+    return {"error": {"message": message, "type": error_type, "code": None}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the mock LLM server until interrupted.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Time to first token (default: 300)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Generation speed per slot (default: 50)")
+    parser.add_argument("--completion-tokens", type=int, default=300, help="Tokens per reply (default: 300)")
+    parser.add_argument("--max-concurrency", type=int, default=2, help="Parallel slots; 0 for unlimited (default: 2)")
+    parser.add_argument("--reject-when-busy", action="store_true", help="Answer 503 instead of queueing")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.latency_ms, args.tokens_per_second, args.completion_tokens, args.max_concurrency,
+                           args.reject_when_busy, args.failure_rate, port=args.port)
+    print(f"Mock LLM server on {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
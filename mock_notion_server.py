@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+In-process stand-in for the Notion API, for offline benchmarks.
+
+Implements the endpoints the app uses: creating, reading, updating and
+trashing pages; page markdown; data-source queries with cursor pagination
+and the filters the app sends; data-source schema reads and updates; block
+children listing and appends; database creation and two-step file uploads.
+Latency and Notion's 429 rate limiting can be injected, and every request
+is counted so a benchmark can report requests/sec.
+
+`redirect_notion_api` routes calls for https://api.notion.com made through
+`requests` (as NotionHelper does) to the mock server.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+NOTION_API_URL = "https://api.notion.com"
+MAX_PAGE_SIZE = 100
+MAX_APPEND_CHILDREN = 100
+PROPERTY_TYPES = (
+    "title", "rich_text", "number", "select", "multi_select", "status", "date", "url",
+    "checkbox", "email", "phone_number", "files", "people", "relation",
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _rich_text(items: list) -> list:
+    converted = []
+    for item in items or []:
+        content = item.get("text", {}).get("content", item.get("plain_text", ""))
+        converted.append({"type": "text", "text": {"content": content, "link": None}, "plain_text": content})
+    return converted
+
+
+def property_value(name: str, value: dict) -> dict:
+    """Convert a property as sent in a request to the shape Notion returns."""
+    property_type = next((key for key in PROPERTY_TYPES if key in value), "rich_text")
+    raw = value.get(property_type)
+    if property_type in ("title", "rich_text"):
+        raw = _rich_text(raw)
+    return {"id": name[:4], "type": property_type, property_type: raw}
+
+
+class NotionStore:
+    """Pages, blocks and file uploads held in memory. Unknown data sources are created on first use."""
+
+    def __init__(self):
+        self.pages: dict[str, dict] = {}
+        self.data_sources: dict[str, list[str]] = {}
+        # Property schema per data source, as set through PATCH /v1/data_sources/{id}.
+        self.schemas: dict[str, dict] = {}
+        self.blocks: dict[str, list[dict]] = {}
+        self.uploads: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def create_page(self, data_source_id: str, properties: dict) -> dict:
+        now = _now()
+        page = {
+            "object": "page",
+            "id": str(uuid.uuid4()),
+            "created_time": now,
+            "last_edited_time": now,
+            "in_trash": False,
+            "archived": False,
+            "parent": {"type": "data_source_id", "data_source_id": data_source_id},
+            "properties": {name: property_value(name, value) for name, value in (properties or {}).items()},
+        }
+        with self.lock:
+            self.pages[page["id"]] = page
+            self.data_sources.setdefault(data_source_id, []).append(page["id"])
+        return page
+
+    def update_page(self, page_id: str, payload: dict) -> dict | None:
+        with self.lock:
+            page = self.pages.get(page_id)
+            if page is None:
+                return None
+            for name, value in (payload.get("properties") or {}).items():
+                page["properties"][name] = property_value(name, value)
+            if "in_trash" in payload:
+                page["in_trash"] = page["archived"] = bool(payload["in_trash"])
+            page["last_edited_time"] = _now()
+            return page
+
+    def query(self, data_source_id: str, query_filter: dict | None) -> list[dict]:
+        with self.lock:
+            page_ids = list(self.data_sources.setdefault(data_source_id, []))
+            pages = [self.pages[page_id] for page_id in page_ids]
+        return [page for page in pages if not page["in_trash"] and matches(page, query_filter)]
+
+    def append_blocks(self, parent_id: str, children: list[dict]) -> list[dict]:
+        created = []
+        for child in children:
+            block = {"object": "block", "id": str(uuid.uuid4()), "created_time": _now(), "has_children": False,
+                     "in_trash": False, **child}
+            created.append(block)
+        with self.lock:
+            self.blocks.setdefault(parent_id, []).extend(created)
+        return created
+
+    def markdown(self, page_id: str) -> str:
+        """Plain text of a page's top-level blocks, one line each."""
+        with self.lock:
+            blocks = [block for block in self.blocks.get(page_id, []) if not block["in_trash"]]
+        lines = []
+        for block in blocks:
+            rich_text = (block.get(block.get("type", ""), {}) or {}).get("rich_text") or []
+            lines.append("".join(item.get("text", {}).get("content", "") for item in rich_text))
+        return "\n".join(lines)
+
+    def trash_block(self, block_id: str) -> dict | None:
+        with self.lock:
+            for blocks in self.blocks.values():
+                for block in blocks:
+                    if block["id"] == block_id:
+                        block["in_trash"] = True
+                        return block
+        return None
+
+
+def _compare(actual: str, condition: dict) -> bool:
+    if not actual:
+        return "is_empty" in condition
+    for operator, expected in condition.items():
+        expected = str(expected)
+        if operator == "equals" and actual[:len(expected)] != expected:
+            return False
+        if operator == "on_or_after" and actual < expected:
+            return False
+        if operator == "after" and actual <= expected:
+            return False
+        if operator == "on_or_before" and actual[:len(expected)] > expected:
+            return False
+        if operator == "before" and actual >= expected:
+            return False
+        if operator == "is_empty":
+            return False
+    return True
+
+
+def _normalise_timestamp(value: str) -> str:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
+    except ValueError:
+        return value
+
+
+def matches(page: dict, query_filter: dict | None) -> bool:
+    """Evaluate the subset of Notion filters used by the app; unknown filters match everything."""
+    if not query_filter:
+        return True
+    if "and" in query_filter:
+        return all(matches(page, part) for part in query_filter["and"])
+    if "or" in query_filter:
+        return any(matches(page, part) for part in query_filter["or"])
+    timestamp = query_filter.get("timestamp")
+    if timestamp in ("last_edited_time", "created_time"):
+        condition = {key: _normalise_timestamp(value) for key, value in query_filter[timestamp].items()}
+        return _compare(_normalise_timestamp(page[timestamp]), condition)
+    value = page["properties"].get(query_filter.get("property", ""), {})
+    if "date" in query_filter:
+        return _compare((value.get("date") or {}).get("start") or "", query_filter["date"])
+    if "checkbox" in query_filter:
+        return bool(value.get("checkbox")) == query_filter["checkbox"].get("equals")
+    if "rich_text" in query_filter and "equals" in query_filter["rich_text"]:
+        text = "".join(item.get("plain_text", "") for item in value.get("rich_text") or [])
+        return text == query_filter["rich_text"]["equals"]
+    return True
+
+
+class MockNotionServer:
+    """
+    Threaded HTTP server emulating the Notion API.
+
+    Args:
+        latency_ms: Mean delay added to every response
+        jitter_ms: Uniform +/- jitter on the delay
+        rate_limit: Requests per second allowed before answering 429 (0: unlimited)
+        burst: Requests allowed back to back before rate limiting starts
+        retry_after: Seconds advertised in the Retry-After header of a 429
+        seed: Seed for the latency jitter, for repeatable runs
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit: float = 0.0,
+                 burst: int = 3, retry_after: float = 1.0, host: str = "127.0.0.1", port: int = 0,
+                 seed: int | None = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.burst = max(1, burst)
+        self.retry_after = retry_after
+        self.store = NotionStore()
+        self._random = random.Random(seed)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._limit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.bytes_received = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockNotionServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-notion", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockNotionServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """Requests per endpoint, responses per status code, total requests and bytes received."""
+        with self._stats_lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_endpoint": dict(self.requests),
+                "statuses": dict(self.statuses),
+                "rate_limited": self.statuses.get(429, 0),
+                "bytes_received": self.bytes_received,
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.requests.clear()
+            self.statuses.clear()
+            self.bytes_received = 0
+
+    def seed_pages(self, data_source_id: str, properties: list[dict]) -> list[str]:
+        """Add pages (given as request-style properties) to a data source without counting requests."""
+        return [self.store.create_page(data_source_id, page_properties)["id"] for page_properties in properties]
+
+    def _delay(self) -> None:
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        delay_ms = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, delay_ms) / 1000)
+
+    def _allow(self) -> bool:
+        if self.rate_limit <= 0:
+            return True
+        with self._limit_lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def _record(self, endpoint: str, status: int, size: int) -> None:
+        with self._stats_lock:
+            self.requests[endpoint] += 1
+            self.statuses[status] += 1
+            self.bytes_received += size
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _respond(self, endpoint: str, status: int, body: dict, size: int, headers: dict | None = None) -> None:
+                server._record(endpoint, status, size)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method: str) -> None:
+                size = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(size) if size else b""
+                parsed = urlparse(self.path)
+                route, params = server._route(method, parsed.path)
+                endpoint = f"{method} {route or parsed.path}"
+                server._delay()
+                if not server._allow():
+                    retry_after = str(max(1, math.ceil(server.retry_after)))
+                    self._respond(endpoint, 429, _error(429, "rate_limited", "Rate limited"), size, {"Retry-After": retry_after})
+                    return
+                if route is None:
+                    self._respond(endpoint, 404, _error(404, "object_not_found", f"No route for {method} {parsed.path}"), size)
+                    return
+                try:
+                    payload = json.loads(raw) if raw and "json" in (self.headers.get("Content-Type") or "") else {}
+                except ValueError:
+                    self._respond(endpoint, 400, _error(400, "invalid_json", "Body is not valid JSON"), size)
+                    return
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                status, body = server._dispatch(route, params, payload, query, raw)
+                self._respond(endpoint, status, body, size)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def do_PATCH(self) -> None:
+                self._handle("PATCH")
+
+        return Handler
+
+    ROUTES = [
+        ("POST", r"/v1/pages", "pages.create"),
+        ("GET", r"/v1/pages/(?P<id>[^/]+)", "pages.get"),
+        ("GET", r"/v1/pages/(?P<id>[^/]+)/markdown", "pages.markdown"),
+        ("PATCH", r"/v1/pages/(?P<id>[^/]+)", "pages.update"),
+        ("POST", r"/v1/data_sources/(?P<id>[^/]+)/query", "data_sources.query"),
+        ("GET", r"/v1/data_sources/(?P<id>[^/]+)", "data_sources.get"),
+        ("PATCH", r"/v1/data_sources/(?P<id>[^/]+)", "data_sources.update"),
+        ("POST", r"/v1/databases", "databases.create"),
+        ("GET", r"/v1/blocks/(?P<id>[^/]+)/children", "blocks.children.list"),
+        ("PATCH", r"/v1/blocks/(?P<id>[^/]+)/children", "blocks.children.append"),
+        ("PATCH", r"/v1/blocks/(?P<id>[^/]+)", "blocks.update"),
+        ("POST", r"/v1/file_uploads", "file_uploads.create"),
+        ("POST", r"/v1/file_uploads/(?P<id>[^/]+)/send", "file_uploads.send"),
+    ]
+
+    def _route(self, method: str, path: str) -> tuple[str | None, dict]:
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, path.rstrip("/"))
+            if route_method == method and match:
+                return name, match.groupdict()
+        return None, {}
+
+    def _dispatch(self, route: str, params: dict, payload: dict, query: dict, raw: bytes) -> tuple[int, dict]:
+        store = self.store
+        if route == "pages.create":
+            parent = payload.get("parent") or {}
+            data_source_id = parent.get("data_source_id") or parent.get("database_id")
+            if not data_source_id:
+                return 400, _error(400, "validation_error", "parent.data_source_id is required")
+            return 200, store.create_page(data_source_id, payload.get("properties") or {})
+        if route in ("pages.get", "pages.update"):
+            page = store.pages.get(params["id"]) if route == "pages.get" else store.update_page(params["id"], payload)
+            if page is None:
+                return 404, _error(404, "object_not_found", f"Could not find page with ID: {params['id']}")
+            return 200, page
+        if route == "pages.markdown":
+            if params["id"] not in store.pages:
+                return 404, _error(404, "object_not_found", f"Could not find page with ID: {params['id']}")
+            return 200, {"object": "page_markdown", "id": params["id"], "markdown": store.markdown(params["id"]),
+                         "truncated": False, "unknown_block_ids": []}
+        if route == "data_sources.query":
+            results = store.query(params["id"], payload.get("filter"))
+            page_size = min(int(payload.get("page_size") or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+            start = int(payload.get("start_cursor") or 0)
+            chunk = results[start:start + page_size]
+            has_more = start + page_size < len(results)
+            return 200, {"object": "list", "results": chunk, "has_more": has_more,
+                         "next_cursor": str(start + page_size) if has_more else None}
+        if route == "data_sources.get":
+            with store.lock:
+                properties = dict(store.schemas.get(params["id"], {}))
+            return 200, {"object": "data_source", "id": params["id"], "properties": properties}
+        if route == "data_sources.update":
+            with store.lock:
+                schema = store.schemas.setdefault(params["id"], {})
+                for name, definition in (payload.get("properties") or {}).items():
+                    if definition is None:
+                        schema.pop(name, None)
+                    else:
+                        schema[name] = {"id": name[:4], "name": name, "type": next(iter(definition), None), **definition}
+                properties = dict(schema)
+            return 200, {"object": "data_source", "id": params["id"], "properties": properties}
+        if route == "databases.create":
+            data_source_id = str(uuid.uuid4())
+            store.data_sources[data_source_id] = []
+            return 200, {"object": "database", "id": str(uuid.uuid4()),
+                         "data_sources": [{"id": data_source_id, "name": "Mock data source"}]}
+        if route == "blocks.children.list":
+            blocks = [block for block in store.blocks.get(params["id"], []) if not block["in_trash"]]
+            page_size = min(int(query.get("page_size") or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+            start = int(query.get("start_cursor") or 0)
+            has_more = start + page_size < len(blocks)
+            return 200, {"object": "list", "results": blocks[start:start + page_size], "has_more": has_more,
+                         "next_cursor": str(start + page_size) if has_more else None}
+        if route == "blocks.children.append":
+            children = payload.get("children") or []
+            if len(children) > MAX_APPEND_CHILDREN:
+                return 400, _error(400, "validation_error", f"body.children.length should be ≤ {MAX_APPEND_CHILDREN}")
+            return 200, {"object": "list", "results": store.append_blocks(params["id"], children)}
+        if route == "blocks.update":
+            block = store.trash_block(params["id"]) if payload.get("in_trash") else None
+            if block is None:
+                return 404, _error(404, "object_not_found", f"Could not find block with ID: {params['id']}")
+            return 200, block
+        if route == "file_uploads.create":
+            upload_id = str(uuid.uuid4())
+            store.uploads[upload_id] = {"object": "file_upload", "id": upload_id, "status": "pending",
+                                        "upload_url": f"{self.url}/v1/file_uploads/{upload_id}/send"}
+            return 200, store.uploads[upload_id]
+        if route == "file_uploads.send":
+            upload = store.uploads.get(params["id"])
+            if upload is None:
+                return 404, _error(404, "object_not_found", f"Could not find file upload with ID: {params['id']}")
+            upload.update(status="uploaded", content_length=len(raw))
+            return 200, upload
+        return 404, _error(404, "object_not_found", route)
+
+
+def _error(status: int, code: str, message: str) -> dict:
+    return {"object": "error", "status": status, "code": code, "message": message}
+
+
+@contextmanager
+def redirect_notion_api(base_url: str):
+    """
+    Send requests for NOTION_API_URL to `base_url` for the duration of the block.
+
+    Applies to everything that goes through `requests`, including the module
+    level helpers NotionHelper uses for uploads.
+    """
+    original_request = requests.Session.request
+
+    def request(self, method, url, *args, **kwargs):
+        if isinstance(url, str) and url.startswith(NOTION_API_URL):
+            url = base_url + url[len(NOTION_API_URL):]
+        return original_request(self, method, url, *args, **kwargs)
+
+    requests.Session.request = request
+    try:
+        yield
+    finally:
+        requests.Session.request = original_request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the mock Notion API until interrupted.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/sec before answering 429 (0: unlimited)")
+    args = parser.parse_args()
+
+    server = MockNotionServer(args.latency_ms, args.jitter_ms, args.rate_limit, port=args.port)
+    print(f"Mock Notion API on {server.url}/v1 (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Send one prompt to several Groq models at once and record how each performed.
+
+Completions are streamed concurrently with AsyncGroq; every model's text is
+passed to a callback as it arrives so the Tasks page can render the answers
+side by side. Latency, time to first token, throughput and output size are
+appended to a local SQLite table so models can be compared over many runs.
+"""
+import asyncio
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from task_context import estimate_tokens
+
+METRICS_DB_PATH = Path(".llm-metrics.sqlite")
+# Minimum seconds between UI updates per model while streaming.
+STREAM_UPDATE_INTERVAL = 0.1
+
+METRICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS model_runs (
+    run_at TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_key TEXT NOT NULL,
+    prompt_tokens INTEGER,
+    first_token_s REAL,
+    latency_s REAL,
+    output_tokens INTEGER,
+    tokens_per_second REAL,
+    output_chars INTEGER,
+    error TEXT
+)
+"""
+
+
+@dataclass
+class ModelRun:
+    model: str
+    text: str = ""
+    first_token_s: float | None = None
+    latency_s: float | None = None
+    output_tokens: int = 0
+    tokens_per_second: float | None = None
+    error: str = ""
+
+    @property
+    def output_chars(self) -> int:
+        return len(self.text)
+
+
+async def stream_completion(client, model: str, prompt: str, on_text: Callable[[str], None] | None = None) -> ModelRun:
+    """
+    Stream one completion, calling `on_text` with the text so far.
+
+    Errors are recorded on the returned ModelRun rather than raised, so one
+    failing model does not cancel the others.
+    """
+    run = ModelRun(model)
+    started = time.perf_counter()
+    last_update = 0.0
+    usage = None
+    try:
+        stream = await client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=model,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.x_groq is not None and chunk.x_groq.usage is not None:
+                usage = chunk.x_groq.usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if run.first_token_s is None:
+                run.first_token_s = time.perf_counter() - started
+            run.text += delta
+            now = time.perf_counter()
+            if on_text and now - last_update >= STREAM_UPDATE_INTERVAL:
+                on_text(run.text)
+                last_update = now
+    except Exception as e:
+        run.error = f"{type(e).__name__}: {e}"
+    run.latency_s = time.perf_counter() - started
+    if on_text:
+        on_text(run.text or f"Error: {run.error}")
+
+    run.output_tokens = usage.completion_tokens if usage is not None else estimate_tokens(run.text, model)
+    generation_s = run.latency_s - (run.first_token_s or 0.0)
+    if run.output_tokens and generation_s > 0:
+        run.tokens_per_second = run.output_tokens / generation_s
+    return run
+
+
+async def compare_models_async(
+    api_key: str,
+    models: list[str],
+    prompt: str,
+    on_text: dict[str, Callable[[str], None]] | None = None,
+) -> list[ModelRun]:
+    from groq import AsyncGroq
+
+    on_text = on_text or {}
+    async with AsyncGroq(api_key=api_key) as client:
+        return await asyncio.gather(
+            *(stream_completion(client, model, prompt, on_text.get(model)) for model in models)
+        )
+
+
+def compare_models(
+    api_key: str,
+    models: list[str],
+    prompt: str,
+    on_text: dict[str, Callable[[str], None]] | None = None,
+) -> list[ModelRun]:
+    """
+    Run `prompt` against every model concurrently.
+
+    Args:
+        api_key: Groq API key
+        models: Models to compare
+        prompt: The prompt sent to each model
+        on_text: Optional per-model callback receiving the streamed text so far
+
+    Returns:
+        list: One ModelRun per model, in the order given
+    """
+    return asyncio.run(compare_models_async(api_key, models, prompt, on_text))
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    connection.execute(METRICS_SCHEMA)
+    return connection
+
+
+def record_runs(runs: list[ModelRun], prompt_key: str, prompt_tokens: int, path: Path = METRICS_DB_PATH) -> None:
+    """Append one metrics row per model run."""
+    run_at = datetime.now().astimezone().isoformat(timespec="seconds")
+    rows = [
+        (run_at, run.model, prompt_key, prompt_tokens, run.first_token_s, run.latency_s,
+         run.output_tokens, run.tokens_per_second, run.output_chars, run.error)
+        for run in runs
+    ]
+    with _connect(path) as connection:
+        connection.executemany("INSERT INTO model_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.close()
+
+
+def runs_table(runs: list[ModelRun]) -> pd.DataFrame:
+    """Metrics for one comparison, fastest first."""
+    table = pd.DataFrame([{k: v for k, v in asdict(run).items() if k != "text"} | {"output_chars": run.output_chars} for run in runs])
+    return table.sort_values("latency_s", ignore_index=True)
+
+
+def load_metrics(path: Path = METRICS_DB_PATH) -> pd.DataFrame:
+    if not Path(path).exists():
+        return pd.DataFrame()
+    with _connect(path) as connection:
+        metrics = pd.read_sql_query("SELECT * FROM model_runs", connection)
+    connection.close()
+    return metrics
+
+
+def summarize_metrics(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Median performance per model over all recorded runs that succeeded."""
+    if metrics.empty:
+        return metrics
+    succeeded = metrics[metrics["error"].fillna("") == ""]
+    summary = succeeded.groupby("model").agg(
+        runs=("latency_s", "size"),
+        median_latency_s=("latency_s", "median"),
+        median_first_token_s=("first_token_s", "median"),
+        median_tokens_per_second=("tokens_per_second", "median"),
+        median_output_chars=("output_chars", "median"),
+    )
+    return summary.sort_values("median_latency_s").reset_index()
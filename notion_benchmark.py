@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Notion-heavy workflows against the local mock Notion API.
+
+Runs process_dataframe, create_new_page, upload_pngs_to_notion,
+run_github_trending_workflow and get_agenda in a scratch directory with
+dummy secrets, so nothing touches the real workspace, and reports wall time
+and Notion requests/sec per workflow. Save results with --json and pass them
+back with --baseline to fail when a workflow gets slower.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Callable
+
+from mock_notion_server import MockNotionServer, redirect_notion_api
+
+REPO_ROOT = Path(__file__).resolve().parent
+SCENARIOS = ["process_dataframe", "create_new_page", "upload_pngs_to_notion", "run_github_trending_workflow", "get_agenda"]
+MOCK_IDS = {
+    "PARTNERS_AGENDA_ID": "11111111-1111-4111-8111-111111111111",
+    "TEAM_AGENDA_ID": "22222222-2222-4222-8222-222222222222",
+    "TASKS_ID": "33333333-3333-4333-8333-333333333333",
+    "RAZOR_DB_ID": "44444444-4444-4444-8444-444444444444",
+    "INTERVIEWS_ID": "55555555-5555-4555-8555-555555555555",
+}
+MOCK_SECRETS = {"NOTION_TOKEN": "mock-notion-token", "RESEND_API_KEY": "mock-resend-key", "GROQ_API_KEY": "mock-groq-key", **MOCK_IDS}
+# Fail --baseline comparisons when a workflow is this much slower.
+DEFAULT_TOLERANCE = 0.25
+
+
+def prepare_workdir(workdir: Path) -> None:
+    """Dummy secrets and the files the workflows read, in a scratch working directory."""
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    (workdir / ".streamlit").mkdir(parents=True, exist_ok=True)
+    secrets = "\n".join(f'{name} = "{value}"' for name, value in MOCK_SECRETS.items())
+    (workdir / ".streamlit" / "secrets.toml").write_text(secrets + "\n", encoding="utf-8")
+    shutil.copy(REPO_ROOT / "notification_template.html", workdir / "notification_template.html")
+    config.set_option("secrets.files", [str(workdir / ".streamlit" / "secrets.toml")])
+    # The workflows call st.* outside `streamlit run`; silence the bare-mode warnings.
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+    # 429 retries are counted in the results table instead.
+    logging.getLogger("notionhelper").setLevel(logging.ERROR)
+    os.environ["TRACE_PATH"] = str(workdir / ".traces.jsonl")
+    os.chdir(workdir)
+
+
+def png_bytes(width: int, height: int, seed: int) -> bytes:
+    """A noisy RGB PNG, so compressed sizes resemble a rendered page rather than a blank image."""
+    rows = []
+    state = seed or 1
+    for _ in range(height):
+        row = bytearray(width * 3)
+        for index in range(0, len(row), 12):
+            state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+            row[index:index + 12] = state.to_bytes(4, "little") * 3
+        rows.append(b"\x00" + bytes(row))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"".join(rows), 6)) + chunk(b"IEND", b"")
+
+
+def contacts_frame(rows: int):
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Application reference": [f"A4718-{index:05d}" for index in range(rows)],
+            "First name": [f"Candidate{index}" for index in range(rows)],
+            "Last name": [f"Surname{index}" for index in range(rows)],
+            "Telephone number": [f"0207 946 {index:04d}" for index in range(rows)],
+            "Email address": [f"candidate{index}@example.com" for index in range(rows)],
+        }
+    )
+
+
+def markdown_document(blocks: int) -> str:
+    parts = []
+    for index in range(blocks):
+        kind = index % 4
+        if kind == 0:
+            parts.append(f"## Section {index}")
+        elif kind == 1:
+            parts.append(f"Paragraph {index} with **bold**, *italic* and a [link](https://example.com/{index}). " * 3)
+        elif kind == 2:
+            parts.append(f"- Bullet {index}\n- Bullet {index} again")
+        else:
+            parts.append(f"1. Step {index}")
+    return "\n\n".join(parts)
+
+
+def trending_fixture(repos: int, path: Path) -> Path:
+    repo_list = [
+        {
+            "fullname": f"example-org/project-{index}",
+            "url": f"https://github.com/example-org/project-{index}",
+            "language": "python",
+            "stars": 1000 + index,
+            "currentPeriodStars": 50 + index,
+        }
+        for index in range(repos)
+    ]
+    path.write_text(json.dumps({"python/daily": repo_list}), encoding="utf-8")
+    return path
+
+
+def agenda_pages(items: int) -> list[dict]:
+    people = ["Alex", "Sam", "Jo", "Kim"]
+    return [
+        {
+            "Agenda Item": {"title": [{"text": {"content": f"Agenda item {index}"}}]},
+            "Brief Description": {"rich_text": [{"text": {"content": f"Details for item {index}."}}]},
+            "Person": {"select": {"name": people[index % len(people)]}},
+            "Completed": {"checkbox": index % 5 == 0},
+        }
+        for index in range(items)
+    ]
+
+
+def build_scenarios(server: MockNotionServer, args: argparse.Namespace, workdir: Path) -> dict[str, Callable[[], int]]:
+    """Each scenario returns the number of items it processed."""
+    import main
+    import notion_interviews
+    import pdf_to_png
+    import razor_db_create_new_page as razor
+
+    nh = main.nh
+    # 0 disables client-side pacing so the benchmark measures the code, not the limiter.
+    nh._rate_limiter.rate = args.client_rps if args.client_rps > 0 else 1e9
+    contacts = contacts_frame(args.rows)
+    markdown = markdown_document(args.blocks)
+    os.environ["GITHUB_TRENDING_FIXTURE"] = str(trending_fixture(args.repos, workdir / "trending-fixture.json"))
+    server.seed_pages(MOCK_IDS["PARTNERS_AGENDA_ID"], agenda_pages(args.agenda_items))
+
+    png_paths = []
+    for index in range(args.images):
+        png_path = workdir / f"page-{index + 1:03d}.png"
+        png_path.write_bytes(png_bytes(args.image_size, args.image_size * 7 // 5, index + 1))
+        png_paths.append(png_path)
+    image_page_id = server.seed_pages(MOCK_IDS["RAZOR_DB_ID"], [{"Title": {"title": [{"text": {"content": "Images"}}]}}])[0]
+
+    return {
+        "process_dataframe": lambda: notion_interviews.process_dataframe(nh, MOCK_IDS["INTERVIEWS_ID"], contacts),
+        "create_new_page": lambda: len(razor.create_new_page("Benchmark page", "Mock", "Benchmark", "https://example.com", markdown)["append_result"]["results"]),
+        "upload_pngs_to_notion": lambda: len(pdf_to_png.upload_pngs_to_notion(nh, image_page_id, png_paths)),
+        "run_github_trending_workflow": lambda: sum(main.run_github_trending_workflow(["python"], ["daily"])),
+        "get_agenda": lambda: main.get_agenda(MOCK_IDS["PARTNERS_AGENDA_ID"])[1].count("<h3>"),
+    }
+
+
+def run_scenario(server: MockNotionServer, scenario: Callable[[], int], repeat: int) -> dict:
+    """
+    Run one scenario `repeat` times.
+
+    Returns:
+        dict: items, median/min wall seconds, requests per run, requests/sec,
+        items/sec and 429 responses per run; or the error if a run failed
+    """
+    walls, requests_made, rate_limited, items = [], [], [], 0
+    for _ in range(repeat):
+        server.reset_stats()
+        # The workflows print progress for the UI; keep it out of the results table.
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            try:
+                items = scenario()
+            except Exception as exc:
+                stats = server.stats()
+                return {"error": f"{type(exc).__name__}: {exc}", "requests": stats["requests"], "rate_limited": stats["rate_limited"]}
+            walls.append(time.perf_counter() - start)
+        stats = server.stats()
+        requests_made.append(stats["requests"])
+        rate_limited.append(stats["rate_limited"])
+    wall = statistics.median(walls)
+    requests_per_run = statistics.median(requests_made)
+    return {
+        "items": items,
+        "wall_s": round(wall, 4),
+        "min_wall_s": round(min(walls), 4),
+        "requests": requests_per_run,
+        "requests_per_s": round(requests_per_run / wall, 1) if wall else None,
+        "items_per_s": round(items / wall, 1) if wall else None,
+        "rate_limited": statistics.median(rate_limited),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Scenarios whose median wall time grew by more than `tolerance` over the baseline."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("wall_s"):
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: failed ({result['error']})")
+            continue
+        change = result["wall_s"] / previous["wall_s"] - 1
+        if change > tolerance:
+            regressions.append(f"{name}: {previous['wall_s']:.3f}s -> {result['wall_s']:.3f}s ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the median is reported (default: 3)")
+    parser.add_argument("--latency-ms", type=float, default=120.0, help="Mock API latency per request (default: 120)")
+    parser.add_argument("--jitter-ms", type=float, default=40.0, help="Uniform latency jitter (default: 40)")
+    parser.add_argument("--server-rps", type=float, default=0.0, help="Mock API rate limit before 429s (default: 0, unlimited)")
+    parser.add_argument("--client-rps", type=float, default=0.0, help="Pace of the app's Notion rate limiter (default: 0, unpaced)")
+    parser.add_argument("--rows", type=int, default=40, help="Contacts for process_dataframe (default: 40)")
+    parser.add_argument("--blocks", type=int, default=240, help="Markdown blocks for create_new_page (default: 240)")
+    parser.add_argument("--images", type=int, default=4, help="PNGs for upload_pngs_to_notion (default: 4)")
+    parser.add_argument("--image-size", type=int, default=400, help="PNG width in pixels (default: 400)")
+    parser.add_argument("--repos", type=int, default=25, help="Trending repos in the fixture (default: 25)")
+    parser.add_argument("--agenda-items", type=int, default=150, help="Pages in the agenda data source (default: 150)")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown vs the baseline (default: 0.25)")
+    parser.add_argument("--keep-workdir", action="store_true", help="Keep the scratch directory for inspection")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    sys.path.insert(0, str(REPO_ROOT))
+    workdir = Path(tempfile.mkdtemp(prefix="notion-benchmark-"))
+    cwd = os.getcwd()
+    prepare_workdir(workdir)
+    results = {}
+    try:
+        with MockNotionServer(args.latency_ms, args.jitter_ms, args.server_rps) as server, redirect_notion_api(server.url):
+            scenarios = build_scenarios(server, args, workdir)
+            print(f"Mock Notion API at {server.url}: {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms latency, "
+                  f"server limit {args.server_rps or 'none'} req/s, client pace {args.client_rps or 'none'} req/s\n")
+            print(f"{'scenario':<30} {'items':>6} {'wall':>9} {'requests':>9} {'req/s':>7} {'items/s':>8} {'429s':>5}")
+            print("-" * 80)
+            for name in args.scenarios:
+                result = run_scenario(server, scenarios[name], args.repeat)
+                results[name] = result
+                if "error" in result:
+                    print(f"{name:<30} failed after {result['requests']} requests ({result['rate_limited']} 429s): {result['error']}")
+                    continue
+                print(f"{name:<30} {result['items']:>6} {result['wall_s']:>8.3f}s {result['requests']:>9.0f} "
+                      f"{result['requests_per_s'] or 0:>7.1f} {result['items_per_s'] or 0:>8.1f} {result['rate_limited']:>5.0f}")
+    finally:
+        os.chdir(cwd)
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"\nScratch directory kept at {workdir}")
+
+    if args.json:
+        settings = {key: value for key, value in vars(args).items() if key not in ("json", "baseline")}
+        args.json.write_text(json.dumps({"settings": settings, "results": results}, indent=2, default=str), encoding="utf-8")
+    if baseline:
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Streamlit caching for API clients and Notion data-source reads.
+
+Every widget interaction reruns the script, so clients are created once per
+process with `st.cache_resource` and data-source DataFrames are kept for a
+short TTL with `st.cache_data`. Call `invalidate_data_source` after writing to
+a data source so the next read sees the change.
+"""
+import pandas as pd
+import streamlit as st
+from notionhelper import NotionHelper
+
+from rate_limit import NOTION_REQUESTS_PER_SECOND, RateLimiter, rate_limit_notion_helper
+from tracing import trace_notion_requests
+
+# Data-source reads are served from cache for this long.
+DATA_SOURCE_TTL_SECONDS = 300
+# Short bursts keep interactive reads snappy while bulk jobs settle at the API rate.
+NOTION_BURST = 3
+
+
+@st.cache_resource(show_spinner=False)
+def get_notion_helper(notion_token: str) -> NotionHelper:
+    """
+    Shared NotionHelper for the given token.
+
+    All of its requests go through one rate limiter, so concurrent work from
+    any page shares Notion's per-integration request budget, and each request
+    is recorded as a tracing span.
+    """
+    limiter = RateLimiter(NOTION_REQUESTS_PER_SECOND, burst=NOTION_BURST)
+    return trace_notion_requests(rate_limit_notion_helper(NotionHelper(notion_token), limiter))
+
+
+@st.cache_resource(show_spinner=False)
+def get_llm_response_cache():
+    """Process-wide cache of LLM responses, shared by every session."""
+    from llm_cache import ResponseCache
+
+    return ResponseCache()
+
+
+@st.cache_data(ttl=DATA_SOURCE_TTL_SECONDS, show_spinner=False)
+def load_data_source(data_source_id: str) -> pd.DataFrame:
+    """
+    Return all pages of a data source as a DataFrame, cached per data source.
+
+    st.cache_data hands each caller its own copy, so the result may be
+    modified freely.
+    """
+    nh = get_notion_helper(st.secrets["NOTION_TOKEN"])
+    return nh.get_data_source_pages_as_dataframe(data_source_id, utc=True)
+
+
+def iter_query_pages(nh: NotionHelper, data_source_id: str, query_filter: dict | None = None):
+    """
+    Yield raw pages from a data source query, following pagination.
+
+    Uncached; use `query_data_source` for reads that back the UI.
+
+    Args:
+        nh: NotionHelper used for the requests
+        data_source_id: The data source to query
+        query_filter: Optional Notion filter object, evaluated by Notion
+    """
+    url = f"https://api.notion.com/v1/data_sources/{data_source_id}/query"
+    cursor = None
+    while True:
+        payload = {"page_size": 100}
+        if query_filter:
+            payload["filter"] = query_filter
+        if cursor:
+            payload["start_cursor"] = cursor
+        response = nh._make_request("POST", url, payload)
+        yield from response.get("results", [])
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            break
+
+
+@st.cache_data(ttl=DATA_SOURCE_TTL_SECONDS, show_spinner=False)
+def query_data_source(data_source_id: str, query_filter: dict) -> pd.DataFrame:
+    """
+    Return the pages matching a Notion query filter as a DataFrame.
+
+    The filter is evaluated by Notion, so only matching pages are downloaded.
+    Results are cached per data source and filter.
+    """
+    nh = get_notion_helper(st.secrets["NOTION_TOKEN"])
+    records = [
+        nh._page_properties_to_record(page, include_page_ids=True, utc=True)
+        for page in iter_query_pages(nh, data_source_id, query_filter)
+    ]
+    return pd.DataFrame(records)
+
+
+def invalidate_data_source(data_source_id: str) -> None:
+    """
+    Drop cached reads of one data source after a write.
+
+    Filtered queries cannot be cleared per data source, so all of them are
+    dropped; they are cheap to re-run because Notion does the filtering.
+    """
+    load_data_source.clear(data_source_id)
+    query_data_source.clear()
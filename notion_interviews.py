@@ -1,10 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
 from pathlib import Path
 import re
 
-import fitz
 import pandas as pd
 import streamlit as st
 from notionhelper import NotionHelper
+from llm_client import set_endpoint_concurrency
 from split_candidates import CandidateRecord, split_candidate_records
 from summarize_candidates_to_notion import (
     ASSESSMENT_PROMPT,
@@ -15,6 +17,7 @@ from summarize_candidates_to_notion import (
     generate_summary_with_settings,
     normalize_name,
 )
+from tracing import span
 
 CSV_PATH = Path("example_data/A4718-26-0003-contact-details.csv")
 PDF_PATH = Path("example_data/A4718-26-0003-Application forms.Pdf")
@@ -217,11 +220,12 @@ def process_dataframe(
     df = normalise_contact_columns(df)
     validate_contact_columns(df)
 
-    for row in df.itertuples(index=False):
-        nh.new_page_to_data_source(
-            database_id,
-            build_properties(row),
-        )
+    with span("interviews.import_rows", rows=len(df)):
+        for row in df.itertuples(index=False):
+            nh.new_page_to_data_source(
+                database_id,
+                build_properties(row),
+            )
 
     return len(df)
 
@@ -229,15 +233,22 @@ def process_dataframe(
 def extract_pdf_text(pdf_source) -> str:
     """Extract plain text from an uploaded PDF or local PDF path in memory."""
 
-    if isinstance(pdf_source, (str, Path)):
-        doc = fitz.open(pdf_source)
-    else:
-        doc = fitz.open(stream=pdf_source.getvalue(), filetype="pdf")
+    import fitz
 
-    try:
-        return "\n".join(page.get_text("text") for page in doc).strip()
-    finally:
-        doc.close()
+    with span("pdf.extract_text") as extract_span:
+        if isinstance(pdf_source, (str, Path)):
+            doc = fitz.open(pdf_source)
+        else:
+            pdf_bytes = pdf_source.getvalue()
+            extract_span.set(bytes=len(pdf_bytes))
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+        try:
+            text = "\n".join(page.get_text("text") for page in doc).strip()
+            extract_span.set(pages=doc.page_count, text_bytes=len(text.encode("utf-8")))
+            return text
+        finally:
+            doc.close()
 
 
 def extract_llm_score(summary: str) -> float:
@@ -343,8 +354,31 @@ def append_candidate_summary(nh: NotionHelper, page_id: str, candidate: Candidat
         f"**Application reference:** {candidate.reference}\n\n"
         f"{summary}"
     )
-    nh.append_page_body(page_id, body=markdown)
-    update_candidate_completion_properties(nh, page_id, llm_score)
+    with span("interviews.append_summary", bytes=len(markdown.encode("utf-8"))):
+        nh.append_page_body(page_id, body=markdown)
+        update_candidate_completion_properties(nh, page_id, llm_score)
+
+
+def summarize_candidate(
+    nh: NotionHelper,
+    candidate: CandidateRecord,
+    by_reference: dict[str, dict],
+    by_name: dict[str, dict],
+    llm_settings: LocalLLMSettings,
+    job_role: str,
+    assessment_prompt: str,
+) -> tuple[dict, float]:
+    """Match, summarise and write one candidate. Safe to run on a worker thread (no st.* calls)."""
+    notion_candidate = match_candidate(candidate, by_reference, by_name)
+    summary = generate_summary_with_settings(
+        candidate.text,
+        llm_settings,
+        assessment_prompt=assessment_prompt,
+        job_role=job_role,
+    )
+    llm_score = extract_llm_score(summary)
+    append_candidate_summary(nh, notion_candidate["page_id"], candidate, summary)
+    return notion_candidate, llm_score
 
 
 def summarize_candidates_to_notion_pages(
@@ -355,8 +389,25 @@ def summarize_candidates_to_notion_pages(
     job_role: str,
     assessment_prompt: str,
     progress_bar,
+    log=None,
 ) -> tuple[int, int]:
-    by_reference, by_name = notion_candidate_index(nh, data_source_id)
+    """
+    Summarise candidates with the local LLM and write each summary to their Notion page.
+
+    `llm_settings.workers` candidates are processed in parallel; the UI is
+    updated from this thread as each one finishes. If `progress_bar.progress`
+    raises (a background job being cancelled), candidates not yet started are
+    dropped before the exception propagates.
+
+    Args:
+        progress_bar: st.progress bar, or anything with the same `progress` method
+        log: Optional callable given one line per finished candidate
+
+    Returns:
+        tuple: (succeeded, failed) counts
+    """
+    with span("interviews.candidate_index"):
+        by_reference, by_name = notion_candidate_index(nh, data_source_id)
 
     succeeded = 0
     failed = 0
@@ -365,57 +416,53 @@ def summarize_candidates_to_notion_pages(
         progress_bar.progress(1.0, text="No candidate records found.")
         return succeeded, failed
 
-    for index, candidate in enumerate(candidates, start=1):
-        progress_bar.progress((index - 1) / total, text=f"{index}/{total}: {candidate.name}")
-
-        with st.status(
-            f"{index}/{total}: {candidate.name} (`{candidate.reference}`)",
-            state="running",
-            expanded=True,
-        ) as candidate_status:
-            try:
-                st.write("Matching candidate to Notion database row...")
-                notion_candidate = match_candidate(candidate, by_reference, by_name)
-                st.write(f"Matched Notion page `{notion_candidate['page_id']}`.")
-
-                st.write("Calling local LLM...")
-                summary = generate_summary_with_settings(
-                    candidate.text,
-                    llm_settings,
-                    assessment_prompt=assessment_prompt,
-                    job_role=job_role,
-                )
-                llm_score = extract_llm_score(summary)
-                st.write(f"LLM score found: `{llm_score:g}/10`.")
+    workers = max(1, llm_settings.workers)
+    set_endpoint_concurrency(llm_settings.base_url, workers)
+    progress_bar.progress(0.0, text=f"0/{total}: summarising with {workers} parallel request(s)...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                summarize_candidate,
+                nh,
+                candidate,
+                by_reference,
+                by_name,
+                llm_settings,
+                job_role,
+                assessment_prompt,
+            ): candidate
+            for candidate in candidates
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                candidate = futures[future]
+                progress_bar.progress(done / total, text=f"{done}/{total}: {candidate.name}")
+                try:
+                    notion_candidate, llm_score = future.result()
+                except Exception as exc:
+                    failed += 1
+                    if log:
+                        log(f"{candidate.name} ({candidate.reference}): failed: {exc}")
+                    with st.status(f"{candidate.name} (`{candidate.reference}`): failed", state="error", expanded=True):
+                        st.error(f"Failed for {candidate.name}: {exc}")
+                    continue
 
-                st.write("Appending summary to Notion page body...")
-                append_candidate_summary(
-                    nh,
-                    notion_candidate["page_id"],
-                    candidate,
-                    summary,
-                )
                 succeeded += 1
-                candidate_status.update(
-                    label=(
-                        f"{candidate.name}: wrote summary and set "
-                        f"`{SUMMARY_PROPERTY}` / `{LLM_SCORE_PROPERTY}`"
-                    ),
+                if log:
+                    log(f"{candidate.name} ({candidate.reference}): score {llm_score:g}/10, page {notion_candidate['page_id']}")
+                with st.status(
+                    f"{candidate.name}: wrote summary and set `{SUMMARY_PROPERTY}` / `{LLM_SCORE_PROPERTY}`",
                     state="complete",
                     expanded=False,
-                )
-                st.success(
-                    f"Wrote summary to Notion page for {candidate.name} "
-                    f"(`{notion_candidate['page_id']}`), score `{llm_score:g}/10`."
-                )
-            except Exception as exc:
-                failed += 1
-                candidate_status.update(
-                    label=f"{candidate.name}: failed",
-                    state="error",
-                    expanded=True,
-                )
-                st.error(f"Failed for {candidate.name}: {exc}")
+                ):
+                    st.write(f"Matched Notion page `{notion_candidate['page_id']}`.")
+                    st.success(
+                        f"Wrote summary to Notion page for {candidate.name} "
+                        f"(`{notion_candidate['page_id']}`), score `{llm_score:g}/10`."
+                    )
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
 
     progress_bar.progress(1.0, text=f"Finished: {succeeded} succeeded, {failed} failed")
     return succeeded, failed
@@ -485,6 +532,13 @@ def render_notion_interview_database(nh: NotionHelper) -> None:
             value=DEFAULT_MODEL,
             help="Model name sent to your local LLM server.",
         )
+        llm_workers = st.number_input(
+            "Parallel requests",
+            min_value=1,
+            max_value=16,
+            value=1,
+            help="Candidates summarised at once. Match the number of parallel slots your LLM server runs.",
+        )
         st.caption("Endpoint defaults come from `summarize_candidates_to_notion.py`.")
 
     with st.expander("Recruitment scoring prompt", expanded=True):
@@ -531,6 +585,17 @@ def render_notion_interview_database(nh: NotionHelper) -> None:
     else:
         st.warning(f"Upload a PDF to summarize candidates. Default PDF not found at `{PDF_PATH}`.")
 
+    summarize_in_background = st.toggle(
+        "Summarise in the background",
+        value=False,
+        help=(
+            "Queue the LLM summaries as a background job instead of running them in this page. "
+            "The job keeps going if you close the tab; follow it on the Background Jobs page. "
+            "Needs `python jobs.py worker` running on this machine. The job uses the LLM API key "
+            "from `LLM_API_KEY` in the app secrets or the worker's environment, not the field above."
+        ),
+    )
+
     create_database = st.button(
         "Create Interview Database",
         type="primary",
@@ -565,15 +630,37 @@ def render_notion_interview_database(nh: NotionHelper) -> None:
             if pdf_source is not None:
                 with st.spinner("Extracting and splitting candidate PDF...", show_time=True):
                     pdf_text = extract_pdf_text(pdf_source)
-                    candidates = split_candidate_records(pdf_text)
+                    with span("interviews.split", text_bytes=len(pdf_text.encode("utf-8"))) as split_span:
+                        candidates = split_candidate_records(pdf_text)
+                        split_span.set(candidates=len(candidates))
 
                 st.success(f"Extracted {len(candidates)} candidate records from the PDF.")
-                progress_bar = st.progress(0, text="Starting local LLM summarization...")
                 llm_settings = LocalLLMSettings(
                     base_url=llm_base_url.strip() or DEFAULT_BASE_URL,
                     model=llm_model.strip() or DEFAULT_MODEL,
                     api_key=llm_api_key.strip() or "12345",
+                    workers=int(llm_workers),
                 )
+                if summarize_in_background:
+                    from jobs import submit_job
+
+                    job_id = submit_job(
+                        "interview_summaries",
+                        {
+                            "data_source_id": data_source_id,
+                            "candidates": [candidate._asdict() for candidate in candidates],
+                            # The worker reads the API key from LLM_API_KEY; params are stored in plain text.
+                            "llm_settings": {name: value for name, value in asdict(llm_settings).items() if name != "api_key"},
+                            "job_role": job_role.strip() or DEFAULT_JOB_ROLE,
+                            "assessment_prompt": assessment_prompt,
+                        },
+                    )
+                    st.success(
+                        f"Queued background job {job_id} for {len(candidates)} candidates. "
+                        "Follow it on the Background Jobs page."
+                    )
+                    return
+                progress_bar = st.progress(0, text="Starting local LLM summarization...")
                 succeeded, failed = summarize_candidates_to_notion_pages(
                     nh,
                     data_source_id,
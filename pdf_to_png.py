@@ -7,6 +7,8 @@ import streamlit as st
 from streamlit.errors import StreamlitAPIException
 from notionhelper import NotionHelper
 
+from tracing import span
+
 
 DATA_PATH = Path("pdf-images")
 PDF_COMPONENT_NAME = "streamlit-pdf.pdf_viewer"
@@ -31,22 +33,25 @@ def convert_pdf_to_pngs(uploaded_pdf: Any, dpi: int = 200) -> list[Path]:
     file_stem = _safe_file_stem(getattr(uploaded_pdf, "name", "uploaded-pdf"))
     pdf_bytes = uploaded_pdf.getvalue()
     png_paths: list[Path] = []
-    document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    with span("pdf.render_pngs", dpi=dpi, bytes=len(pdf_bytes)) as render_span:
+        document = fitz.open(stream=pdf_bytes, filetype="pdf")
 
-    try:
-        if document.page_count == 0:
-            raise ValueError("The uploaded PDF does not contain any pages.")
-
-        scale = dpi / 72
-        matrix = fitz.Matrix(scale, scale)
-        for page_index in range(document.page_count):
-            page = document.load_page(page_index)
-            pixmap = page.get_pixmap(matrix=matrix, alpha=False)
-            output_path = DATA_PATH / f"{file_stem}-{timestamp}-page-{page_index + 1:03d}.png"
-            pixmap.save(output_path)
-            png_paths.append(output_path)
-    finally:
-        document.close()
+        try:
+            if document.page_count == 0:
+                raise ValueError("The uploaded PDF does not contain any pages.")
+
+            scale = dpi / 72
+            matrix = fitz.Matrix(scale, scale)
+            for page_index in range(document.page_count):
+                page = document.load_page(page_index)
+                pixmap = page.get_pixmap(matrix=matrix, alpha=False)
+                output_path = DATA_PATH / f"{file_stem}-{timestamp}-page-{page_index + 1:03d}.png"
+                pixmap.save(output_path)
+                png_paths.append(output_path)
+                render_span.add("pages")
+                render_span.add("png_bytes", output_path.stat().st_size)
+        finally:
+            document.close()
 
     return png_paths
 
@@ -54,10 +59,12 @@ def convert_pdf_to_pngs(uploaded_pdf: Any, dpi: int = 200) -> list[Path]:
 def upload_pngs_to_notion(nh: NotionHelper, page_id: str, png_paths: list[Path]) -> list[dict[str, Any]]:
     responses = []
     for png_path in png_paths:
-        response = nh.one_step_image_embed(page_id, str(png_path))
-        if isinstance(response, dict) and response.get("object") == "error":
-            message = response.get("message", "Notion returned an error while embedding the image.")
-            raise RuntimeError(message)
+        # one_step_image_embed uploads with requests directly, so it is timed here.
+        with span("notion.image_embed", bytes=png_path.stat().st_size):
+            response = nh.one_step_image_embed(page_id, str(png_path))
+            if isinstance(response, dict) and response.get("object") == "error":
+                message = response.get("message", "Notion returned an error while embedding the image.")
+                raise RuntimeError(message)
         responses.append(response)
     return responses
 
@@ -0,0 +1,286 @@
+"""
+On-demand profiling of one Streamlit page run.
+
+`profile_page` wraps the selected page's code. When the sidebar toggle is
+off it only checks a flag. When it is on, the run is recorded with
+pyinstrument if it is installed (sampling, low overhead) and cProfile
+otherwise. The result is kept in the session's profile history as a
+PageProfile with a table of the top functions by cumulative time and a call
+tree drawn as a flame graph.
+
+cProfile on Python 3.12+ is process-wide, so only one run is profiled at a
+time; a run that starts while another is being profiled is not recorded.
+"""
+import importlib.util
+import marshal
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+PROFILE_HISTORY = 10
+# Frames below this share of the run are left out of the flame graph.
+MIN_FRAME_SHARE = 0.005
+MAX_FRAME_DEPTH = 60
+PYINSTRUMENT_INTERVAL = 0.001
+
+PYINSTRUMENT_AVAILABLE = importlib.util.find_spec("pyinstrument") is not None
+
+_profiler_lock = threading.Lock()
+
+
+@dataclass
+class PageProfile:
+    page: str
+    engine: str
+    started_at: datetime
+    duration_s: float = 0.0
+    functions: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+    # {"name", "time", "children"} nodes rooted at the page itself.
+    tree: dict = field(default_factory=dict, repr=False)
+    # Raw profile for download: pstats dump (cProfile) or HTML (pyinstrument).
+    raw: bytes = field(default=b"", repr=False)
+    raw_name: str = ""
+    error: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.started_at:%H:%M:%S} · {self.page} · {self.duration_s:.2f}s"
+
+
+def _short_path(path: str) -> str:
+    for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+        if marker in path:
+            return path.split(marker, 1)[1]
+    try:
+        return os.path.relpath(path)
+    except ValueError:
+        return path
+
+
+def _cprofile_label(key: tuple) -> str:
+    filename, line, function = key
+    if filename == "~":
+        return function
+    return f"{function} ({_short_path(filename)}:{line})"
+
+
+def _cprofile_result(profiler, page_profile: PageProfile) -> None:
+    profiler.create_stats()
+    stats = profiler.stats
+    page_profile.raw = marshal.dumps(stats)
+    page_profile.raw_name = f"{page_profile.page}.prof"
+    page_profile.functions = pd.DataFrame(
+        [
+            {
+                "function": _cprofile_label(key),
+                "calls": calls,
+                "own_s": own,
+                "cumulative_s": cumulative,
+                "per_call_ms": cumulative / calls * 1000 if calls else None,
+            }
+            for key, (_, calls, own, cumulative, _) in stats.items()
+        ]
+    )
+
+    callees: dict[tuple, dict[tuple, float]] = defaultdict(dict)
+    roots = []
+    for key, (_, _, _, cumulative, callers) in stats.items():
+        known_callers = [caller for caller in callers if caller in stats]
+        # Time not accounted for by profiled callers was spent directly under the page.
+        untraced = cumulative - sum(callers[caller][3] for caller in known_callers)
+        if untraced > 0:
+            roots.append((key, untraced))
+        for caller in known_callers:
+            callees[caller][key] = callers[caller][3]
+
+    min_time = page_profile.duration_s * MIN_FRAME_SHARE
+
+    def build(key: tuple, time_s: float, path: frozenset) -> dict:
+        node = {"name": _cprofile_label(key), "time": time_s, "children": []}
+        if len(path) >= MAX_FRAME_DEPTH:
+            return node
+        # A function's callees are recorded for all its calls; share them out
+        # in proportion to the time this call path accounts for.
+        scale = time_s / stats[key][3] if stats[key][3] else 0.0
+        for callee, cumulative in sorted(callees[key].items(), key=lambda item: -item[1]):
+            child_time = cumulative * scale
+            if callee in path or child_time < min_time:
+                continue
+            node["children"].append(build(callee, child_time, path | {callee}))
+        return node
+
+    children = [build(key, cumulative, frozenset({key})) for key, cumulative in sorted(roots, key=lambda item: -item[1])
+                if cumulative >= min_time]
+    page_profile.tree = {"name": page_profile.page, "time": page_profile.duration_s, "children": children}
+
+
+def _pyinstrument_result(profiler, page_profile: PageProfile) -> None:
+    session = profiler.last_session
+    page_profile.raw = profiler.output_html().encode("utf-8")
+    page_profile.raw_name = f"{page_profile.page}.html"
+    root = session.root_frame() if session else None
+    min_time = page_profile.duration_s * MIN_FRAME_SHARE
+
+    def build(frame, depth: int) -> dict:
+        name = f"{frame.function} ({frame.file_path_short}:{frame.line_no})" if frame.file_path_short else frame.function
+        node = {"name": name, "time": frame.time, "children": []}
+        if depth < MAX_FRAME_DEPTH:
+            node["children"] = [build(child, depth + 1) for child in frame.children if child.time >= min_time]
+        return node
+
+    children = [build(root, 1)] if root is not None else []
+    page_profile.tree = {"name": page_profile.page, "time": page_profile.duration_s, "children": children}
+    page_profile.functions = tree_functions(page_profile.tree)
+
+
+def tree_functions(tree: dict) -> pd.DataFrame:
+    """Own and cumulative time per function name from a call tree; recursion is counted once per path."""
+    own: dict[str, float] = defaultdict(float)
+    cumulative: dict[str, float] = defaultdict(float)
+
+    def walk(node: dict, path: frozenset) -> None:
+        name = node["name"]
+        own[name] += max(0.0, node["time"] - sum(child["time"] for child in node["children"]))
+        if name not in path:
+            cumulative[name] += node["time"]
+        for child in node["children"]:
+            walk(child, path | {name})
+
+    for child in tree.get("children", []):
+        walk(child, frozenset())
+    return pd.DataFrame(
+        [{"function": name, "calls": None, "own_s": own[name], "cumulative_s": cumulative[name], "per_call_ms": None}
+         for name in cumulative]
+    )
+
+
+@contextmanager
+def profile_page(page: str, enabled: bool, history: list | None = None):
+    """
+    Profile the enclosed block when `enabled`.
+
+    The profile is appended to `history` (oldest dropped beyond
+    PROFILE_HISTORY) even when the block ends with st.stop() or st.rerun().
+
+    Args:
+        page: Page name, used as the profile label
+        enabled: Sidebar toggle; when False nothing is recorded
+        history: List the PageProfile is appended to, e.g. in st.session_state
+
+    Yields:
+        PageProfile | None: Filled in when the block exits; None when disabled
+        or another run is already being profiled
+    """
+    if not enabled:
+        yield None
+        return
+    if not _profiler_lock.acquire(blocking=False):
+        yield None
+        return
+
+    try:
+        if PYINSTRUMENT_AVAILABLE:
+            from pyinstrument import Profiler
+
+            profiler = Profiler(interval=PYINSTRUMENT_INTERVAL)
+            engine = "pyinstrument"
+        else:
+            import cProfile
+
+            profiler = cProfile.Profile()
+            engine = "cProfile"
+        page_profile = PageProfile(page, engine, datetime.now().astimezone())
+        started = time.perf_counter()
+        if engine == "cProfile":
+            profiler.enable()
+        else:
+            profiler.start()
+        try:
+            yield page_profile
+        finally:
+            if engine == "cProfile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            page_profile.duration_s = time.perf_counter() - started
+            try:
+                if engine == "cProfile":
+                    _cprofile_result(profiler, page_profile)
+                else:
+                    _pyinstrument_result(profiler, page_profile)
+            except Exception as exc:
+                page_profile.error = f"{type(exc).__name__}: {exc}"
+            if history is not None:
+                history.append(page_profile)
+                del history[:-PROFILE_HISTORY]
+    finally:
+        _profiler_lock.release()
+
+
+def top_functions(page_profile: PageProfile, limit: int = 30) -> pd.DataFrame:
+    """The `limit` functions with the most cumulative time, excluding the profiler's own frames."""
+    functions = page_profile.functions
+    if functions.empty:
+        return functions
+    functions = functions[~functions["function"].str.contains("profiling.py|_lsprof|pyinstrument", regex=True)]
+    functions = functions.sort_values("cumulative_s", ascending=False).head(limit).copy()
+    functions["share"] = functions["cumulative_s"] / page_profile.duration_s if page_profile.duration_s else None
+    return functions.dropna(axis=1, how="all").round(4).reset_index(drop=True)
+
+
+def flame_frames(tree: dict) -> pd.DataFrame:
+    """One row per call-tree node with its depth and horizontal extent, for an icicle-style flame graph."""
+    rows = []
+
+    def place(node: dict, depth: int, start: float) -> None:
+        rows.append({"name": node["name"], "depth": depth, "start": start, "end": start + node["time"],
+                     "time_ms": round(node["time"] * 1000, 1)})
+        offset = start
+        for child in node["children"]:
+            place(child, depth + 1, offset)
+            offset += child["time"]
+
+    if tree:
+        place(tree, 0, 0.0)
+    frames = pd.DataFrame(rows)
+    if not frames.empty:
+        total = frames.loc[0, "end"] or 1.0
+        frames["share"] = (frames["time_ms"] / 1000 / total).round(3)
+        frames["label"] = frames["name"].str.replace(r" \(.*\)$", "", regex=True)
+    return frames
+
+
+def flame_chart(tree: dict):
+    """Altair icicle chart of the call tree: the page at the top, callees below, width proportional to time."""
+    import altair as alt
+
+    frames = flame_frames(tree)
+    if frames.empty:
+        return None
+    total = frames.loc[0, "end"] or 1.0
+    # Roughly one character fits per 1% of the chart width.
+    frames["text"] = [label if len(label) < share * 100 else label[: max(0, int(share * 100) - 2)] + "…"
+                      for label, share in zip(frames["label"], frames["share"])]
+    frames["wide"] = frames["share"] >= 0.05
+    height = 22 * (int(frames["depth"].max()) + 1)
+    base = alt.Chart(frames).encode(
+        y=alt.Y("depth:O", axis=None, sort="ascending"),
+        tooltip=[alt.Tooltip("name:N", title="function"), alt.Tooltip("time_ms:Q", title="ms"),
+                 alt.Tooltip("share:Q", format=".1%")],
+    )
+    rects = base.mark_rect(stroke="white", strokeWidth=1).encode(
+        x=alt.X("start:Q", axis=None, scale=alt.Scale(domain=[0, total])),
+        x2="end:Q",
+        color=alt.Color("label:N", legend=None, scale=alt.Scale(scheme="tableau20")),
+    )
+    labels = base.transform_filter(alt.datum.wide).mark_text(align="left", dx=3, fontSize=10, color="white").encode(
+        x="start:Q",
+        text=alt.Text("text:N"),
+    )
+    return (rects + labels).properties(height=height)
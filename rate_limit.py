@@ -0,0 +1,77 @@
+"""
+Thread-safe request pacing shared by the Notion workflows.
+"""
+import threading
+import time
+from typing import Any
+
+from notionhelper import NotionHelper  # type: ignore
+
+# Notion documents an average of three requests per second per integration.
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+
+class RateLimiter:
+    """
+    Token bucket allowing at most `rate` calls per second with a small burst.
+
+    Safe to share between threads; `acquire` blocks until a token is available.
+    """
+
+    def __init__(self, rate: float = NOTION_REQUESTS_PER_SECOND, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+def rate_limit_notion_helper(nh: NotionHelper, limiter: RateLimiter) -> NotionHelper:
+    """
+    Route every API call made by `nh` through `limiter`.
+
+    NotionHelper methods such as `get_page` issue several requests internally,
+    so pacing is applied at `_make_request` rather than per public method call.
+
+    Args:
+        nh: The NotionHelper instance to pace
+        limiter: Shared limiter (one per integration token)
+
+    Returns:
+        The same NotionHelper instance, for chaining
+    """
+    if getattr(nh, "_rate_limiter", None) is limiter:
+        return nh
+
+    make_request = getattr(nh, "_unlimited_make_request", nh._make_request)
+
+    def limited_make_request(*args: Any, **kwargs: Any) -> Any:
+        limiter.acquire()
+        return make_request(*args, **kwargs)
+
+    nh._unlimited_make_request = make_request
+    nh._make_request = limited_make_request
+    nh._rate_limiter = limiter
+    return nh
@@ -5,32 +5,24 @@ import re
 from typing import Optional, Any
 import streamlit as st
 import requests
-from notionhelper import NotionHelper
 from notion_blockify import Blockizer
-from groq import Groq
+from llm_client import GROQ_BASE_URL, LLMError, get_llm_client
+from notion_cache import get_notion_helper
+from tracing import span
 # Authentication from Streamlit secrets
 notion_token = st.secrets["NOTION_TOKEN"]
 razor_db_id = st.secrets["RAZOR_DB_ID"]
 groq_api_key = st.secrets["GROQ_API_KEY"]
 
-# Initialize NotionHelper
-nh = NotionHelper(notion_token)
-client = Groq(api_key=st.secrets["GROQ_API_KEY"])
+# Initialize NotionHelper (shared across reruns)
+nh = get_notion_helper(notion_token)
+client = get_llm_client(GROQ_BASE_URL, groq_api_key)
 
 # Simple function to get a response from Groq
 def ask_groq(prompt: str, model: str = "openai/gpt-oss-120b"):
-    chat_completion = client.chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": prompt,
-            }
-        ],
-        model=model,
-    )
     try:
-        return chat_completion.choices[0].message.content
-    except Exception as e:
+        return client.ask(prompt, model)
+    except LLMError as e:
         st.error(f"Error getting response from Groq: {e}")
         return "Error: Could not get a response from Groq."
 
@@ -346,13 +338,31 @@ def filter_valid_blocks(blocks: list) -> list:
         List of sanitized block dictionaries accepted by Notion
     """
     valid_blocks = []
-    for block in blocks:
-        clean_block = _sanitize_notion_block(block)
-        if clean_block:
-            valid_blocks.append(clean_block)
+    with span("blocks.sanitize", blocks=len(blocks)) as sanitize_span:
+        for block in blocks:
+            clean_block = _sanitize_notion_block(block)
+            if clean_block:
+                valid_blocks.append(clean_block)
+        sanitize_span.set(dropped=len(blocks) - len(valid_blocks))
     return valid_blocks
 
 
+def markdown_to_blocks(markdown_body: str) -> list:
+    """
+    Convert markdown to Notion blocks and drop any the API would reject.
+
+    Args:
+        markdown_body: Markdown content
+
+    Returns:
+        List of sanitized block dictionaries
+    """
+    with span("blocks.blockize", bytes=len(markdown_body.encode("utf-8"))) as blockize_span:
+        blocks = Blockizer().convert(markdown_body)
+        blockize_span.set(blocks=len(blocks))
+    return filter_valid_blocks(blocks)
+
+
 def batch_blocks(blocks: list, batch_size: int = 100) -> list[list]:
     """
     Split blocks into batches to comply with Notion API limits.
@@ -453,9 +463,7 @@ def create_new_page(
     append_result = None
     
     if markdown_body:
-        blocks = Blockizer().convert(markdown_body)
-        # Filter out any invalid/malformed blocks
-        blocks = filter_valid_blocks(blocks)
+        blocks = markdown_to_blocks(markdown_body)
         if blocks:
             # Use batching to handle large content (Notion limit is 100 blocks)
             append_result = append_blocks_in_batches(page_id, blocks)
@@ -479,9 +487,7 @@ def append_to_existing_page(page_id: str, markdown_body: str) -> dict:
     Returns:
         API response dictionary
     """
-    blocks = Blockizer().convert(markdown_body)
-    # Filter out any invalid/malformed blocks
-    blocks = filter_valid_blocks(blocks)
+    blocks = markdown_to_blocks(markdown_body)
     if not blocks:
         raise ValueError("No valid blocks generated from markdown content")
     # Use batching to handle large content (Notion limit is 100 blocks)
@@ -499,33 +505,16 @@ def query_llm(prompt: str, system_prompt: Optional[str] = None) -> str:
     Returns:
         Generated markdown content
     """
-    import requests
-    import json
-    
     if system_prompt is None:
         system_prompt = "You are a helpful assistant. Generate well-formatted markdown content based on the user's request."
-    
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {groq_api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "model": "llama-3.3-70b-versatile",
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ],
-        "temperature": 0.7,
-        "max_tokens": 4096
-    }
-    
-    response = requests.post(url, headers=headers, json=data)
-    response.raise_for_status()
-    
-    result = response.json()
-    return result["choices"][0]["message"]["content"]
+
+    return client.ask(
+        prompt,
+        "llama-3.3-70b-versatile",
+        system_prompt=system_prompt,
+        temperature=0.7,
+        max_tokens=4096,
+    )
 
 
 def render_notion_page_creator(model: str = "openai/gpt-oss-120b") -> None:
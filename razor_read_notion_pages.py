@@ -1,22 +1,59 @@
 """
 CLI tool for reading Notion pages with a modern interface.
 """
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List, Iterable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 import argparse
+import json
 import re
 import os
+import sys
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
 from rich.syntax import Syntax
+from rich.theme import Theme
 from notionhelper import NotionHelper  # type: ignore
+from rate_limit import NOTION_REQUESTS_PER_SECOND, RateLimiter, rate_limit_notion_helper
 
 # Initialize Rich console for beautiful output
 console = Console()
 
+# Markdown is rendered in black with no background. The themed console is
+# built once and reused rather than recreated for every page.
+MARKDOWN_THEME = Theme({
+    "markdown.text": "black",
+    "markdown.paragraph": "black",
+    "markdown.h1": "bold black",
+    "markdown.h2": "bold black",
+    "markdown.h3": "bold black",
+    "markdown.h4": "bold black",
+    "markdown.h5": "bold black",
+    "markdown.h6": "bold black",
+    "markdown.code": "black",
+    "markdown.code_block": "black",
+})
+markdown_console = Console(theme=MARKDOWN_THEME)
+
 # Authentication - prefer environment variable for security
+NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 
+NOTION_API_BASE = "https://api.notion.com/v1"
+DEFAULT_CACHE_DIR = Path(".notion-page-cache")
+DEFAULT_WORKERS = 4
+# Long runs of markdown without headings are rendered in chunks of about this size.
+MARKDOWN_SECTION_MAX_LINES = 200
+HEADING_PATTERN = re.compile(r"#{1,6}\s")
+# Opening code fence: a run of 3+ backticks or tildes (CommonMark).
+FENCE_PATTERN = re.compile(r"(`{3,}|~{3,})")
+EXPORT_STATE_FILE = ".export-state.json"
+EXPORT_MANIFEST_FILE = "manifest.jsonl"
+# Save the resumable frontier after this many completed nodes.
+EXPORT_CHECKPOINT_EVERY = 25
+# Blocks that are separate nodes of the tree: recorded as children, never fetched with their parent.
+CHILD_NODE_BLOCK_TYPES = {"child_page": "page", "child_database": "database"}
 
 
 def extract_page_id(input_string: str) -> str:
@@ -56,7 +93,119 @@ def format_page_id(page_id: str) -> str:
     return page_id
 
 
-def read_page(raw_input: str, render_markdown: bool = True, show_raw: bool = False) -> None:
+def iter_markdown_sections(markdown: str, max_section_lines: int = MARKDOWN_SECTION_MAX_LINES) -> Iterator[str]:
+    """
+    Split markdown into sections that can be rendered independently.
+
+    A new section starts at every heading; long stretches without headings
+    are also cut at the next blank line once they reach `max_section_lines`.
+    Fenced code blocks are never split. As in CommonMark, a fence is closed
+    only by a bare run of the same character at least as long as the opening
+    one, so a ```` fence can hold ``` lines.
+
+    Args:
+        markdown: Markdown text
+        max_section_lines: Soft cap on lines per section
+
+    Yields:
+        Markdown sections, in order
+
+    Examples:
+        >>> text = "# A\\n````md\\n```\\n# inside the fence\\n```\\n````\\n# B\\n# C"
+        >>> [section.splitlines()[0] for section in iter_markdown_sections(text)]
+        ['# A', '# B', '# C']
+    """
+    section: List[str] = []
+    fence: Optional[str] = None
+    for line in markdown.splitlines():
+        stripped = line.lstrip()
+        if fence is not None:
+            run = stripped.rstrip()
+            if run.startswith(fence) and not run.strip(fence[0]):
+                fence = None
+        elif opening := FENCE_PATTERN.match(stripped):
+            fence = opening.group(1)
+        elif section and (
+            HEADING_PATTERN.match(stripped)
+            or (not stripped and len(section) >= max_section_lines)
+        ):
+            yield "\n".join(section)
+            section = []
+        section.append(line)
+    if section:
+        yield "\n".join(section)
+
+
+def render_markdown_sections(markdown: str, max_lines: Optional[int] = None) -> None:
+    """
+    Render markdown section by section on the shared themed console.
+
+    Rendering each section as soon as it is parsed keeps time-to-first-output
+    independent of page length, where one `Markdown` object for the whole page
+    must be parsed and laid out before anything is printed.
+
+    Args:
+        markdown: Markdown text
+        max_lines: Stop after this many source lines
+    """
+    lines_left = max_lines
+    for section in iter_markdown_sections(markdown):
+        if lines_left is not None:
+            section_lines = section.splitlines()
+            if len(section_lines) > lines_left:
+                section = "\n".join(section_lines[:lines_left])
+                _render_section(section)
+                _print_truncated(max_lines)
+                return
+            lines_left -= len(section_lines)
+        _render_section(section)
+
+
+def _render_section(section: str) -> None:
+    if not section.strip():
+        return
+    try:
+        markdown_console.print(Markdown(section, code_theme="monokai", inline_code_theme="monokai"))
+    except Exception:
+        # Fallback to plain text with black color
+        markdown_console.print(section, style="black", markup=False, highlight=False)
+
+
+def _print_truncated(max_lines: Optional[int]) -> None:
+    markdown_console.print(f"[dim]… output truncated at {max_lines} lines (--max-lines)[/dim]")
+
+
+def _print_body(body_str: str, render_markdown: bool, show_raw: bool, max_lines: Optional[int]) -> None:
+    """Print page content as raw, plain or rendered markdown."""
+    if show_raw or not (render_markdown and body_str.strip()):
+        if show_raw:
+            # Show raw markdown
+            markdown_console.print("[dim]Raw Markdown:[/dim]")
+        lines = body_str.splitlines()
+        truncated = max_lines is not None and len(lines) > max_lines
+        if truncated:
+            lines = lines[:max_lines]
+        markdown_console.print(
+            "\n".join(lines),
+            style=None if show_raw else "black",
+            markup=False,
+            highlight=False,
+        )
+        if truncated:
+            _print_truncated(max_lines)
+        return
+
+    # Render markdown beautifully in black color with no background
+    render_markdown_sections(body_str, max_lines=max_lines)
+
+
+def read_page(
+    raw_input: str,
+    render_markdown: bool = True,
+    show_raw: bool = False,
+    max_lines: Optional[int] = None,
+    use_pager: bool = False,
+) -> None:
     """
     Read and display a Notion page.
     
@@ -64,6 +213,8 @@ def read_page(raw_input: str, render_markdown: bool = True, show_raw: bool = Fal
         raw_input: Page ID or URL
         render_markdown: Whether to render markdown in terminal
         show_raw: Whether to show raw markdown instead of rendered
+        max_lines: Stop displaying content after this many lines
+        use_pager: Page the content through the system pager
     """
     page_id = extract_page_id(raw_input)
     formatted_id = format_page_id(page_id)
@@ -103,7 +254,7 @@ def read_page(raw_input: str, render_markdown: bool = True, show_raw: bool = Fal
         console.print()
         
         # Display content - body can be str or dict
-        body_str = str(body) if body else ""
+        body_str = _markdown_from_body(body)
         
         if body_str:
             console.print(
@@ -114,35 +265,11 @@ def read_page(raw_input: str, render_markdown: bool = True, show_raw: bool = Fal
             )
             console.print()
             
-            if show_raw:
-                # Show raw markdown
-                console.print("[dim]Raw Markdown:[/dim]")
-                console.print(body_str)
-            elif render_markdown and body_str.strip():
-                # Render markdown beautifully in black color with no background
-                try:
-                    md = Markdown(body_str, code_theme="monokai", inline_code_theme="monokai")
-                    # Create a new console with black style for markdown (no background)
-                    from rich.theme import Theme
-                    black_theme = Theme({
-                        "markdown.text": "black",
-                        "markdown.paragraph": "black",
-                        "markdown.h1": "bold black",
-                        "markdown.h2": "bold black",
-                        "markdown.h3": "bold black",
-                        "markdown.h4": "bold black",
-                        "markdown.h5": "bold black",
-                        "markdown.h6": "bold black",
-                        "markdown.code": "black",
-                        "markdown.code_block": "black",
-                    })
-                    black_console = Console(theme=black_theme)
-                    black_console.print(md)
-                except Exception:
-                    # Fallback to plain text with black color
-                    console.print(f"[black]{body_str}[/black]")
+            if use_pager:
+                with markdown_console.pager(styles=True):
+                    _print_body(body_str, render_markdown, show_raw, max_lines)
             else:
-                console.print(f"[black]{body_str}[/black]")
+                _print_body(body_str, render_markdown, show_raw, max_lines)
         else:
             console.print(
                 Panel(
@@ -163,6 +290,567 @@ def read_page(raw_input: str, render_markdown: bool = True, show_raw: bool = Fal
         raise SystemExit(1)
 
 
+class PageCache:
+    """
+    On-disk cache of page markdown keyed by page ID and `last_edited_time`.
+
+    Each page is stored as `{page_id}.json`; an entry is only served when the
+    page's current `last_edited_time` matches the one recorded at fetch time.
+    Notion rounds `last_edited_time` to the minute, so an edit made within the
+    same minute as the cached fetch is not detected; use --no-cache to force a
+    fresh read.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, page_id: str) -> Path:
+        return self.cache_dir / f"{page_id}.json"
+
+    def get_entry(self, page_id: str, last_edited_time: str) -> Optional[Dict[str, Any]]:
+        """Return the full cache entry if the page has not been edited since caching."""
+        path = self._path(page_id)
+        if not last_edited_time or not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if entry.get("last_edited_time") != last_edited_time:
+            return None
+        return entry
+
+    def get(self, page_id: str, last_edited_time: str) -> Optional[str]:
+        """Return cached markdown if the page has not been edited since caching."""
+        entry = self.get_entry(page_id, last_edited_time)
+        return entry.get("markdown") if entry else None
+
+    def put(self, page_id: str, last_edited_time: str, markdown: str, **extra: Any) -> None:
+        """
+        Store markdown for a page, replacing any previous entry atomically.
+
+        Extra keyword arguments (e.g. discovered child IDs) are stored alongside.
+        """
+        if not last_edited_time:
+            return
+        path = self._path(page_id)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"page_id": page_id, "last_edited_time": last_edited_time, "markdown": markdown, **extra},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+def read_page_ids_file(path: Path) -> List[str]:
+    """
+    Read page IDs or URLs from a file, one per line.
+
+    Blank lines and lines starting with `#` are ignored.
+    """
+    entries = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            entries.append(line)
+    return entries
+
+
+def unique_page_ids(raw_inputs: Iterable[str]) -> List[str]:
+    """Extract page IDs from IDs/URLs, preserving order and dropping duplicates."""
+    page_ids = []
+    seen = set()
+    for raw_input in raw_inputs:
+        page_id = extract_page_id(raw_input)
+        if page_id not in seen:
+            seen.add(page_id)
+            page_ids.append(page_id)
+    return page_ids
+
+
+def _markdown_from_body(body: Union[str, Dict[str, Any], None]) -> str:
+    """Return the markdown string from a `get_page(..., return_markdown=True)` result."""
+    if isinstance(body, dict):
+        content = body.get("content")
+        return content if isinstance(content, str) else ""
+    return str(body) if body else ""
+
+
+def fetch_page_markdown(
+    nh: NotionHelper,
+    page_id: str,
+    cache: Optional[PageCache] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch one page as markdown, serving it from `cache` when unchanged.
+
+    Only the page object is requested to learn `last_edited_time`; on a cache
+    miss the page's own blocks are fetched and converted, as in the recursive
+    export. Child pages are not expanded into the markdown.
+
+    Args:
+        nh: NotionHelper instance (rate limited by the caller)
+        page_id: 32-character page ID
+        cache: Optional page cache
+
+    Returns:
+        Dict with page_id, last_edited_time, cached flag and markdown
+    """
+    page = nh._make_request("GET", f"{NOTION_API_BASE}/pages/{format_page_id(page_id)}")
+    last_edited_time = page.get("last_edited_time", "")
+
+    if cache is not None:
+        markdown = cache.get(page_id, last_edited_time)
+        if markdown is not None:
+            return {
+                "page_id": page_id,
+                "last_edited_time": last_edited_time,
+                "cached": True,
+                "markdown": markdown,
+            }
+
+    markdown = nh._converter_adapter.blocks_to_markdown(fetch_page_blocks(nh, page_id))
+    if cache is not None:
+        cache.put(page_id, last_edited_time, markdown)
+    return {
+        "page_id": page_id,
+        "last_edited_time": last_edited_time,
+        "cached": False,
+        "markdown": markdown,
+    }
+
+
+def iter_pages_markdown(
+    nh: NotionHelper,
+    page_ids: List[str],
+    cache: Optional[PageCache] = None,
+    workers: int = DEFAULT_WORKERS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Fetch many pages concurrently, yielding each result as soon as it completes.
+
+    Failures are yielded as `{"page_id": ..., "error": ...}` so one bad ID does
+    not abort the batch.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(fetch_page_markdown, nh, page_id, cache): page_id
+            for page_id in page_ids
+        }
+        for future in as_completed(futures):
+            page_id = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"page_id": page_id, "error": str(e)}
+
+
+def read_pages(
+    raw_inputs: List[str],
+    output_dir: Optional[Path] = None,
+    jsonl_path: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = NOTION_REQUESTS_PER_SECOND,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> None:
+    """
+    Read many Notion pages and write them as markdown files and/or JSONL.
+
+    Args:
+        raw_inputs: Page IDs or URLs
+        output_dir: Directory for `{page_id}.md` files
+        jsonl_path: JSONL output path, or "-" for stdout
+        workers: Number of concurrent fetch threads
+        rate: Maximum Notion API requests per second across all workers
+        cache_dir: Page cache directory, or None to always re-fetch
+    """
+    page_ids = unique_page_ids(raw_inputs)
+    if not page_ids:
+        console.print("[yellow]No page IDs supplied.[/yellow]")
+        return
+
+    nh = rate_limit_notion_helper(NotionHelper(NOTION_TOKEN), RateLimiter(rate))
+    cache = PageCache(cache_dir) if cache_dir is not None else None
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Progress goes to stderr when JSONL is streamed to stdout.
+    status_console = Console(stderr=True) if jsonl_path == "-" else console
+    jsonl_file = None
+    if jsonl_path == "-":
+        jsonl_file = sys.stdout
+    elif jsonl_path:
+        jsonl_file = open(jsonl_path, "w", encoding="utf-8")
+
+    fetched = cached = failed = 0
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=status_console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task(description=f"Fetching {len(page_ids)} pages...", total=len(page_ids))
+            for result in iter_pages_markdown(nh, page_ids, cache=cache, workers=workers):
+                if "error" in result:
+                    failed += 1
+                    status_console.print(f"[red]✗ {format_page_id(result['page_id'])}: {result['error']}[/red]")
+                else:
+                    if result["cached"]:
+                        cached += 1
+                    else:
+                        fetched += 1
+                    if output_dir is not None:
+                        (output_dir / f"{result['page_id']}.md").write_text(result["markdown"], encoding="utf-8")
+                if jsonl_file is not None:
+                    jsonl_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    jsonl_file.flush()
+                progress.advance(task)
+    finally:
+        if jsonl_file is not None and jsonl_file is not sys.stdout:
+            jsonl_file.close()
+
+    status_console.print(
+        Panel(
+            f"[bold green]✓[/bold green] {fetched} fetched, {cached} from cache"
+            + (f", [red]{failed} failed[/red]" if failed else ""),
+            border_style="red" if failed else "green",
+            title="Bulk Read",
+        )
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+def _compact_id(notion_id: str) -> str:
+    """Strip hyphens from a UUID returned by the API so IDs compare equal."""
+    return notion_id.replace("-", "").lower()
+
+
+def _page_title(page: Dict[str, Any]) -> str:
+    """Return the plain-text title of a page object, if it has one."""
+    for value in page.get("properties", {}).values():
+        if isinstance(value, dict) and value.get("type") == "title":
+            return "".join(item.get("plain_text", "") for item in value.get("title", []))
+    return ""
+
+
+def fetch_page_blocks(nh: NotionHelper, block_id: str) -> List[Dict[str, Any]]:
+    """
+    Fetch a page's own block tree, one `/blocks/{id}/children` listing per container.
+
+    Nested blocks (toggles, columns, lists, ...) are fetched and attached as
+    `children` of their parent's payload, as `NotionHelper._get_page_blocks`
+    does, but child pages and child databases are left unexpanded: they are
+    separate nodes, exported (and cached) on their own.
+    """
+    blocks: List[Dict[str, Any]] = []
+    params: Dict[str, Any] = {"page_size": 100}
+    while True:
+        response = nh._make_request("GET", f"{NOTION_API_BASE}/blocks/{format_page_id(block_id)}/children", params=params)
+        blocks.extend(block for block in response.get("results", []) if isinstance(block, dict))
+        if not response.get("has_more") or not response.get("next_cursor"):
+            break
+        params = {"page_size": 100, "start_cursor": response["next_cursor"]}
+
+    for block in blocks:
+        block_type = block.get("type")
+        if not block.get("has_children") or not block.get("id") or block_type in CHILD_NODE_BLOCK_TYPES:
+            continue
+        payload = block.get(block_type)
+        if isinstance(payload, dict):
+            payload["children"] = fetch_page_blocks(nh, _compact_id(block["id"]))
+    return blocks
+
+
+def collect_child_targets(blocks: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Find the child pages and databases of one page in its block tree.
+
+    Nested container blocks are searched; child pages and databases are
+    recorded but not descended into, so their own children are not listed
+    as children of this page.
+
+    Returns:
+        List of (kind, id) tuples where kind is "page" or "database"
+    """
+    targets: List[Tuple[str, str]] = []
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        if not isinstance(block, dict):
+            continue
+        block_type = block.get("type")
+        if block_type in CHILD_NODE_BLOCK_TYPES:
+            if block.get("id"):
+                targets.append((CHILD_NODE_BLOCK_TYPES[block_type], _compact_id(block["id"])))
+            continue
+        payload = block.get(block_type, {}) if isinstance(block_type, str) else {}
+        if isinstance(payload, dict) and isinstance(payload.get("children"), list):
+            stack.extend(reversed(payload["children"]))
+    return targets
+
+
+def _export_page(
+    nh: NotionHelper,
+    page_id: str,
+    output_dir: Path,
+    cache: Optional[PageCache],
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Write one page to `{page_id}.md` and return its manifest record and children."""
+    page = nh._make_request("GET", f"{NOTION_API_BASE}/pages/{format_page_id(page_id)}")
+    last_edited_time = page.get("last_edited_time", "")
+    entry = cache.get_entry(page_id, last_edited_time) if cache is not None else None
+
+    if entry is not None and "children" in entry:
+        markdown = entry["markdown"]
+        children = [tuple(child) for child in entry["children"]]
+    else:
+        # One block-tree fetch yields both the markdown and the child links.
+        blocks = fetch_page_blocks(nh, page_id)
+        markdown = nh._converter_adapter.blocks_to_markdown(blocks)
+        children = collect_child_targets(blocks)
+        if cache is not None:
+            cache.put(page_id, last_edited_time, markdown, children=children)
+
+    path = output_dir / f"{page_id}.md"
+    path.write_text(markdown, encoding="utf-8")
+    record = {
+        "title": _page_title(page),
+        "last_edited_time": last_edited_time,
+        "cached": entry is not None,
+        "path": path.name,
+    }
+    return record, children
+
+
+def _export_database(nh: NotionHelper, database_id: str) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Resolve a database to its data sources."""
+    database = nh.get_database(format_page_id(database_id))
+    title = "".join(item.get("plain_text", "") for item in database.get("title", []))
+    children = [
+        ("data_source", _compact_id(data_source["id"]))
+        for data_source in database.get("data_sources", [])
+        if data_source.get("id")
+    ]
+    return {"title": title}, children
+
+
+def _export_data_source(
+    nh: NotionHelper,
+    data_source_id: str,
+    output_dir: Path,
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Stream a data source's rows to `{data_source_id}.jsonl` and return the row pages."""
+    path = output_dir / f"{data_source_id}.jsonl"
+    children: List[Tuple[str, str]] = []
+    with open(path, "w", encoding="utf-8") as rows_file:
+        for page in nh.iter_data_source_pages(format_page_id(data_source_id)):
+            record = nh._page_properties_to_record(page, include_page_ids=True)
+            rows_file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            if page.get("id"):
+                children.append(("page", _compact_id(page["id"])))
+    return {"rows": len(children), "path": path.name}, children
+
+
+def export_node(
+    nh: NotionHelper,
+    kind: str,
+    node_id: str,
+    output_dir: Path,
+    cache: Optional[PageCache] = None,
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """
+    Export one page, database or data source and return (record, children).
+
+    Output is written straight to disk so nothing but IDs is kept in memory.
+    """
+    if kind == "page":
+        return _export_page(nh, node_id, output_dir, cache)
+    if kind == "database":
+        return _export_database(nh, node_id)
+    if kind == "data_source":
+        return _export_data_source(nh, node_id, output_dir)
+    raise ValueError(f"Unknown export node kind: {kind}")
+
+
+def _load_export_state(state_path: Path) -> Optional[Dict[str, Any]]:
+    if not state_path.exists():
+        return None
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _drop_manifest_rows(manifest_path: Path, node_ids: set) -> int:
+    """Remove manifest rows for `node_ids`, which are about to be exported again; returns the count removed."""
+    if not node_ids or not manifest_path.exists():
+        return 0
+    kept, dropped = [], 0
+    with open(manifest_path, encoding="utf-8") as manifest:
+        for line in manifest:
+            try:
+                node_id = json.loads(line).get("id")
+            except ValueError:
+                # A row cut short by the interruption.
+                dropped += 1
+                continue
+            if node_id in node_ids:
+                dropped += 1
+            else:
+                kept.append(line if line.endswith("\n") else line + "\n")
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text("".join(kept), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+    return dropped
+
+
+def _save_export_state(state_path: Path, visited: set, frontier: List[List[Any]]) -> None:
+    tmp_path = state_path.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps({"visited": sorted(visited), "frontier": frontier}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, state_path)
+
+
+def export_recursive(
+    raw_inputs: List[str],
+    output_dir: Path,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = NOTION_REQUESTS_PER_SECOND,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+    max_depth: Optional[int] = None,
+) -> None:
+    """
+    Export pages and everything beneath them, breadth-first.
+
+    Each level of the tree is fetched concurrently. Child pages, child
+    databases and data-source rows are queued once (visited IDs are
+    deduplicated). Progress is checkpointed to `.export-state.json` in
+    `output_dir`; re-running the same command after an interruption resumes
+    from the saved frontier. A `manifest.jsonl` records every exported node.
+    Nodes that finished after the last checkpoint are exported again on
+    resume, so their earlier manifest rows are dropped first.
+
+    Args:
+        raw_inputs: Root page IDs or URLs
+        output_dir: Export directory
+        workers: Number of concurrent fetch threads
+        rate: Maximum Notion API requests per second across all workers
+        cache_dir: Page cache directory, or None to always re-fetch
+        max_depth: Stop descending below this depth (roots are depth 0)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_path = output_dir / EXPORT_STATE_FILE
+    manifest_path = output_dir / EXPORT_MANIFEST_FILE
+
+    state = _load_export_state(state_path)
+    if state is not None:
+        visited = set(state.get("visited", []))
+        frontier = [tuple(item) for item in state.get("frontier", [])]
+        console.print(f"[cyan]Resuming export: {len(frontier)} queued, {len(visited)} already seen[/cyan]")
+        _drop_manifest_rows(manifest_path, {item[1] for item in frontier})
+        manifest_mode = "a"
+    else:
+        visited = set()
+        frontier = []
+        for page_id in unique_page_ids(raw_inputs):
+            visited.add(page_id)
+            frontier.append(("page", page_id, 0, None))
+        manifest_mode = "w"
+
+    if not frontier:
+        console.print("[yellow]Nothing to export.[/yellow]")
+        return
+
+    nh = rate_limit_notion_helper(NotionHelper(NOTION_TOKEN), RateLimiter(rate))
+    cache = PageCache(cache_dir) if cache_dir is not None else None
+
+    exported = failed = 0
+    next_frontier: List[Tuple[Any, ...]] = []
+    pending: Dict[Any, Tuple[Any, ...]] = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        with open(manifest_path, manifest_mode, encoding="utf-8") as manifest, Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+            transient=True,
+        ) as progress:
+            task = progress.add_task(description="Exporting...", total=None)
+            while frontier:
+                next_frontier = []
+                pending = {
+                    executor.submit(export_node, nh, kind, node_id, output_dir, cache): (kind, node_id, depth, parent)
+                    for kind, node_id, depth, parent in frontier
+                }
+                for future in as_completed(list(pending)):
+                    kind, node_id, depth, parent = pending.pop(future)
+                    record: Dict[str, Any] = {"id": node_id, "kind": kind, "depth": depth, "parent": parent}
+                    try:
+                        details, children = future.result()
+                        record.update(details)
+                        exported += 1
+                    except Exception as e:
+                        record["error"] = str(e)
+                        children = []
+                        failed += 1
+
+                    # Databases and data sources are containers, not a level of the page tree.
+                    child_depth = depth if kind in ("database", "data_source") else depth + 1
+                    if max_depth is None or child_depth <= max_depth:
+                        for child_kind, child_id in children:
+                            if child_id not in visited:
+                                visited.add(child_id)
+                                next_frontier.append((child_kind, child_id, child_depth, node_id))
+
+                    manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    progress.update(
+                        task,
+                        description=f"Exporting... {exported} done, {len(pending) + len(next_frontier)} queued",
+                    )
+                    if (exported + failed) % EXPORT_CHECKPOINT_EVERY == 0:
+                        manifest.flush()
+                        _save_export_state(
+                            state_path,
+                            visited,
+                            [list(item) for item in pending.values()] + [list(item) for item in next_frontier],
+                        )
+                frontier = next_frontier
+                manifest.flush()
+                _save_export_state(state_path, visited, [list(item) for item in frontier])
+    except KeyboardInterrupt:
+        # Drop queued fetches; their IDs are saved in the frontier below.
+        executor.shutdown(wait=False, cancel_futures=True)
+        _save_export_state(
+            state_path,
+            visited,
+            [list(item) for item in pending.values()] + [list(item) for item in next_frontier],
+        )
+        console.print(f"[yellow]Interrupted. Re-run the same command to resume from {state_path}[/yellow]")
+        raise SystemExit(130)
+    finally:
+        executor.shutdown(wait=True)
+
+    state_path.unlink(missing_ok=True)
+    console.print(
+        Panel(
+            f"[bold green]✓[/bold green] Exported {exported} nodes to {output_dir}"
+            + (f", [red]{failed} failed[/red] (see {EXPORT_MANIFEST_FILE})" if failed else ""),
+            border_style="red" if failed else "green",
+            title="Recursive Export",
+        )
+    )
+    if failed:
+        raise SystemExit(1)
+
+
 def main() -> None:
     """Main CLI function with Rich formatting."""
     parser = argparse.ArgumentParser(
@@ -179,6 +867,15 @@ Examples:
   # Show raw markdown
   python razor_read_notion_pages.py --page_id <id> --raw
   
+  # Bulk read into a directory of markdown files
+  python razor_read_notion_pages.py --page_id <id1> <id2> <id3> --output-dir pages/
+  
+  # Bulk read from a file of IDs/URLs as a JSONL stream
+  python razor_read_notion_pages.py --from-file page_ids.txt --jsonl - > pages.jsonl
+  
+  # Recursive export of a page tree (re-run to resume after interruption)
+  python razor_read_notion_pages.py --page_id <id> --recursive --output-dir backup/
+  
   # Interactive mode
   python razor_read_notion_pages.py
         """
@@ -187,8 +884,15 @@ Examples:
     parser.add_argument(
         '--page_id',
         type=str,
+        nargs='+',
         required=False,
-        help='The Notion page ID or the full Notion URL'
+        help='One or more Notion page IDs or full Notion URLs'
+    )
+    
+    parser.add_argument(
+        '--from-file',
+        type=Path,
+        help='Read page IDs/URLs from a file (one per line, # for comments)'
     )
     
     parser.add_argument(
@@ -203,10 +907,108 @@ Examples:
         help='Show raw markdown without rendering'
     )
     
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        help='Bulk mode: write each page to <output-dir>/<page_id>.md'
+    )
+    
+    parser.add_argument(
+        '--jsonl',
+        type=str,
+        help='Bulk mode: write one JSON object per page to this file ("-" for stdout)'
+    )
+    
+    parser.add_argument(
+        '--recursive',
+        action='store_true',
+        help='Export the page(s) and all child pages, databases and rows to --output-dir'
+    )
+    
+    parser.add_argument(
+        '--max-depth',
+        type=int,
+        default=None,
+        help='Recursive mode: maximum child page depth (default: unlimited)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Bulk mode: concurrent fetch threads (default: {DEFAULT_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=NOTION_REQUESTS_PER_SECOND,
+        help=f'Bulk mode: max Notion API requests per second (default: {NOTION_REQUESTS_PER_SECOND:g})'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f'Bulk mode: page cache directory (default: {DEFAULT_CACHE_DIR})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bulk mode: always re-fetch pages instead of using the cache (the cache cannot see edits made within the minute it was filled)'
+    )
+    
+    parser.add_argument(
+        '--max-lines',
+        type=int,
+        default=None,
+        help='Stop displaying page content after this many lines'
+    )
+    
+    parser.add_argument(
+        '--pager',
+        action='store_true',
+        help='Page the content through the system pager ($PAGER)'
+    )
+    
     args = parser.parse_args()
     
+    page_inputs = list(args.page_id or [])
+    if args.from_file:
+        page_inputs.extend(read_page_ids_file(args.from_file))
+    
+    if args.recursive:
+        if args.output_dir is None:
+            parser.error('--recursive requires --output-dir')
+        if not page_inputs and not (args.output_dir / EXPORT_STATE_FILE).exists():
+            parser.error('--recursive requires --page_id or --from-file')
+        export_recursive(
+            page_inputs,
+            args.output_dir,
+            workers=args.workers,
+            rate=args.rate,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            max_depth=args.max_depth,
+        )
+        return
+    
+    bulk_mode = len(page_inputs) > 1 or args.output_dir is not None or args.jsonl is not None
+    if bulk_mode:
+        if args.output_dir is None and args.jsonl is None:
+            parser.error('bulk mode requires --output-dir and/or --jsonl')
+        read_pages(
+            page_inputs,
+            output_dir=args.output_dir,
+            jsonl_path=args.jsonl,
+            workers=args.workers,
+            rate=args.rate,
+            cache_dir=None if args.no_cache else args.cache_dir,
+        )
+        return
+    
     # Get page ID (interactive if not provided)
-    page_input = args.page_id
+    page_input = page_inputs[0] if page_inputs else None
     if not page_input:
         console.print(
             Panel.fit(
@@ -221,7 +1023,9 @@ Examples:
     read_page(
         page_input,
         render_markdown=not args.no_render,
-        show_raw=args.raw
+        show_raw=args.raw,
+        max_lines=args.max_lines,
+        use_pager=args.pager
     )
 
 
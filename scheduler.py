@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Run the recurring workflows on a cron-like schedule without the Streamlit UI.
+
+`python scheduler.py run` starts one long-lived process that fires the
+weather forecast, GitHub trending and agenda email workflows at the times in
+the schedule. The workflows are imported once, so the shared NotionHelper
+session, rate limiter and in-process caches stay warm between runs. Each
+schedule can add a random delay (jitter) to spread runs out. A schedule
+whose previous run is still going is skipped rather than started twice.
+Every run is recorded as a "scheduler.run" tracing span, so its duration
+shows on the Performance page. A summary of each schedule is written to
+STATE_PATH after every run.
+
+Schedules come from DEFAULT_SCHEDULES, or from a TOML file given with
+--schedule, with one [[schedule]] table per entry:
+
+    [[schedule]]
+    name = "partners-agenda"
+    workflow = "partners_agenda"      # a key of WORKFLOWS
+    cron = "0 7 * * mon"             # minute hour day-of-month month day-of-week
+    jitter = 120                      # seconds, optional
+    params = { recipients = ["jan.duplessis@nhs.net"], days_ahead = 1 }
+
+Run the scheduler from the app directory so the workflows can read
+.streamlit/secrets.toml. Use `once NAME --test-recipient ADDRESS` to try an
+agenda email. It replaces the TEST_RUN flag in razor_get_partners_agenda.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from tracing import span
+
+STATE_PATH = Path(os.environ.get("SCHEDULER_STATE_PATH", ".scheduler-state.json"))
+MAX_CONCURRENT_RUNS = 4
+# Longest sleep between checks, so the schedule state stays fresh and stop signals are noticed.
+MAX_SLEEP_SECONDS = 30.0
+# Pause between agenda emails, as on the agenda pages.
+EMAIL_INTERVAL_SECONDS = 1.0
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    # 0 and 7 are both Sunday.
+    ("day of week", 0, 7),
+)
+MONTH_NAMES = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+DAY_NAMES = {name: number for number, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+logger = logging.getLogger("scheduler")
+
+
+def _parse_value(value: str, names: dict[str, int]) -> int:
+    return names[value.lower()] if value.lower() in names else int(value)
+
+
+def parse_cron_field(text: str, low: int, high: int, names: dict[str, int] | None = None) -> frozenset[int]:
+    """
+    Values matched by one cron field: `*`, `5`, `1-5`, `*/15`, `1-31/2`, names and comma lists.
+
+    Args:
+        text: The field, e.g. "mon-fri" or "0,30"
+        low: Smallest allowed value
+        high: Largest allowed value
+        names: Lower-case names accepted in place of numbers
+
+    Returns:
+        frozenset[int]: Matching values
+    """
+    names = names or {}
+    values = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, last = base.split("-", 1)
+            start, end = _parse_value(first, names), _parse_value(last, names)
+        else:
+            start = _parse_value(base, names)
+            end = high if step_text else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Cron field {text!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class CronExpression:
+    """A five-field cron expression, evaluated in local time."""
+
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    # Cron matches either day field when both are restricted.
+    any_day: bool
+    any_weekday: bool
+    text: str = ""
+
+    @classmethod
+    def parse(cls, text: str) -> "CronExpression":
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression {text!r} needs 5 fields: minute hour day-of-month month day-of-week")
+        minutes, hours, days, months, weekdays = [
+            parse_cron_field(part, low, high, MONTH_NAMES if index == 3 else DAY_NAMES if index == 4 else None)
+            for index, (part, (_, low, high)) in enumerate(zip(parts, CRON_FIELDS))
+        ]
+        weekdays = frozenset(weekday % 7 for weekday in weekdays)
+        return cls(minutes, hours, days, months, weekdays, any_day=parts[2] == "*", any_weekday=parts[4] == "*", text=text)
+
+    def matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        day_match = day.day in self.days
+        weekday_match = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        The first matching minute strictly after `moment`, as an aware local time.
+
+        Wall-clock fields are matched in naive local time, so a daily 06:15 run
+        stays at 06:15 across daylight-saving changes.
+        """
+        if moment.tzinfo is not None:
+            moment = moment.astimezone().replace(tzinfo=None)
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if not self.matches_day(candidate.date()):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate.astimezone()
+        raise ValueError(f"Cron expression {self.text!r} never matches")
+
+
+@dataclass
+class Schedule:
+    name: str
+    workflow: str
+    cron: str
+    params: dict = field(default_factory=dict)
+    # Up to this many seconds are added at random to each run time.
+    jitter: float = 0.0
+    enabled: bool = True
+
+    def __post_init__(self):
+        if self.workflow not in WORKFLOWS:
+            raise ValueError(f"Schedule {self.name!r}: unknown workflow {self.workflow!r}; expected one of {', '.join(WORKFLOWS)}")
+        self.expression = CronExpression.parse(self.cron)
+
+
+@dataclass
+class ScheduleState:
+    """Run counts and durations for one schedule, written to STATE_PATH."""
+
+    runs: int = 0
+    failures: int = 0
+    # Runs not started because the previous one was still going.
+    skipped: int = 0
+    running_since: str | None = None
+    last_started: str | None = None
+    last_duration_s: float | None = None
+    mean_duration_s: float | None = None
+    max_duration_s: float | None = None
+    last_error: str = ""
+    last_result: str = ""
+    next_run: str | None = None
+
+    def record(self, duration_s: float, error: str, result: str) -> None:
+        self.runs += 1
+        self.failures += bool(error)
+        self.last_duration_s = round(duration_s, 3)
+        previous_total = (self.mean_duration_s or 0.0) * (self.runs - 1)
+        self.mean_duration_s = round((previous_total + duration_s) / self.runs, 3)
+        self.max_duration_s = round(max(self.max_duration_s or 0.0, duration_s), 3)
+        self.last_error = error
+        self.last_result = result
+
+
+# Workflows. Each takes the schedule's params and returns a one-line outcome;
+# they are imported on first use and then stay loaded for the process.
+
+def run_weather_forecast(params: dict) -> str:
+    import streamlit as st
+
+    from weather_forecast import DEFAULT_SITES, DEFAULT_WEATHER_DATABASE_ID, run_forecasts
+
+    all_sites = {name: tuple(coords) for name, coords in st.secrets.get("WEATHER_SITES", DEFAULT_SITES).items()}
+    selected = params.get("sites") or list(all_sites)[:1]
+    forecasts = run_forecasts(
+        st.secrets["NOTION_TOKEN"],
+        params.get("database_id") or st.secrets.get("NOTION_WEATHER_DATABASE_ID", DEFAULT_WEATHER_DATABASE_ID),
+        {site: all_sites[site] for site in selected},
+        use_cache=params.get("use_cache", True),
+        update_today=params.get("update_today", True),
+    )
+    return ", ".join(f"{forecast['site']}: page {forecast['page_id']}" for forecast in forecasts)
+
+
+def run_github_trending(params: dict) -> str:
+    from main import run_github_trending_workflow
+
+    created, updated = run_github_trending_workflow(params.get("languages"), params.get("periods"))
+    return f"added {created}, updated {updated} repositories"
+
+
+def _send_agenda(database_id: str, meeting_type: str, params: dict) -> str:
+    from main import get_agenda, send_email
+
+    recipients = params.get("recipients") or []
+    if not recipients:
+        raise ValueError("No recipients; set params.recipients for this schedule")
+    meeting_date = date.today() + timedelta(days=params.get("days_ahead", 0))
+    subject, body = get_agenda(database_id, subject=f"{meeting_type} Agenda - {meeting_date:%d %b %Y}")
+    for index, recipient in enumerate(recipients):
+        if index:
+            time.sleep(EMAIL_INTERVAL_SECONDS)
+        send_email(recipient, subject, body)
+    return f"sent {subject!r} to {', '.join(recipients)}"
+
+
+def run_partners_agenda(params: dict) -> str:
+    from main import partners_db_id
+
+    return _send_agenda(partners_db_id, params.get("meeting_type", "Partners' Meeting"), params)
+
+
+def run_team_agenda(params: dict) -> str:
+    from main import team_db_id
+
+    return _send_agenda(team_db_id, params.get("meeting_type", "SMW Team Meeting"), params)
+
+
+WORKFLOWS: dict[str, Callable[[dict], str]] = {
+    "weather_forecast": run_weather_forecast,
+    "github_trending": run_github_trending,
+    "partners_agenda": run_partners_agenda,
+    "team_agenda": run_team_agenda,
+}
+
+# Used when no --schedule file is given. Agenda emails need recipients, so
+# they are only sent from a schedule file.
+DEFAULT_SCHEDULES = [
+    Schedule("weather-forecast", "weather_forecast", "15 6 * * *", jitter=120),
+    Schedule("github-trending", "github_trending", "0 7 * * *", jitter=300),
+]
+
+
+def load_schedules(path: Path) -> list[Schedule]:
+    """Schedules from the [[schedule]] tables of a TOML file."""
+    with open(path, "rb") as handle:
+        entries = tomllib.load(handle).get("schedule", [])
+    schedules = [Schedule(**entry) for entry in entries]
+    names = [schedule.name for schedule in schedules]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate schedule names in {path}: {', '.join(duplicates)}")
+    return schedules
+
+
+def warm_up(schedules: list[Schedule]) -> None:
+    """Import the scheduled workflows' modules once, so the first run does not pay for it."""
+    import importlib
+
+    from streamlit import config
+    from streamlit.logger import set_log_level
+
+    # The workflows call st.* outside `streamlit run`; silence the bare-mode warnings.
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+    modules = {
+        "weather_forecast": ["weather_forecast"],
+        "github_trending": ["main", "github_trending"],
+        "partners_agenda": ["main"],
+        "team_agenda": ["main"],
+    }
+    for module in sorted({module for schedule in schedules for module in modules[schedule.workflow]}):
+        started = time.perf_counter()
+        importlib.import_module(module)
+        logger.info("Loaded %s in %.2fs", module, time.perf_counter() - started)
+
+
+class Scheduler:
+    """
+    Fires schedules at their next cron time plus jitter, at most one run per schedule at a time.
+
+    Args:
+        schedules: Enabled schedules to run
+        test_recipient: Send every agenda email to this address instead
+        dry_run: Log when schedules would fire without running them
+        state_path: Where the per-schedule summary is written; None to skip
+    """
+
+    def __init__(self, schedules: list[Schedule], test_recipient: str | None = None, dry_run: bool = False,
+                 state_path: Path | None = STATE_PATH):
+        self.schedules = {schedule.name: schedule for schedule in schedules if schedule.enabled}
+        self.test_recipient = test_recipient
+        self.dry_run = dry_run
+        self.state_path = state_path
+        self.state = {name: ScheduleState() for name in self.schedules}
+        self.due: dict[str, datetime] = {}
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._running: set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RUNS, thread_name_prefix="schedule")
+
+    def _plan(self, name: str, after: datetime) -> None:
+        schedule = self.schedules[name]
+        due = schedule.expression.next_after(after) + timedelta(seconds=random.uniform(0, schedule.jitter))
+        self.due[name] = due
+        self.state[name].next_run = due.isoformat(timespec="seconds")
+
+    def params_for(self, schedule: Schedule) -> dict:
+        params = dict(schedule.params)
+        if self.test_recipient and schedule.workflow.endswith("_agenda"):
+            params["recipients"] = [self.test_recipient]
+        return params
+
+    def run_now(self, name: str) -> None:
+        """Run one schedule in this thread and record its outcome."""
+        schedule = self.schedules[name]
+        state = self.state[name]
+        started = time.perf_counter()
+        state.last_started = datetime.now().astimezone().isoformat(timespec="seconds")
+        error, result = "", ""
+        logger.info("%s: starting %s", name, schedule.workflow)
+        try:
+            with span("scheduler.run", schedule=name, workflow=schedule.workflow):
+                result = WORKFLOWS[schedule.workflow](self.params_for(schedule)) or ""
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            logger.exception("%s: failed", name)
+        duration = time.perf_counter() - started
+        with self._lock:
+            state.record(duration, error, result)
+            state.running_since = None
+            self._running.discard(name)
+        if not error:
+            logger.info("%s: finished in %.1fs: %s", name, duration, result)
+        self.write_state()
+
+    def _fire(self, name: str, now: datetime) -> None:
+        self._plan(name, now)
+        if self.dry_run:
+            logger.info("%s: would run %s now (dry run)", name, self.schedules[name].workflow)
+            return
+        with self._lock:
+            if name in self._running:
+                self.state[name].skipped += 1
+                logger.warning("%s: previous run (since %s) still going; skipped", name, self.state[name].running_since)
+                return
+            self._running.add(name)
+            self.state[name].running_since = now.isoformat(timespec="seconds")
+        self._executor.submit(self.run_now, name)
+
+    def write_state(self) -> None:
+        if self.state_path is None:
+            return
+        with self._lock:
+            snapshot = {name: asdict(state) for name, state in self.state.items()}
+        payload = {"updated_at": datetime.now().astimezone().isoformat(timespec="seconds"), "pid": os.getpid(),
+                   "schedules": snapshot}
+        temporary = self.state_path.with_name(self.state_path.name + ".tmp")
+        temporary.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(temporary, self.state_path)
+
+    def run_forever(self) -> None:
+        """Fire schedules until `stop_event` is set, then wait for running workflows to finish."""
+        now = datetime.now().astimezone()
+        for name in self.schedules:
+            self._plan(name, now)
+            logger.info("%s: %s (%s), next run %s", name, self.schedules[name].workflow,
+                        self.schedules[name].cron, self.state[name].next_run)
+        self.write_state()
+        try:
+            while not self.stop_event.is_set():
+                now = datetime.now().astimezone()
+                for name, due in list(self.due.items()):
+                    if due <= now:
+                        self._fire(name, now)
+                next_due = min(self.due.values(), default=now + timedelta(seconds=MAX_SLEEP_SECONDS))
+                self.stop_event.wait(min(MAX_SLEEP_SECONDS, max(0.0, (next_due - datetime.now().astimezone()).total_seconds())))
+        finally:
+            if self._running:
+                logger.info("Stopping: waiting for %s", ", ".join(sorted(self._running)))
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self.write_state()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedule", type=Path, help="TOML file of [[schedule]] tables (default: the built-in schedules)")
+    parser.add_argument("--only", action="append", metavar="NAME", help="Only this schedule; repeat for more")
+    parser.add_argument("--test-recipient", metavar="EMAIL", help="Send every agenda email to this address instead")
+    parser.add_argument("--verbose", action="store_true", help="Also log the workflows' own messages")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run schedules until interrupted")
+    run.add_argument("--dry-run", action="store_true", help="Log when schedules fire without running them")
+    next_runs = commands.add_parser("next", help="Show the next run times")
+    next_runs.add_argument("--count", type=int, default=3, help="Run times per schedule (default: 3)")
+    once = commands.add_parser("once", help="Run one schedule now and exit")
+    once.add_argument("name")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logger.setLevel(logging.INFO)
+    schedules = load_schedules(args.schedule) if args.schedule else DEFAULT_SCHEDULES
+    if args.only:
+        unknown = sorted(set(args.only) - {schedule.name for schedule in schedules})
+        if unknown:
+            sys.exit(f"Unknown schedule(s): {', '.join(unknown)}")
+        schedules = [schedule for schedule in schedules if schedule.name in args.only]
+
+    if args.command == "next":
+        now = datetime.now().astimezone()
+        for schedule in schedules:
+            moment, times = now, []
+            for _ in range(args.count):
+                moment = schedule.expression.next_after(moment)
+                times.append(f"{moment:%a %d %b %H:%M}")
+            status = "" if schedule.enabled else " (disabled)"
+            print(f"{schedule.name:<20} {schedule.cron:<16} +{schedule.jitter:g}s  {' | '.join(times)}{status}")
+        return
+
+    if args.command == "once":
+        if args.name not in {schedule.name for schedule in schedules}:
+            sys.exit(f"Unknown schedule {args.name!r}")
+        selected = [schedule for schedule in schedules if schedule.name == args.name]
+        for schedule in selected:
+            schedule.enabled = True
+        warm_up(selected)
+        scheduler = Scheduler(selected, args.test_recipient, state_path=None)
+        scheduler.run_now(args.name)
+        state = scheduler.state[args.name]
+        sys.exit(1 if state.last_error else 0)
+
+    scheduler = Scheduler(schedules, args.test_recipient, args.dry_run)
+    if not scheduler.schedules:
+        sys.exit("No enabled schedules")
+    if not args.dry_run:
+        warm_up(list(scheduler.schedules.values()))
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop_event.set())
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop_event.set()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark candidate splitting and PDF text extraction on synthetic exports.
+
+Generates corpora with `candidate_corpus` for each layout and size, then
+reports split throughput (MB/s of text), peak Python memory and whether
+`split_candidate_records` recovered exactly the generated names and
+references, in order. With --pdf-candidates the corpus is also rendered to
+a PDF and run through `extract_pdf_text` before splitting. Save results
+with --json and pass them back with --baseline to fail on a slowdown or a
+correctness regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from candidate_corpus import LAYOUTS, UNICODE_LEVELS, Corpus, corpus_to_pdf, generate_corpus
+from split_candidates import split_candidate_records
+
+REPO_ROOT = Path(__file__).resolve().parent
+DEFAULT_TOLERANCE = 0.25
+
+
+def check_split(records: list, corpus: Corpus) -> dict:
+    """Compare split records with the corpus ground truth."""
+    expected = corpus.truth()
+    found = [(record.name, record.reference) for record in records]
+    expected_names = {reference: name for name, reference in expected}
+    found_names = {reference: name for name, reference in found}
+    return {
+        "expected": len(expected),
+        "found": len(found),
+        "exact": found == expected,
+        "missing": sorted(set(expected_names) - set(found_names)),
+        "unexpected": sorted(set(found_names) - set(expected_names)),
+        "wrong_names": sorted(
+            reference for reference, name in found_names.items()
+            if reference in expected_names and expected_names[reference] != name
+        ),
+    }
+
+
+def time_runs(func: Callable[[], object], repeat: int) -> tuple[list[float], object]:
+    walls, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        walls.append(time.perf_counter() - start)
+    return walls, result
+
+
+def peak_memory_mb(func: Callable[[], object]) -> float:
+    """Peak Python heap allocated while `func` runs, in MB. Native (MuPDF) allocations are not counted."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return (tracemalloc.get_traced_memory()[1] - baseline) / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def bench_split(corpus: Corpus, repeat: int) -> dict:
+    walls, records = time_runs(lambda: split_candidate_records(corpus.text), repeat)
+    wall = statistics.median(walls)
+    size_mb = corpus.size_bytes / 1e6
+    return {
+        "pages": len(corpus.pages),
+        "size_mb": round(size_mb, 3),
+        "wall_s": round(wall, 4),
+        "min_wall_s": round(min(walls), 4),
+        "mb_per_s": round(size_mb / wall, 2) if wall else None,
+        "peak_mb": round(peak_memory_mb(lambda: split_candidate_records(corpus.text)), 2),
+        "check": check_split(records, corpus),
+    }
+
+
+def bench_extract(corpus: Corpus, repeat: int, workdir: Path) -> dict:
+    """Render the corpus to PDF, then time extract_pdf_text plus splitting its output."""
+    from notion_interviews import extract_pdf_text
+
+    pdf_path = workdir / f"corpus-{corpus.layout}-{len(corpus.candidates)}.pdf"
+    pdf_path.write_bytes(corpus_to_pdf(corpus))
+    walls, text = time_runs(lambda: extract_pdf_text(pdf_path), repeat)
+    wall = statistics.median(walls)
+    size_mb = pdf_path.stat().st_size / 1e6
+    return {
+        "pages": len(corpus.pages),
+        "size_mb": round(size_mb, 3),
+        "wall_s": round(wall, 4),
+        "min_wall_s": round(min(walls), 4),
+        "mb_per_s": round(size_mb / wall, 2) if wall else None,
+        "pages_per_s": round(len(corpus.pages) / wall, 1) if wall else None,
+        "peak_mb": round(peak_memory_mb(lambda: extract_pdf_text(pdf_path)), 2),
+        "text_matches": text == corpus.text,
+        "check": check_split(split_candidate_records(text), corpus),
+    }
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Cases that lost correctness or whose throughput fell by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        if previous["check"]["exact"] and not result["check"]["exact"]:
+            regressions.append(f"{name}: split no longer matches the ground truth")
+        if previous.get("mb_per_s") and result.get("mb_per_s"):
+            change = result["mb_per_s"] / previous["mb_per_s"] - 1
+            if change < -tolerance:
+                regressions.append(f"{name}: {previous['mb_per_s']:.2f} -> {result['mb_per_s']:.2f} MB/s ({change:+.0%})")
+    return regressions
+
+
+def _describe(check: dict) -> str:
+    if check["exact"]:
+        return "exact"
+    parts = [f"{check['found']}/{check['expected']} found"]
+    for key in ("missing", "unexpected", "wrong_names"):
+        if check[key]:
+            parts.append(f"{len(check[key])} {key.replace('_', ' ')}")
+    return ", ".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", nargs="+", type=int, default=[13, 200, 1000], help="Corpus sizes for the split benchmark (default: 13 200 1000)")
+    parser.add_argument("--pages-per-candidate", type=int, default=6, help="Pages per candidate (default: 6)")
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--unicode", default="latin", choices=UNICODE_LEVELS, dest="unicode_level", help="Character set of names and free text (default: latin)")
+    parser.add_argument("--pdf-candidates", type=int, default=40, help="Candidates in the PDF extraction corpus; 0 to skip (default: 40)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; the median is reported (default: 5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against; exits 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed throughput drop vs the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    sys.path.insert(0, str(REPO_ROOT))
+    # Keep benchmark runs out of the app's trace file.
+    os.environ.setdefault("TRACING", "0")
+
+    results = {}
+    print(f"{'case':<28} {'pages':>6} {'MB':>7} {'median':>9} {'MB/s':>8} {'peak MB':>8}  result")
+    print("-" * 84)
+
+    def report(name: str, result: dict) -> None:
+        results[name] = result
+        print(f"{name:<28} {result['pages']:>6} {result['size_mb']:>7.2f} {result['wall_s'] * 1000:>7.1f}ms "
+              f"{result['mb_per_s'] or 0:>8.2f} {result['peak_mb']:>8.2f}  {_describe(result['check'])}")
+
+    for layout in args.layouts:
+        for count in args.candidates:
+            corpus = generate_corpus(count, args.pages_per_candidate, layout, args.unicode_level, seed=args.seed)
+            report(f"split/{layout}/{count}", bench_split(corpus, args.repeat))
+
+    if args.pdf_candidates > 0:
+        with tempfile.TemporaryDirectory(prefix="split-benchmark-") as workdir:
+            for layout in args.layouts:
+                corpus = generate_corpus(args.pdf_candidates, args.pages_per_candidate, layout, args.unicode_level, seed=args.seed)
+                report(f"extract/{layout}/{args.pdf_candidates}", bench_extract(corpus, args.repeat, Path(workdir)))
+
+    if args.json:
+        settings = {key: value for key, value in vars(args).items() if key not in ("json", "baseline")}
+        args.json.write_text(json.dumps({"settings": settings, "results": results}, indent=2, default=str), encoding="utf-8")
+    failures = [name for name, result in results.items() if not result["check"]["exact"]]
+    if failures:
+        print(f"\nSplit did not match the ground truth for: {', '.join(failures)}")
+    if baseline:
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
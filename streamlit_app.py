@@ -1,20 +1,22 @@
-import pandas as pd
-from notionhelper import NotionHelper
-from notion_blockify import Blockizer
 import streamlit as st
-from groq import Groq
+from contextlib import suppress
 from datetime import date, datetime, timedelta
-import html
 
-from main import get_partners_agenda, send_email, run_partners_agenda, run_team_agenda, run_github_trending_workflow, show_tasks
-from notion_interviews import render_notion_interview_database
-from pdf_to_png import render_pdf_to_png
-from razor_db_create_new_page import render_notion_page_creator
-from weather_forecast import DEFAULT_WEATHER_DATABASE_ID, run_forecast
+from llm_client import GROQ_BASE_URL, LLMError, get_llm_client
+from notion_cache import get_llm_response_cache, get_notion_helper, invalidate_data_source
+from profiling import PYINSTRUMENT_AVAILABLE, profile_page
 
-# Initialize Groq client
-client = Groq(api_key=st.secrets["GROQ_API_KEY"])
-nh = NotionHelper(st.secrets["NOTION_TOKEN"])
+# Page modules (main, notion_interviews, pdf_to_png, razor_db_create_new_page,
+# weather_forecast) and their heavy dependencies (groq, notion_blockify, fitz,
+# matplotlib, seaborn, gtrending) are imported inside the page that uses them,
+# so a rerun only pays for the selected page. Python caches each module after
+# its first import. Run `python import_time_report.py` to measure the savings.
+
+nh = get_notion_helper(st.secrets["NOTION_TOKEN"])
+TRENDING_LANGUAGE_OPTIONS = ["python", "rust", "typescript", "go", "jupyter-notebook", "c++"]
+GROQ_ERROR_RESPONSE = "Error: Could not get a response from Groq."
+CALENDAR_DATA_SOURCE_ID = '303fdfd6-8a97-80f6-bbcc-000b5fe219ab'
+PERFORMANCE_WINDOWS = {"Last hour": timedelta(hours=1), "Last 24 hours": timedelta(days=1), "Last 7 days": timedelta(days=7), "All": None}
 
 
 
@@ -61,23 +63,17 @@ st.image("images/notion-logo.png")
 st.logo("images/notion.png", size="medium")
 # Simple function to get a response from Groq
 def ask_groq(prompt: str, model: str = "openai/gpt-oss-120b"):
-    chat_completion = client.chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": prompt,
-            }
-        ],
-        model=model,
-    )
+    client = get_llm_client(GROQ_BASE_URL, st.secrets["GROQ_API_KEY"])
     try:
-        return chat_completion.choices[0].message.content
-    except Exception as e:
+        return client.ask(prompt, model)
+    except LLMError as e:
         st.error(f"Error getting response from Groq: {e}")
-        return "Error: Could not get a response from Groq."
+        return GROQ_ERROR_RESPONSE
 
 
 def save_task_summary_to_notion(summary_markdown: str, summary_title: str) -> str:
+    from notion_blockify import Blockizer
+
     now_iso = datetime.now().astimezone().isoformat(timespec="minutes")
     title_datetime = datetime.now().astimezone().strftime("%d %b %Y %H:%M")
     task_title = f"{summary_title} - {title_datetime}"
@@ -112,240 +108,437 @@ def save_task_summary_to_notion(summary_markdown: str, summary_title: str) -> st
     if blocks:
         for i in range(0, len(blocks), 100):
             nh.append_page_body(page_id, blocks=blocks[i:i + 100])
+    invalidate_data_source(st.secrets["TASKS_ID"])
     return page_id
 
+
+class PageEnded(Exception):
+    """
+    Ends the selected page early.
+
+    Used instead of st.stop() inside the page chain: after st.stop() nothing
+    else can be drawn, so the profile view below the page would be lost.
+    """
+
+
+def show_page_profiles(profiles: list, current) -> None:
+    """Top functions and flame graph for this run's profile, with earlier runs selectable."""
+    from profiling import flame_chart, top_functions
+
+    if current is None:
+        st.info("Another session is being profiled, so this run was not recorded.", icon=":material/speed:")
+    if not profiles:
+        return
+    st.divider()
+    with st.expander(f"Profile ({profiles[-1].engine})", icon=":material/speed:", expanded=current is not None):
+        index = st.selectbox("Run", range(len(profiles)), format_func=lambda i: profiles[-1 - i].label, key="profile_run_index")
+        selected = profiles[-1 - index]
+        if selected.error:
+            st.warning(f"Could not analyse the profile: {selected.error}")
+        top_tab, flame_tab = st.tabs(["Top functions", "Flame graph"])
+        with top_tab:
+            st.dataframe(top_functions(selected), hide_index=True, width='stretch')
+        with flame_tab:
+            chart = flame_chart(selected.tree)
+            if chart is None:
+                st.info("No frames were recorded.")
+            else:
+                st.caption("Each bar is a function; its width is the share of the run spent in it and the functions it called.")
+                st.altair_chart(chart, width='stretch')
+        if selected.raw:
+            st.download_button("Download profile", selected.raw, file_name=selected.raw_name, icon=":material/download:")
+
+
+@st.fragment(run_every="3s")
+def show_background_jobs() -> None:
+    """Queued and recent background jobs, refreshed every few seconds without rerunning the page."""
+    from jobs import active_workers, get_job, job_logs, list_jobs, request_cancel
+
+    workers = active_workers()
+    if workers:
+        st.caption(f"{len(workers)} worker(s) running, {sum(worker['processes'] for worker in workers)} job slot(s)")
+    else:
+        st.warning("No job worker is running, so queued jobs will wait. Start one with `python jobs.py worker`.", icon=":material/pause_circle:")
+
+    jobs = list_jobs()
+    if not jobs:
+        st.info("No background jobs yet. Queue one from the Python Script Runner or Notion Interview Database page.")
+        return
+    st.dataframe(jobs, hide_index=True, width='stretch', column_config={"progress": st.column_config.ProgressColumn("progress", min_value=0.0, max_value=1.0)})
+
+    job_id = st.selectbox("Job", [job["id"] for job in jobs], format_func=lambda i: next(f"{i} · {job['kind']} · {job['status']}" for job in jobs if job["id"] == i), key="background_job")
+    job = get_job(job_id)
+    if job is None:
+        return
+    if job["status"] in ("queued", "running"):
+        st.progress(job["progress"], text=job["message"] or job["status"].capitalize())
+        if job["cancel_requested"]:
+            st.info("Cancellation requested; the job stops at its next progress update.", icon=":material/hourglass_top:")
+        elif st.button("Cancel job", icon=":material/cancel:", key=f"cancel_job_{job_id}"):
+            request_cancel(job_id)
+            st.rerun(scope="fragment")
+    elif job["status"] == "succeeded":
+        st.success(f":material/check_circle: Finished {job['finished_at']}")
+    elif job["status"] == "cancelled":
+        st.info(f":material/cancel: Cancelled {job['finished_at']}")
+    else:
+        st.error(f":material/error: {job['error']}")
+    if job["result"] is not None:
+        with st.expander("Result", icon=":material/data_object:"):
+            st.json(job["result"])
+    logs = job_logs(job_id)
+    with st.expander(f"Log ({len(logs)} lines)", icon=":material/article:", expanded=job["status"] in ("running", "failed")):
+        st.code("\n".join(f"{line['ts'][11:19]} {line['message']}" for line in logs[-200:]) or "No log lines yet.", language=None)
+
+
+if "page_profiles" not in st.session_state:
+    st.session_state.page_profiles = []
+
 with st.sidebar:
     st.title(":material/settings: Settings")
-    PAGE_SELECTION = ["Python Script Runner", "Partners' Agenda", "Team Agenda", "Tasks", "Calendar", "Human Resources", "Notion Interview Database", "Write to URL", "PDF to PNG"]
+    PAGE_SELECTION = ["Python Script Runner", "Partners' Agenda", "Team Agenda", "Tasks", "Calendar", "Human Resources", "Notion Interview Database", "Write to URL", "PDF to PNG", "Performance", "Background Jobs"]
     pages = st.selectbox("Page Selectioon", PAGE_SELECTION, index=0)
     st.divider()
     MODEL_OPTIONS = ["moonshotai/kimi-k2-instruct-0905", "meta-llama/llama-4-maverick-17b-128e-instruct", "qwen/qwen3-32b", "openai/gpt-oss-120b", "groq/compound-mini", "groq/compound"]
     model = st.selectbox("Model Selection", MODEL_OPTIONS, index=3)
+    profile_run = st.toggle(
+        "Profile this page",
+        key="profile_run",
+        help=f"Record where the selected page spends its time with {'pyinstrument' if PYINSTRUMENT_AVAILABLE else 'cProfile'}. Off adds no overhead.",
+    )
     st.space(size=40)
     st.markdown("`janduplessis883`", text_alignment="center")
 
 
-if pages == "Partners' Agenda":
-    st.caption("Partners' Agenda")
+with suppress(PageEnded), profile_page(pages, profile_run, st.session_state.page_profiles) as page_profile:
+    if pages == "Partners' Agenda":
+        from main import run_partners_agenda
 
-    meeting_date = st.date_input("Select Meeting Date")
-    email_list = st.multiselect("Select Email Recipients", options=['jan.duplessis@nhs.net', 'asteeden@nhs.net', 'jenny.bedford@nhs.net', 'shuman.hussein@nhs.net'], default=['jan.duplessis@nhs.net'])
-    preview_agenda = st.checkbox("Preview Agenda Before Sending", value=True)
-    if preview_agenda:
-        button_text = "Generate & Preview Agenda"
-    else:
-        button_text = "Send Agenda Email"
-    if st.button(button_text):
-        if not email_list:
-            st.warning("Please select at least one email recipient.")
+        st.caption("Partners' Agenda")
+
+        meeting_date = st.date_input("Select Meeting Date")
+        email_list = st.multiselect("Select Email Recipients", options=['jan.duplessis@nhs.net', 'asteeden@nhs.net', 'jenny.bedford@nhs.net', 'shuman.hussein@nhs.net'], default=['jan.duplessis@nhs.net'])
+        preview_agenda = st.checkbox("Preview Agenda Before Sending", value=True)
+        if preview_agenda:
+            button_text = "Generate & Preview Agenda"
         else:
-            run_partners_agenda(meeting_date.strftime("%d %b %Y"), email_list, preview_agenda)
+            button_text = "Send Agenda Email"
+        if st.button(button_text):
+            if not email_list:
+                st.warning("Please select at least one email recipient.")
+            else:
+                run_partners_agenda(meeting_date.strftime("%d %b %Y"), email_list, preview_agenda)
 
 
-elif pages == "Team Agenda":
-    st.caption("Team Agenda")
+    elif pages == "Team Agenda":
+        from main import run_team_agenda
 
-    meeting_date = st.date_input("Select Meeting Date", key="team_meeting_date")
-    email_list = st.multiselect("Select Email Recipients", options=['jan.duplessis@nhs.net', 'asteeden@nhs.net', 'jenny.bedford@nhs.net', 'shuman.hussein@nhs.net'], key="team_email_list", default=['jan.duplessis@nhs.net'])
-    preview_agenda = st.checkbox("Preview Agenda Before Sending", key="team_preview", value=True)
-    if preview_agenda:
-        button_text = "Generate & Preview Agenda"
-    else:
-        button_text = "Send Agenda Email"
-    if st.button(button_text, key="team_button"):
-        if not email_list:
-            st.warning("Please select at least one email recipient.")
+        st.caption("Team Agenda")
+
+        meeting_date = st.date_input("Select Meeting Date", key="team_meeting_date")
+        email_list = st.multiselect("Select Email Recipients", options=['jan.duplessis@nhs.net', 'asteeden@nhs.net', 'jenny.bedford@nhs.net', 'shuman.hussein@nhs.net'], key="team_email_list", default=['jan.duplessis@nhs.net'])
+        preview_agenda = st.checkbox("Preview Agenda Before Sending", key="team_preview", value=True)
+        if preview_agenda:
+            button_text = "Generate & Preview Agenda"
+        else:
+            button_text = "Send Agenda Email"
+        if st.button(button_text, key="team_button"):
+            if not email_list:
+                st.warning("Please select at least one email recipient.")
+            else:
+                run_team_agenda(meeting_date.strftime("%d %b %Y"), email_list, preview_agenda)
+
+
+    elif pages == "Tasks":
+        from main import show_tasks
+        from llm_cache import response_cache_key
+        from task_context import TASK_PROMPTS, build_task_prompt, estimate_tokens
+
+        st.caption("Tasks - Summarize my To-Do list with LLM")
+        if 'tasks' not in st.session_state:
+            st.session_state['tasks'] = show_tasks()
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            quick = st.button('Quick Wins', width='stretch', icon=":material/bolt:")
+            top_five = st.button("5 Quick Tasks", width='stretch', icon=":material/counter_5:")
+
+        with col2:
+            all = st.button("All - Order of Execution", width='stretch', icon=":material/automation:")
+            urgent = st.button("All - Order of Urgency", width='stretch', icon=":material/bomb:")
+
+        force_refresh = st.checkbox("Force refresh (ask the model again and save a new summary)", key="tasks_force_refresh")
+        compare_mode = st.toggle("Compare models", key="tasks_compare_mode", help="Send the prompt to several models at once; nothing is saved to Notion.")
+        if compare_mode:
+            compare_models_selected = st.multiselect("Models to compare", MODEL_OPTIONS, default=MODEL_OPTIONS[1:4], key="tasks_compare_models")
+
+        clicked = {"quick": quick, "top_five": top_five, "all": all, "urgent": urgent}
+        prompt_key = next((key for key, pressed in clicked.items() if pressed), None)
+        if prompt_key is None:
+            raise PageEnded
+
+        if compare_mode:
+            from model_comparison import compare_models, load_metrics, record_runs, runs_table, summarize_metrics
+            from task_context import task_token_budget
+
+            if not compare_models_selected:
+                st.warning("Select at least one model to compare.")
+                raise PageEnded
+            # Every model gets the same prompt, sized for the smallest budget.
+            budget_model = min(compare_models_selected, key=task_token_budget)
+            summary_title, prompt, task_context = build_task_prompt(prompt_key, st.session_state['tasks'], budget_model)
+            prompt_tokens = estimate_tokens(prompt, budget_model)
+            st.caption(f":material/token: Prompt ~{prompt_tokens:,} tokens ({task_context.included} tasks) sent to {len(compare_models_selected)} models")
+
+            placeholders = {}
+            for column, compare_model in zip(st.columns(len(compare_models_selected)), compare_models_selected):
+                with column:
+                    st.markdown(f"**`{compare_model}`**")
+                    placeholders[compare_model] = st.empty()
+            runs = compare_models(
+                st.secrets["GROQ_API_KEY"],
+                compare_models_selected,
+                prompt,
+                {compare_model: placeholder.markdown for compare_model, placeholder in placeholders.items()},
+            )
+            record_runs(runs, prompt_key, prompt_tokens)
+
+            st.subheader("This comparison")
+            st.dataframe(runs_table(runs), hide_index=True, width='stretch')
+            with st.expander("All recorded comparisons (medians)", icon=":material/leaderboard:"):
+                st.dataframe(summarize_metrics(load_metrics()), hide_index=True, width='stretch')
+            raise PageEnded
+
+        summary_title, prompt, task_context = build_task_prompt(prompt_key, st.session_state['tasks'], model)
+        prompt_tokens = estimate_tokens(prompt, model)
+        st.caption(
+            f":material/token: Prompt ~{prompt_tokens:,} tokens for `{model}` "
+            f"({task_context.included} of {task_context.included + task_context.omitted} tasks, "
+            f"task budget {task_context.budget:,} tokens)"
+        )
+        if task_context.omitted:
+            st.info(f":material/filter_alt: {task_context.omitted} lower-priority tasks were left out to fit the token budget.")
+
+        response_cache = get_llm_response_cache()
+        cache_key = response_cache_key(model, TASK_PROMPTS[prompt_key][1], task_context.text)
+        cached = None if force_refresh else response_cache.get(cache_key)
+
+        with st.spinner("LLM doing it's thing...", show_time=True):
+            if cached:
+                response = cached.response
+                st.caption(f":material/bolt: Cached response from {datetime.fromtimestamp(cached.created_at):%H:%M}; tick Force refresh to ask again.")
+            else:
+                response = ask_groq(prompt, model=model)
+                if response != GROQ_ERROR_RESPONSE:
+                    cached = response_cache.put(cache_key, response)
+            with st.expander("LLM Response", icon=":material/robot_2:", expanded=True):
+                st.markdown(response)
+            with st.expander("Raw markdown code", icon=":material/code:", expanded=False):
+                st.code(response, wrap_lines=True, language='markdown')
+
+            if cached and cached.page_id:
+                st.info(f":material/check_circle: Already saved to Tasks database (Page ID: `{cached.page_id}`)")
+            elif response != GROQ_ERROR_RESPONSE:
+                try:
+                    page_id = save_task_summary_to_notion(response, summary_title or "Consolidated Tasks")
+                    response_cache.set_page(cache_key, page_id)
+                    st.success(f":material/check_circle: Saved summary to Tasks database (Page ID: `{page_id}`)")
+                except Exception as e:
+                    st.error(f":material/error: Failed to save summary to Tasks database: {e}")
+
+    elif pages == "Calendar":
+        from calendar_view import CALENDAR_RANGE_DAYS, build_calendar_cards_html, calendar_fetch_window, load_calendar_index
+
+        st.caption("Calendar - This is what your week looks like.")
+        today = date.today()
+        calendar_range = st.radio(
+            "Range",
+            options=[*CALENDAR_RANGE_DAYS, "Custom"],
+            horizontal=True,
+            key="calendar_range",
+            label_visibility="collapsed",
+        )
+        if calendar_range == "Custom":
+            picked_range = st.date_input(
+                "Date range",
+                value=(today, today + timedelta(days=7)),
+                key="calendar_custom_range",
+            )
+            if not isinstance(picked_range, tuple) or len(picked_range) != 2:
+                st.info("Select a start and end date.")
+                raise PageEnded
+            start_date, end_date = picked_range
         else:
-            run_team_agenda(meeting_date.strftime("%d %b %Y"), email_list, preview_agenda)
+            start_date, end_date = today, today + timedelta(days=CALENDAR_RANGE_DAYS[calendar_range])
 
+        window_start, window_end = calendar_fetch_window(start_date, end_date)
+        cal_index = load_calendar_index(CALENDAR_DATA_SOURCE_ID, window_start, window_end)
+        events = cal_index.between(start_date, end_date)
 
-elif pages == "Tasks":
-    st.caption("Tasks - Summarize my To-Do list with LLM")
-    if 'tasks' not in st.session_state:
-        st.session_state['tasks'] = show_tasks()
+        if events.empty:
+            st.info(f"No calendar events found from {start_date:%d %b} to {end_date:%d %b %Y}.")
+        else:
+            st.caption(f"{len(events)} events from {start_date:%d %b} to {end_date:%d %b %Y}")
+            st.html(build_calendar_cards_html(events))
 
-    col1, col2 = st.columns(2)
 
-    with col1:
-        quick = st.button('Quick Wins', width='stretch', icon=":material/bolt:")
-        top_five = st.button("5 Quick Tasks", width='stretch', icon=":material/counter_5:")
+    elif pages == "Human Resources":
+        st.caption("HR")
 
-    with col2:
-        all = st.button("All - Order of Execution", width='stretch', icon=":material/automation:")
-        urgent = st.button("All - Order of Urgency", width='stretch', icon=":material/bomb:")
 
-    prompt = None
-    summary_title = None
-    if quick:
-        prompt = f"""Review my TODO list and select 2 items that I can complete in 15 min each, don't use tables in your response.
-        Here is my todo list:
-        {st.session_state['tasks']}
-        """
-        summary_title = "2 Consolidated Tasks"
-    elif top_five:
-        prompt = f"""Review my TODO list and select 5 tasks that I can complete in 30 min, don't use tables in your response.
-        Here is my todo list:
-        {st.session_state['tasks']}
-        """
-        summary_title = "5 Consolidated Tasks"
-    elif all:
-        prompt = f"""Review my TODO list and list all my task in a logical order to complete them in, don't use tables in your response.
-        Here is my todo list:
-        {st.session_state['tasks']}
-        """
-        summary_title = "Consolidated Tasks"
-    elif urgent:
-        prompt = f"""Review my TODO list and any URENT tasks, don't use tables in your response.
-        Here is my todo list:
-        {st.session_state['tasks']}
-        """
-        summary_title = "Urgent Consolidated Tasks"
-    else:
-        st.stop()
-
-    with st.spinner("LLM doing it's thing...", show_time=True):
-        response = ask_groq(prompt)
-        with st.expander("LLM Response", icon=":material/robot_2:", expanded=True):
-            st.markdown(response)
-        with st.expander("Raw markdown code", icon=":material/code:", expanded=False):
-            st.code(response, wrap_lines=True, language='markdown')
-
-        try:
-            page_id = save_task_summary_to_notion(response, summary_title or "Consolidated Tasks")
-            st.success(f":material/check_circle: Saved summary to Tasks database (Page ID: `{page_id}`)")
-        except Exception as e:
-            st.error(f":material/error: Failed to save summary to Tasks database: {e}")
-
-elif pages == "Calendar":
-    st.caption("Calendar - This is what your week looks like.")
-    today = date.today()
-    end_date = today + timedelta(days=7)
-
-    cal = nh.get_data_source_pages_as_dataframe('303fdfd6-8a97-80f6-bbcc-000b5fe219ab')
-    cal['Date'] = pd.to_datetime(cal['Date'], format='mixed', dayfirst=False, utc=True, errors='coerce')
-    next_week = cal[(cal['Date'].dt.date >= today) & (cal['Date'].dt.date <= end_date)].copy()
-    next_week.sort_values(by='Date', ascending=True, inplace=True)
-
-    def get_value(row, options):
-        for col in options:
-            if col in row.index:
-                value = row[col]
-                if isinstance(value, (list, tuple, set)):
-                    items = [str(v) for v in value if pd.notna(v)]
-                    if items:
-                        return ", ".join(items)
-                    continue
-                try:
-                    if pd.notna(value):
-                        return str(value)
-                except Exception:
-                    # Fallback for any non-scalar values not handled above
-                    if value is not None:
-                        return str(value)
-        return ""
-
-    def format_start_datetime(ts):
-        if pd.isna(ts):
-            return "No start date"
-        local_tz = datetime.now().astimezone().tzinfo
-        local_ts = ts.tz_convert(local_tz) if getattr(ts, "tzinfo", None) else ts
-        return local_ts.strftime("%a %d %b %Y, %H:%M")
-
-    if next_week.empty:
-        st.info("No calendar events found for the next 7 days.")
-    else:
-        cards = [
-            "<style>"
-            ".cal-wrap { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 12px; }"
-            ".cal-card { border: 1px solid #e3e8ef; border-radius: 12px; padding: 14px; background: linear-gradient(180deg, #ffffff 0%, #f8fbff 100%); }"
-            ".cal-date { font-size: 0.85rem; font-weight: 700; color: #4294c2; margin-bottom: 6px; }"
-            ".cal-event { font-size: 1.05rem; font-weight: 700; color: #14213d; margin-bottom: 6px; }"
-            ".cal-desc { font-size: 0.85rem; color: #2f3e46; margin-bottom: 8px; }"
-            ".cal-meta { font-size: 0.85rem; color: #495057; margin-bottom: 4px; }"
-            ".cal-link a { color: #4294c2; text-decoration: none; }"
-            ".cal-link a:hover { text-decoration: underline; }"
-            "</style>",
-            '<div class="cal-wrap">',
-        ]
-        for _, row in next_week.iterrows():
-            date_str = html.escape(format_start_datetime(row['Date']))
-            event = html.escape(get_value(row, ["Event", "Name", "Title"]) or "Untitled Event")
-            desc = html.escape(get_value(row, ["Description", "Discription", "Brief Description"]) or "No description")
-            tag = html.escape(get_value(row, ["Tag", "Tags"]) or "N/A")
-            teams_url = get_value(row, ["Teams Link", "Teams URL", "Teams Url", "URL", "Link"])
-
-            teams_html = (
-                f'<a href="{html.escape(teams_url, quote=True)}" target="_blank" rel="noopener noreferrer">Open Teams</a>'
-                if teams_url
-                else "N/A"
-            )
-            cards.append(
-                f'<div class="cal-card">'
-                f'<div class="cal-date">{date_str}</div>'
-                f'<div class="cal-event">{event}</div>'
-                f'<div class="cal-desc">{desc}</div>'
-                f'<div class="cal-meta"><b>Tag:</b> {tag}</div>'
-                f'<div class="cal-meta cal-link"><b>Teams URL:</b> {teams_html}</div>'
-                f'</div>'
-            )
-        cards.append("</div>")
-        st.html("".join(cards))
+    elif pages == "Notion Interview Database":
+        from notion_interviews import render_notion_interview_database
 
+        render_notion_interview_database(nh)
 
-elif pages == "Human Resources":
-    st.caption("HR")
 
+    elif pages == "Write to URL":
+        from razor_db_create_new_page import render_notion_page_creator
 
-elif pages == "Notion Interview Database":
-    render_notion_interview_database(nh)
+        render_notion_page_creator(model=model)
 
 
-elif pages == "Write to URL":
-    render_notion_page_creator(model=model)
+    elif pages == "PDF to PNG":
+        from pdf_to_png import render_pdf_to_png
 
+        render_pdf_to_png(nh)
 
-elif pages == "PDF to PNG":
-    render_pdf_to_png(nh)
 
+    elif pages == "Performance":
+        from tracing import TRACE_PATH, clear_spans, load_spans, summarize_spans
 
-elif pages == "Python Script Runner":
-    st.caption("Python-script-runner")
-    if "weather_forecast_result" not in st.session_state:
-        st.session_state.weather_forecast_result = None
+        st.caption("Performance - Timings recorded by the tracing spans")
+        spans = load_spans()
+        if spans.empty:
+            st.info(f"No spans recorded yet in `{TRACE_PATH}`. Run a workflow and come back.")
+            raise PageEnded
 
-    c1, c2 = st.columns(2)
-    with c1:
-        trending_github = st.button("Trending GitHub Repos", icon=":material/deployed_code:", width='stretch')
-        if trending_github:
-            with st.spinner("Fetching trending GitHub repositories...", show_time=True):
-                try:
-                    repos_added, duplicates_removed = run_github_trending_workflow()
-                    st.success(f":material/check_circle: Successfully added {repos_added} trending Python repositories!")
-                    if duplicates_removed > 0:
-                        st.info(f":material/delete: Removed {duplicates_removed} duplicate entries")
+        window = st.radio("Window", list(PERFORMANCE_WINDOWS), index=1, horizontal=True, key="performance_window", label_visibility="collapsed")
+        if PERFORMANCE_WINDOWS[window] is not None:
+            spans = spans[spans["ts"] >= datetime.now().astimezone() - PERFORMANCE_WINDOWS[window]]
+        if spans.empty:
+            st.info("No spans recorded in this window.")
+            raise PageEnded
 
-                except Exception as e:
-                    st.error(f":material/error: Error running GitHub trending workflow: {e}")
-    with c2:
-        st.link_button("Notion Github Repos", "https://www.notion.so/janduplessis/2f4fdfd68a9780a1a74fd03b7008ed99?v=2f4fdfd68a9780cbad38000c27fcd66a&source=copy_link", type='secondary', width='stretch', icon=':material/link:')
-
-    c3, c4 = st.columns(2)
-    with c3:
-        run_weather = st.button("Run Weather Forecast", icon=":material/cloud:", width='stretch')
-        if run_weather:
-            with st.spinner("Creating London weather forecast...", show_time=True):
-                try:
-                    weather_database_id = st.secrets.get("NOTION_WEATHER_DATABASE_ID", DEFAULT_WEATHER_DATABASE_ID)
-                    forecast = run_forecast(st.secrets["NOTION_TOKEN"], weather_database_id)
-                    st.session_state.weather_forecast_result = forecast
-                except Exception as e:
-                    st.error(f":material/error: Error running weather forecast workflow: {e}")
-    with c4:
-        st.link_button("Open NotionOS", "https://app.notion.com/p/janduplessis/NotionOS-a5a7fa49036a430ba5fbc088016958bb?source=copy_link", type='secondary', width='stretch', icon=':material/link:')
-
-    forecast = st.session_state.weather_forecast_result
-    if forecast:
-        st.success(f":material/check_circle: Forecast saved to Notion page `{forecast['page_id']}`")
-        st.info(f"Processed {forecast['rows']} hourly forecast rows.")
-        st.image(str(forecast["temperature_path"]), caption="7-Day Forecast London - Temp & Rain", width='stretch')
-        st.image(str(forecast["cloud_path"]), caption="7-Day Forecast London - Cloud Cover", width='stretch')
+        st.caption(f"{len(spans):,} spans from {spans['ts'].min():%d %b %H:%M} to {spans['ts'].max():%d %b %H:%M}")
+        st.dataframe(summarize_spans(spans), hide_index=True, width='stretch')
+
+        operation = st.selectbox("Operation", sorted(spans["name"].unique()), key="performance_operation")
+        operation_spans = spans[spans["name"] == operation]
+        st.line_chart(operation_spans.set_index("ts")["duration_ms"], y_label="ms")
+        errors = operation_spans[operation_spans["status"] == "error"]
+        if not errors.empty:
+            with st.expander(f"Errors ({len(errors)})", icon=":material/error:"):
+                st.dataframe(errors[["ts", "duration_ms", "error"]], hide_index=True, width='stretch')
+        with st.expander("Recent spans", icon=":material/timer:"):
+            st.dataframe(operation_spans.sort_values("ts", ascending=False).head(50).dropna(axis=1, how="all"), hide_index=True, width='stretch')
+
+        if st.button("Clear recorded spans", icon=":material/delete:"):
+            clear_spans()
+            st.rerun()
+
+
+    elif pages == "Background Jobs":
+        st.caption("Background Jobs - Workflows queued to run outside this page")
+        show_background_jobs()
+
+
+    elif pages == "Python Script Runner":
+        from github_trending import PERIOD_ORDER, TRENDING_LANGUAGES, TRENDING_PERIODS, load_history, star_velocity
+        from main import clean_up_duplicate_pages, run_github_trending_workflow
+        from weather_forecast import DEFAULT_SITES, DEFAULT_WEATHER_DATABASE_ID, run_forecasts
+
+        st.caption("Python-script-runner")
+        if "weather_forecast_result" not in st.session_state:
+            st.session_state.weather_forecast_result = None
+        run_in_background = st.toggle(
+            "Run in the background",
+            key="run_in_background",
+            help="Queue the workflows as background jobs that keep running if you close the tab. Follow them on the Background Jobs page; needs `python jobs.py worker` running.",
+        )
+
+        c1, c2 = st.columns(2)
+        with c1:
+            trending_github = st.button("Trending GitHub Repos", icon=":material/deployed_code:", width='stretch')
+            trending_languages = st.multiselect("Languages", TRENDING_LANGUAGE_OPTIONS, default=TRENDING_LANGUAGES, key="trending_languages")
+            trending_periods = st.multiselect("Periods", PERIOD_ORDER, default=TRENDING_PERIODS, key="trending_periods")
+            if trending_github and run_in_background:
+                from jobs import submit_job
+
+                job_id = submit_job("github_trending", {"languages": trending_languages, "periods": trending_periods})
+                st.success(f":material/schedule: Queued background job {job_id}.")
+            elif trending_github:
+                with st.spinner("Fetching trending GitHub repositories...", show_time=True):
+                    try:
+                        repos_created, repos_updated = run_github_trending_workflow(trending_languages, trending_periods)
+                        st.success(f":material/check_circle: Added {repos_created} and updated {repos_updated} trending repositories!")
+
+                    except Exception as e:
+                        st.error(f":material/error: Error running GitHub trending workflow: {e}")
+            with st.expander("Star velocity (last 7 days)", icon=":material/trending_up:"):
+                st.dataframe(star_velocity(load_history()).head(20), hide_index=True, width='stretch')
+            with st.expander("Legacy duplicates", icon=":material/mop:"):
+                st.caption("Ingestion now updates existing pages, so this is only needed for duplicates created before that. It reads the whole database.")
+                trending_dry_run = st.checkbox("Dry run: only list duplicates", value=True, key="trending_dry_run")
+                remove_duplicates = st.button("Find and remove duplicates", icon=":material/delete:", width='stretch')
+                if remove_duplicates:
+                    with st.spinner("Finding duplicate GitHub repositories...", show_time=True):
+                        try:
+                            results = clean_up_duplicate_pages(dry_run=trending_dry_run)
+                            if not results:
+                                st.info(":material/check_circle: No duplicate entries found.")
+                        except Exception as e:
+                            st.error(f":material/error: Error removing duplicates: {e}")
+        with c2:
+            st.link_button("Notion Github Repos", "https://www.notion.so/janduplessis/2f4fdfd68a9780a1a74fd03b7008ed99?v=2f4fdfd68a9780cbad38000c27fcd66a&source=copy_link", type='secondary', width='stretch', icon=':material/link:')
+
+        c3, c4 = st.columns(2)
+        with c3:
+            run_weather = st.button("Run Weather Forecast", icon=":material/cloud:", width='stretch')
+            refresh_weather = st.checkbox("Skip cached forecast", key="refresh_weather")
+            update_weather_page = st.checkbox("Update today's page in place", key="update_weather_page")
+            weather_sites = {name: tuple(coords) for name, coords in st.secrets.get("WEATHER_SITES", DEFAULT_SITES).items()}
+            selected_sites = st.multiselect("Sites", list(weather_sites), default=list(weather_sites)[:1], key="weather_sites") if len(weather_sites) > 1 else list(weather_sites)
+            if run_weather and selected_sites and run_in_background:
+                from jobs import submit_job
+
+                job_id = submit_job(
+                    "weather_forecast",
+                    {
+                        "database_id": st.secrets.get("NOTION_WEATHER_DATABASE_ID", DEFAULT_WEATHER_DATABASE_ID),
+                        "sites": {site: weather_sites[site] for site in selected_sites},
+                        "use_cache": not refresh_weather,
+                        "update_today": update_weather_page,
+                    },
+                )
+                st.success(f":material/schedule: Queued background job {job_id}.")
+            elif run_weather and selected_sites:
+                with st.spinner(f"Creating weather forecast for {', '.join(selected_sites)}...", show_time=True):
+                    try:
+                        weather_database_id = st.secrets.get("NOTION_WEATHER_DATABASE_ID", DEFAULT_WEATHER_DATABASE_ID)
+                        forecasts = run_forecasts(
+                            st.secrets["NOTION_TOKEN"],
+                            weather_database_id,
+                            {site: weather_sites[site] for site in selected_sites},
+                            use_cache=not refresh_weather,
+                            update_today=update_weather_page,
+                        )
+                        st.session_state.weather_forecast_result = forecasts
+                    except Exception as e:
+                        st.error(f":material/error: Error running weather forecast workflow: {e}")
+        with c4:
+            st.link_button("Open NotionOS", "https://app.notion.com/p/janduplessis/NotionOS-a5a7fa49036a430ba5fbc088016958bb?source=copy_link", type='secondary', width='stretch', icon=':material/link:')
+
+        for forecast in st.session_state.weather_forecast_result or []:
+            action = "updated on" if forecast.get('updated') else "saved to"
+            st.success(f":material/check_circle: {forecast['site']} forecast {action} Notion page `{forecast['page_id']}`")
+            st.info(f"Processed {forecast['rows']} hourly forecast rows.")
+            if forecast.get('changes'):
+                with st.expander(f"Changes since the previous {forecast['site']} forecast", icon=":material/compare_arrows:"):
+                    st.dataframe([forecast['changes']], hide_index=True, width='stretch')
+            st.image(str(forecast["temperature_path"]), caption=f"7-Day Forecast {forecast['site']} - Temp & Rain", width='stretch')
+            st.image(str(forecast["cloud_path"]), caption=f"7-Day Forecast {forecast['site']} - Cloud Cover", width='stretch')
+
+if profile_run:
+    show_page_profiles(st.session_state.page_profiles, page_profile)
@@ -7,11 +7,14 @@ import argparse
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from notionhelper import NotionHelper
-import requests
+
+from llm_client import LLMError, get_llm_client, set_endpoint_concurrency
 
 
 DEFAULT_BASE_URL = "http://127.0.0.1:8000/v1"
@@ -62,6 +65,26 @@ class LocalLLMSettings:
     timeout: float = 180.0
     max_retries: int = 2
     delay: float = 0.0
+    # Candidates summarised in parallel; also the request limit for the endpoint.
+    workers: int = 1
+
+
+class CallPacer:
+    """Spaces calls at least `interval` seconds apart across all worker threads."""
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        time.sleep(start - now)
 
 
 def normalize_name(value: str) -> str:
@@ -80,51 +103,27 @@ def generate_summary(
     timeout: float = 180.0,
     max_retries: int = 2,
 ) -> str:
-    url = f"{base_url.rstrip('/')}/chat/completions"
-    payload = {
-        "model": model,
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are a careful UK general-practice recruitment assistant. "
-                    "Use only the supplied application evidence and return Markdown."
-                ),
-            },
-            {
-                "role": "user",
-                "content": assessment_prompt.format(
-                    candidate_text=candidate_text,
-                    job_role=job_role,
-                ),
-            },
-        ],
-        "temperature": 0.1,
-        "max_tokens": max_tokens,
-    }
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-
-    last_error: Exception | None = None
-    for attempt in range(max_retries + 1):
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=timeout)
-            response.raise_for_status()
-            data = response.json()
-            summary = data["choices"][0]["message"]["content"]
-            break
-        except Exception as exc:
-            last_error = exc
-            if attempt >= max_retries:
-                raise RuntimeError(f"Local LLM request failed: {exc}") from exc
-            time.sleep(min(2 ** attempt, 8))
-    else:
-        raise RuntimeError(f"Local LLM request failed: {last_error}")
-
-    if not summary or not summary.strip():
-        raise RuntimeError("The model returned an empty response")
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are a careful UK general-practice recruitment assistant. "
+                "Use only the supplied application evidence and return Markdown."
+            ),
+        },
+        {
+            "role": "user",
+            "content": assessment_prompt.format(
+                candidate_text=candidate_text,
+                job_role=job_role,
+            ),
+        },
+    ]
+    client = get_llm_client(base_url, api_key, read_timeout=timeout, max_retries=max_retries)
+    try:
+        summary = client.complete(messages, model, temperature=0.1, max_tokens=max_tokens).text
+    except LLMError as exc:
+        raise RuntimeError(f"Local LLM request failed: {exc}") from exc
     return summary.strip()
 
 
@@ -148,6 +147,59 @@ def generate_summary_with_settings(
     )
 
 
+def summarize_candidate_file(
+    path: Path,
+    llm_settings: LocalLLMSettings,
+    pacer: CallPacer,
+    notion: NotionHelper | None = None,
+    data=None,
+) -> str:
+    """
+    Summarise one candidate file and append the summary to their Notion page.
+
+    Runs on a worker thread, so it reports through its return value rather
+    than printing.
+
+    Args:
+        path: Candidate .txt file; the stem must match the Notion "Fullname"
+        llm_settings: Endpoint and model settings
+        pacer: Shared pacer enforcing the delay between LLM calls
+        notion: Notion client, or None for a dry run
+        data: Notion rows with "Fullname" and "notion_page_id" columns
+
+    Returns:
+        str: What was done, for the progress log
+    """
+    candidate_name = path.stem
+    page_id: str | None = None
+    if notion is not None:
+        the_row = data[data["Fullname"] == candidate_name]
+        if len(the_row) != 1:
+            raise RuntimeError(
+                f"Expected one Notion row for {candidate_name!r}; found {len(the_row)}"
+            )
+        page_id = str(the_row.iloc[0]["notion_page_id"]).strip()
+        if not page_id or page_id.casefold() == "nan":
+            raise RuntimeError(f"Missing notion_page_id for {candidate_name!r}")
+
+    candidate_text = path.read_text(encoding="utf-8-sig").strip()
+    pacer.wait()
+    summary = generate_summary_with_settings(candidate_text, llm_settings)
+
+    if notion is None:
+        return "  Dry run: Notion was not updated"
+
+    # Re-read immediately before mutation so a concurrent Notion edit is
+    # observed and existing page content is never replaced.
+    notion.get_page(page_id, return_markdown=True)
+    raw_markdown = f"### Candidate\n\n{summary}"
+    notion.append_page_body(
+        page_id,
+        body=raw_markdown,
+    )
+    return f"  Appended to Notion page: {candidate_name} ({page_id})"
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -167,6 +219,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--data-source-id", default=DEFAULT_DATA_SOURCE_ID)
     parser.add_argument("--max-tokens", type=int, default=1400)
     parser.add_argument("--delay", type=float, default=0.0, help="Seconds between LLM calls")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Candidates summarised in parallel; match the LLM server's slot count (default: 1)",
+    )
     parser.add_argument(
         "--candidate",
         help="Process only this candidate name (the filename without .txt)",
@@ -206,6 +264,7 @@ def main() -> int:
         api_key=llm_api_key,
         max_tokens=args.max_tokens,
         delay=args.delay,
+        workers=max(1, args.workers),
     )
 
     notion: NotionHelper | None = None
@@ -243,50 +302,26 @@ def main() -> int:
             print("No LLM calls or Notion writes were made.", file=sys.stderr)
             return 1
 
+    set_endpoint_concurrency(llm_settings.base_url, llm_settings.workers)
+    pacer = CallPacer(args.delay)
     failures = 0
-    for position, path in enumerate(candidate_files, start=1):
-        candidate_name = path.stem
-        print(f"[{position}/{len(candidate_files)}] {candidate_name}")
-        try:
-            page_id: str | None = None
-            if not args.dry_run:
-                assert data is not None
-                the_row = data[data["Fullname"] == candidate_name]
-                if len(the_row) != 1:
-                    raise RuntimeError(
-                        f"Expected one Notion row for {candidate_name!r}; found {len(the_row)}"
-                    )
-                page_id = str(the_row.iloc[0]["notion_page_id"]).strip()
-                if not page_id or page_id.casefold() == "nan":
-                    raise RuntimeError(f"Missing notion_page_id for {candidate_name!r}")
-
-            candidate_text = path.read_text(encoding="utf-8-sig").strip()
-            summary = generate_summary_with_settings(candidate_text, llm_settings)
-
+    total = len(candidate_files)
+    with ThreadPoolExecutor(max_workers=llm_settings.workers) as executor:
+        futures = {
+            executor.submit(summarize_candidate_file, path, llm_settings, pacer, notion, data): path
+            for path in candidate_files
+        }
+        for position, future in enumerate(as_completed(futures), start=1):
+            candidate_name = futures[future].stem
+            print(f"[{position}/{total}] {candidate_name}")
+            try:
+                outcome = future.result()
+            except Exception as exc:
+                failures += 1
+                print(f"  ERROR: {exc}", file=sys.stderr)
+                continue
             print(f"\n===== {candidate_name} =====\n")
-
-
-            if args.dry_run:
-                print("  Dry run: Notion was not updated")
-            else:
-                assert notion is not None
-                assert page_id is not None
-
-                # Re-read immediately before mutation so a concurrent Notion edit is
-                # observed and existing page content is never replaced.
-                notion.get_page(page_id, return_markdown=True)
-                raw_markdown = f"### Candidate\n\n{summary}"
-                notion.append_page_body(
-                    page_id,
-                    body=raw_markdown,
-                )
-                print(f"  Appended to Notion page: {candidate_name} ({page_id})")
-        except Exception as exc:
-            failures += 1
-            print(f"  ERROR: {exc}", file=sys.stderr)
-
-        if args.delay > 0 and position < len(candidate_files):
-            time.sleep(args.delay)
+            print(outcome)
 
     succeeded = len(candidate_files) - failures
     print(f"Finished: {succeeded} succeeded, {failures} failed")
@@ -0,0 +1,175 @@
+"""
+Compact, token-budgeted task lists for the Tasks page prompts.
+
+Tasks are sent as tab-separated rows with short column names and due dates
+relative to today, instead of the repr of a list of dicts with pandas
+Timestamps. When the list would not fit the budget for the selected model,
+the most urgent tasks are kept and the rest are summarised in one line.
+"""
+import math
+from datetime import date, datetime
+from typing import NamedTuple
+
+import pandas as pd
+
+# Context window (tokens) of each model offered in the sidebar.
+MODEL_CONTEXT_TOKENS = {
+    "moonshotai/kimi-k2-instruct-0905": 262_144,
+    "meta-llama/llama-4-maverick-17b-128e-instruct": 131_072,
+    "qwen/qwen3-32b": 131_072,
+    "openai/gpt-oss-120b": 131_072,
+    "groq/compound-mini": 131_072,
+    "groq/compound": 131_072,
+}
+DEFAULT_CONTEXT_TOKENS = 32_768
+
+# Average characters per token for short English rows, by model family. A
+# heuristic (no tokenizer download); it errs on the side of more tokens.
+CHARS_PER_TOKEN = {
+    "moonshotai": 3.6,
+    "meta-llama": 3.8,
+    "qwen": 3.4,
+    "openai": 3.8,
+    "groq": 3.8,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.5
+
+# Task context is capped well below any context window to keep latency and
+# cost down; RESPONSE_RESERVE_TOKENS is left free for the answer.
+TASK_CONTEXT_MAX_TOKENS = 6_000
+RESPONSE_RESERVE_TOKENS = 4_096
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+TASK_COLUMNS = "due\tpri\tstatus\ttask"
+OMITTED_NOTE = "({count} lower-priority tasks omitted)"
+
+TASK_PROMPTS = {
+    "quick": (
+        "2 Consolidated Tasks",
+        "Review my TODO list and select 2 items that I can complete in 15 min each, don't use tables in your response.",
+    ),
+    "top_five": (
+        "5 Consolidated Tasks",
+        "Review my TODO list and select 5 tasks that I can complete in 30 min, don't use tables in your response.",
+    ),
+    "all": (
+        "Consolidated Tasks",
+        "Review my TODO list and list all my task in a logical order to complete them in, don't use tables in your response.",
+    ),
+    "urgent": (
+        "Urgent Consolidated Tasks",
+        "Review my TODO list and any URENT tasks, don't use tables in your response.",
+    ),
+}
+PROMPT_TEMPLATE = (
+    "{instruction}\n"
+    "Here is my todo list, one task per line (tab-separated; due is relative "
+    "to today, e.g. -2d is two days overdue; pri H/M/L):\n"
+    "{tasks}"
+)
+
+
+class TaskContext(NamedTuple):
+    text: str
+    tokens: int
+    included: int
+    omitted: int
+    budget: int
+
+
+def estimate_tokens(text: str, model: str) -> int:
+    """Approximate token count of `text` for `model`."""
+    chars_per_token = CHARS_PER_TOKEN.get(model.split("/")[0], DEFAULT_CHARS_PER_TOKEN)
+    return math.ceil(len(text) / chars_per_token)
+
+
+def task_token_budget(model: str) -> int:
+    """Tokens available for the task list when prompting `model`."""
+    context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+    return min(TASK_CONTEXT_MAX_TOKENS, context - RESPONSE_RESERVE_TOKENS)
+
+
+def relative_due(due, today: date) -> str:
+    """'today', '+3d' or '-2d' (overdue); empty when there is no date."""
+    if due is None or pd.isna(due):
+        return ""
+    timestamp = pd.Timestamp(due)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    days = (timestamp.date() - today).days
+    return "today" if days == 0 else f"{days:+d}d"
+
+
+def _task_row(task: dict, today: date) -> str:
+    priority = str(task.get("Priority") or "")
+    cells = [
+        relative_due(task.get("Date"), today),
+        priority[:1].upper(),
+        str(task.get("Status") or ""),
+        " ".join(str(task.get("Task") or "").split()),
+    ]
+    return "\t".join(cells)
+
+
+def prioritise_tasks(tasks: list[dict]) -> list[dict]:
+    """High before Medium before Low, then earliest due (overdue first); undated last."""
+    far_future = pd.Timestamp.max.tz_localize("UTC")
+
+    def sort_key(task: dict):
+        due = task.get("Date")
+        due = far_future if due is None or pd.isna(due) else pd.Timestamp(due)
+        if due.tzinfo is None:
+            due = due.tz_localize("UTC")
+        return PRIORITY_RANK.get(task.get("Priority"), len(PRIORITY_RANK)), due
+
+    return sorted(tasks, key=sort_key)
+
+
+def build_task_context(tasks: list[dict], model: str, budget: int | None = None, today: date | None = None) -> TaskContext:
+    """
+    Serialise tasks for a prompt, keeping the most urgent ones that fit the budget.
+
+    Args:
+        tasks: Task records from main.show_tasks
+        model: Model the prompt is for, used to estimate tokens
+        budget: Token budget for the task list (default: task_token_budget(model))
+        today: Reference date for relative due dates (default: today)
+
+    Returns:
+        TaskContext: text, estimated tokens, included/omitted task counts and the budget used
+    """
+    budget = budget or task_token_budget(model)
+    today = today or datetime.now().date()
+    lines = [TASK_COLUMNS]
+    tokens = estimate_tokens(TASK_COLUMNS, model)
+    ordered = prioritise_tasks(tasks)
+    # Leave room for the "omitted" note in case the list has to be cut.
+    row_budget = budget - estimate_tokens(OMITTED_NOTE.format(count=len(ordered)), model)
+    for task in ordered:
+        row = _task_row(task, today)
+        row_tokens = estimate_tokens(row + "\n", model)
+        if tokens + row_tokens > row_budget:
+            break
+        lines.append(row)
+        tokens += row_tokens
+    included = len(lines) - 1
+    omitted = len(ordered) - included
+    if omitted:
+        note = OMITTED_NOTE.format(count=omitted)
+        lines.append(note)
+        tokens += estimate_tokens(note, model)
+    return TaskContext("\n".join(lines), tokens, included, omitted, budget)
+
+
+def build_task_prompt(prompt_key: str, tasks: list[dict], model: str) -> tuple[str, str, TaskContext]:
+    """
+    Build the prompt for one of TASK_PROMPTS.
+
+    Returns:
+        tuple: (summary_title, prompt, task_context)
+    """
+    summary_title, instruction = TASK_PROMPTS[prompt_key]
+    instruction_tokens = estimate_tokens(PROMPT_TEMPLATE.format(instruction=instruction, tasks=""), model)
+    context = build_task_context(tasks, model, budget=task_token_budget(model) - instruction_tokens)
+    prompt = PROMPT_TEMPLATE.format(instruction=instruction, tasks=context.text)
+    return summary_title, prompt, context
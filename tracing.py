@@ -0,0 +1,226 @@
+"""
+Lightweight timing spans for the app's hot paths.
+
+Wrap an operation in `span("name")` (or decorate it with `@traced()`) to
+record its monotonic duration, outcome and any counters or byte sizes set on
+the span. Finished spans are appended as JSON lines to TRACE_PATH, which the
+Performance page summarises as p50/p95 per operation. Set TRACING=0 to turn
+recording off.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+TRACE_PATH = Path(os.environ.get("TRACE_PATH", ".traces.jsonl"))
+# The trace file is rotated to TRACE_PATH + ".1" once it reaches this size.
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACING_ENABLED = os.environ.get("TRACING", "1") != "0"
+
+# Notion IDs in request paths, with or without dashes.
+_NOTION_ID = re.compile(r"^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$", re.IGNORECASE)
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation. Attributes set with `set` or `add` are recorded with it."""
+
+    def __init__(self, name: str, parent: str | None = None, **attrs: Any):
+        self.name = name
+        self.parent = parent
+        self.attrs = dict(attrs)
+        self.started_at = datetime.now().astimezone()
+        self.duration_ms: float | None = None
+        self.status = "ok"
+        self.error = ""
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, counter: str, amount: int | float = 1) -> None:
+        self.attrs[counter] = self.attrs.get(counter, 0) + amount
+
+    def record(self) -> dict:
+        return {
+            "ts": self.started_at.isoformat(timespec="milliseconds"),
+            "name": self.name,
+            "parent": self.parent,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": self.status,
+            "error": self.error,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            "attrs": self.attrs,
+        }
+
+
+def _write(record: dict, path: Path = TRACE_PATH) -> None:
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        try:
+            if path.stat().st_size >= TRACE_MAX_BYTES:
+                os.replace(path, path.with_name(path.name + ".1"))
+        except OSError:
+            pass
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(line)
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """
+    Time the enclosed block as operation `name`.
+
+    Exceptions are recorded on the span as errors and re-raised. Control flow
+    that is not an `Exception` (KeyboardInterrupt, Streamlit's st.stop() and
+    st.rerun()) is re-raised with status "interrupted" instead. The enclosing
+    span (in the same thread) is recorded as the parent.
+
+    Args:
+        name: Operation name, e.g. "notion POST data_sources/query"
+        **attrs: Initial attributes such as counts or sizes
+
+    Yields:
+        Span: Set further attributes with `set` and `add`
+    """
+    parent = _current_span.get()
+    current = Span(name, parent.name if parent else None, **attrs)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except Exception as exc:
+        current.status = "error"
+        current.error = f"{type(exc).__name__}: {exc}"
+        raise
+    except BaseException:
+        current.status = "interrupted"
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(token)
+        if TRACING_ENABLED:
+            try:
+                _write(current.record())
+            except OSError:
+                # Tracing must never break the traced operation.
+                pass
+
+
+def traced(name: str | None = None):
+    """Decorator form of `span`; the name defaults to module.function."""
+
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def notion_endpoint(url: str) -> str:
+    """Request path with the version prefix and IDs removed, e.g. 'data_sources/query'."""
+    path = url.split("://", 1)[-1].split("?", 1)[0]
+    segments = [segment for segment in path.split("/")[1:] if segment and segment != "v1"]
+    return "/".join(segment for segment in segments if not _NOTION_ID.match(segment))
+
+
+def trace_notion_requests(nh):
+    """
+    Record a span for every API call made by `nh`.
+
+    Applied on top of `rate_limit.rate_limit_notion_helper`, so the recorded
+    duration includes any time spent waiting for the rate limiter.
+
+    Returns:
+        The same NotionHelper instance, for chaining
+    """
+    if getattr(nh, "_traced", False):
+        return nh
+    make_request = nh._make_request
+
+    def traced_make_request(method: str, url: str, payload: dict | None = None, *args: Any, **kwargs: Any) -> Any:
+        request_bytes = len(json.dumps(payload)) if payload else 0
+        with span(f"notion {method.upper()} {notion_endpoint(url)}", request_bytes=request_bytes) as current:
+            response = make_request(method, url, payload, *args, **kwargs)
+            if isinstance(response, dict) and "results" in response:
+                current.set(results=len(response["results"]))
+            return response
+
+    nh._make_request = traced_make_request
+    nh._traced = True
+    return nh
+
+
+def load_spans(path: Path = TRACE_PATH, include_rotated: bool = True) -> pd.DataFrame:
+    """
+    Read recorded spans, oldest first.
+
+    Returns:
+        DataFrame: One row per span; attributes are expanded to `attr.<name>` columns
+    """
+    paths = [Path(str(path) + ".1"), Path(path)] if include_rotated else [Path(path)]
+    records = []
+    for trace_path in paths:
+        if not trace_path.exists():
+            continue
+        with open(trace_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    if not records:
+        return pd.DataFrame()
+    spans = pd.json_normalize(records, sep=".")
+    spans.columns = [column.replace("attrs.", "attr.", 1) for column in spans.columns]
+    spans["ts"] = pd.to_datetime(spans["ts"], utc=True, format="ISO8601")
+    return spans
+
+
+def summarize_spans(spans: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latency percentiles per operation, slowest p95 first.
+
+    Returns:
+        DataFrame: name, calls, errors, p50_ms, p95_ms, max_ms, total_s and
+        mean bytes where the spans recorded any `*bytes` attribute
+    """
+    if spans.empty:
+        return spans
+    grouped = spans.groupby("name")
+    summary = pd.DataFrame(
+        {
+            "calls": grouped.size(),
+            "errors": grouped["status"].apply(lambda status: int((status == "error").sum())),
+            "p50_ms": grouped["duration_ms"].quantile(0.5),
+            "p95_ms": grouped["duration_ms"].quantile(0.95),
+            "max_ms": grouped["duration_ms"].max(),
+            "total_s": grouped["duration_ms"].sum() / 1000,
+        }
+    )
+    for column in [column for column in spans.columns if column.startswith("attr.") and column.endswith("bytes")]:
+        summary[f"mean_{column.removeprefix('attr.')}"] = grouped[column].mean()
+    return summary.round(1).sort_values("p95_ms", ascending=False).reset_index()
+
+
+def clear_spans(path: Path = TRACE_PATH) -> None:
+    with _write_lock:
+        for trace_path in (Path(path), Path(str(path) + ".1")):
+            trace_path.unlink(missing_ok=True)
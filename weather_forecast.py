@@ -1,68 +1,334 @@
-from datetime import datetime
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import requests
 from loguru import logger
 from notionhelper import NotionHelper
 
+import forecast_history
+from forecast_history import site_slug
+from tracing import span
+
 
 DATA_PATH = Path("weather-images")
+FORECAST_CACHE_PATH = DATA_PATH / "forecast-cache"
 DEFAULT_WEATHER_DATABASE_ID = "382fdfd6-8a97-8049-b876-000bfd6077f2"
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+LONDON = (51.5085, -0.1257)
+DEFAULT_SITE = "London"
+DEFAULT_SITES = {DEFAULT_SITE: LONDON}
+# Optional text property naming the site on each forecast page. It is never
+# added automatically; pages get it, and are matched on it, only when the
+# weather database already has the column.
+SITE_PROPERTY = "Site"
+HOURLY_VARIABLES = [
+    "temperature_2m",
+    "apparent_temperature",
+    "rain",
+    "cloud_cover",
+    "cloud_cover_low",
+    "cloud_cover_mid",
+    "cloud_cover_high",
+]
+# Open-Meteo's models for the UK publish new runs every few hours; a cached
+# forecast is reused until the next run boundary (UTC) plus publishing delay.
+MODEL_UPDATE_INTERVAL = timedelta(hours=3)
+MODEL_PUBLISH_DELAY = timedelta(minutes=30)
+
+# "matplotlib" renders on reusable Agg figure templates; "seaborn" is the
+# original per-run sns.lineplot path, kept for comparison.
+CHART_RENDERERS = ("matplotlib", "seaborn")
+DEFAULT_CHART_RENDERER = "matplotlib"
+CHART_SIZE = (12, 5)
+TEMPERATURE_SERIES = [
+    ("temperature_2m", "#d95442", 4),
+    ("apparent_temperature", "#d7d8d7", 2),
+    ("rain", "#50b2d4", 3),
+]
+CLOUD_SERIES = [("cloud_cover", "#1e293b", 1)]
+CLOUD_FILL = ("cloud_cover", "#0ea5e9")
+
+_log_configured = False
+# Weather database id -> whether it has SITE_PROPERTY, read once per process.
+_site_property_present: dict[str, bool] = {}
+_site_property_lock = threading.Lock()
 
 
 def _ensure_data_path() -> None:
+    global _log_configured
     DATA_PATH.mkdir(exist_ok=True)
-    logger.add(DATA_PATH / "weather.log", rotation="5000 KB")
+    if not _log_configured:
+        logger.add(DATA_PATH / "weather.log", rotation="1 MB", retention=3)
+        _log_configured = True
+
+
+def forecast_cache_key(latitude: float, longitude: float, variables: list[str]) -> str:
+    """Cache key for a location (rounded to ~100 m) and set of hourly variables."""
+    raw = f"{latitude:.3f},{longitude:.3f}|{','.join(sorted(variables))}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def next_model_update(now: datetime) -> datetime:
+    """First time after `now` that a newer model run should be available."""
+    interval = MODEL_UPDATE_INTERVAL.total_seconds()
+    published = now - MODEL_PUBLISH_DELAY
+    boundary = (published.timestamp() // interval + 1) * interval
+    return datetime.fromtimestamp(boundary, tz=timezone.utc) + MODEL_PUBLISH_DELAY
+
+
+def _read_cached_forecast(path: Path, now: datetime) -> dict | None:
+    try:
+        with np.load(path, allow_pickle=False) as cached:
+            if now.timestamp() >= float(cached["expires_at"]):
+                return None
+            return {name: cached[name] for name in cached.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
 
+def _write_cached_forecast(path: Path, arrays: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".npz")
+    with os.fdopen(fd, "wb") as handle:
+        np.savez_compressed(handle, **arrays)
+    os.replace(tmp_path, path)
 
-def fetch_london_hourly_forecast() -> pd.DataFrame:
+
+def _log_forecast_summary(arrays: dict, latitude: float, longitude: float, source: str) -> None:
+    times = arrays["time"]
+    summary = f"Forecast ({source}) {latitude:.3f},{longitude:.3f}: {len(times)} hours"
+    if len(times):
+        start = datetime.fromtimestamp(int(times[0]), tz=timezone.utc)
+        end = datetime.fromtimestamp(int(times[-1]), tz=timezone.utc)
+        summary += f" {start:%Y-%m-%d %H:%M}..{end:%Y-%m-%d %H:%M} UTC"
+    if "temperature_2m" in arrays and len(times):
+        summary += f", temp {np.nanmin(arrays['temperature_2m']):.1f}..{np.nanmax(arrays['temperature_2m']):.1f} C"
+    if "rain" in arrays and len(times):
+        summary += f", rain total {np.nansum(arrays['rain']):.1f} mm"
+    logger.info(summary)
+
+
+def fetch_hourly_forecasts(
+    sites: dict[str, tuple[float, float]],
+    variables: list[str] = HOURLY_VARIABLES,
+    use_cache: bool = True,
+) -> dict[str, dict]:
+    """
+    Fetch hourly forecasts for several sites, reusing cached copies until the next model run.
+
+    Sites without a fresh cached forecast are fetched together in one
+    multi-coordinate Open-Meteo request.
+
+    Args:
+        sites: Site name -> (latitude, longitude)
+        variables: Open-Meteo hourly variables to request
+        use_cache: Serve fresh cached forecasts instead of calling the API
+
+    Returns:
+        dict: Site name -> {"time": UTC epoch seconds, variable: float array, ...}
+    """
     _ensure_data_path()
-    response = requests.get(
-        "https://api.open-meteo.com/v1/forecast",
-        params={
-            "latitude": 51.5085,
-            "longitude": -0.1257,
-            "hourly": [
-                "temperature_2m",
-                "apparent_temperature",
-                "rain",
-                "cloud_cover",
-                "cloud_cover_low",
-                "cloud_cover_mid",
-                "cloud_cover_high",
-            ],
-        },
-        timeout=30,
-    )
-    response.raise_for_status()
-    forecast = response.json()
+    now = datetime.now(timezone.utc)
+    forecasts = {}
+    missing = []
+    for site, (latitude, longitude) in sites.items():
+        cache_path = FORECAST_CACHE_PATH / f"{forecast_cache_key(latitude, longitude, variables)}.npz"
+        cached = _read_cached_forecast(cache_path, now) if use_cache else None
+        if cached is None:
+            missing.append((site, latitude, longitude, cache_path))
+            continue
+        forecasts[site] = {name: cached[name] for name in ["time", *variables]}
+        _log_forecast_summary(forecasts[site], latitude, longitude, "cache")
 
-    logger.info(f"API Response: {forecast}")
-    hourly = forecast["hourly"]
+    if missing:
+        with span("weather.open_meteo", sites=len(missing)) as fetch_span:
+            response = requests.get(
+                OPEN_METEO_URL,
+                params={
+                    "latitude": ",".join(str(latitude) for _, latitude, _, _ in missing),
+                    "longitude": ",".join(str(longitude) for _, _, longitude, _ in missing),
+                    "hourly": variables,
+                    "timeformat": "unixtime",
+                },
+                timeout=30,
+            )
+            response.raise_for_status()
+            fetch_span.set(bytes=len(response.content))
+            payload = response.json()
+        # A single coordinate returns one object; several return a list in request order.
+        locations = payload if isinstance(payload, list) else [payload]
+        expires_at = np.float64(next_model_update(now).timestamp())
+        for (site, latitude, longitude, cache_path), location in zip(missing, locations):
+            hourly = location["hourly"]
+            arrays = {"time": np.asarray(hourly["time"], dtype=np.int64)}
+            for name in variables:
+                # Open-Meteo reports missing values as null, which become NaN here.
+                arrays[name] = np.array(hourly[name], dtype=np.float64)
+            _write_cached_forecast(cache_path, {**arrays, "fetched_at": np.float64(now.timestamp()), "expires_at": expires_at})
+            _log_forecast_summary(arrays, latitude, longitude, "api")
+            forecasts[site] = arrays
 
-    hourly_dataframe = pd.DataFrame(
-        {
-            "date": pd.to_datetime(hourly["time"], utc=True),
-            "temperature_2m": hourly["temperature_2m"],
-            "apparent_temperature": hourly["apparent_temperature"],
-            "rain": hourly["rain"],
-            "cloud_cover": hourly["cloud_cover"],
-        }
-    )
-    hourly_dataframe.replace([float("inf"), float("-inf")], pd.NA, inplace=True)
-    hourly_dataframe.dropna(inplace=True)
+    return {site: forecasts[site] for site in sites}
+
+
+def fetch_hourly_forecast(
+    latitude: float,
+    longitude: float,
+    variables: list[str] = HOURLY_VARIABLES,
+    use_cache: bool = True,
+) -> dict:
+    """Fetch the hourly forecast for one location; see fetch_hourly_forecasts."""
+    return fetch_hourly_forecasts({"site": (latitude, longitude)}, variables, use_cache)["site"]
+
+
+def forecast_dataframe(arrays: dict) -> pd.DataFrame:
+    """Build the hourly DataFrame used for charts, dropping hours with missing or infinite values."""
+    columns = ["temperature_2m", "apparent_temperature", "rain", "cloud_cover"]
+    values = np.column_stack([arrays[name] for name in columns])
+    keep = np.isfinite(values).all(axis=1)
+    hourly_dataframe = pd.DataFrame(values[keep], columns=columns)
+    hourly_dataframe.insert(0, "date", pd.to_datetime(arrays["time"][keep], unit="s", utc=True).as_unit("ns"))
     return hourly_dataframe
 
 
-def create_forecast_charts(hourly_dataframe: pd.DataFrame, timestamp: str) -> tuple[Path, Path]:
+def fetch_london_hourly_forecast(use_cache: bool = True) -> pd.DataFrame:
+    return forecast_dataframe(fetch_hourly_forecast(*LONDON, use_cache=use_cache))
+
+
+def _render_site_charts(site: str, hourly_dataframe: pd.DataFrame, timestamp: str, renderer: str) -> tuple[str, Path, Path]:
+    # Runs in a worker process; loguru is process-local, so log the result in the parent.
+    temperature_path, cloud_path = create_forecast_charts(hourly_dataframe, timestamp, site, renderer)
+    return site, temperature_path, cloud_path
+
+
+def render_site_charts(
+    frames: dict[str, pd.DataFrame],
+    timestamp: str,
+    max_workers: int | None = None,
+    renderer: str = DEFAULT_CHART_RENDERER,
+) -> dict[str, tuple[Path, Path]]:
+    """
+    Render the charts for every site, one worker process per site.
+
+    Each worker pays the matplotlib import again, so with one site or one CPU
+    the charts are rendered in-process instead.
+
+    Returns:
+        dict: Site name -> (temperature_path, cloud_path)
+    """
+    workers = min(len(frames), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return {site: create_forecast_charts(frame, timestamp, site, renderer) for site, frame in frames.items()}
+    charts = {}
+    # Spawned workers avoid forking the threaded Streamlit server.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(_render_site_charts, site, frame, timestamp, renderer) for site, frame in frames.items()]
+        for future in as_completed(futures):
+            site, temperature_path, cloud_path = future.result()
+            logger.info(f"Saved charts for {site}")
+            charts[site] = (temperature_path, cloud_path)
+    return {site: charts[site] for site in frames}
+
+
+def chart_paths(timestamp: str, site: str = DEFAULT_SITE) -> tuple[Path, Path]:
+    prefix = "" if site == DEFAULT_SITE else f"{site_slug(site)}-"
+    return DATA_PATH / f"7dayforecast-{prefix}{timestamp}.png", DATA_PATH / f"7dayforcast-cloud-{prefix}{timestamp}.png"
+
+
+class ChartTemplate:
+    """
+    A reusable Agg figure whose lines are updated in place for each chart.
+
+    Axes, styling, fonts and artists are created once per process; rendering
+    a forecast only swaps the line data, rescales and saves. A lock
+    serialises renders because Streamlit sessions share the template.
+    """
+
+    def __init__(self, series: list[tuple[str, str, float]], fill: tuple[str, str] | None = None):
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self._date2num = mdates.date2num
+        self.figure = Figure(figsize=CHART_SIZE)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.lines = {
+            name: self.ax.plot([], [], color=color, linewidth=linewidth)[0]
+            for name, color, linewidth in series
+        }
+        self.fill = fill
+        self._fill_artist = None
+        self.ax.xaxis_date()
+        self.ax.set_xlabel("date")
+        self.ax.set_ylabel(series[0][0])
+        self.ax.yaxis.grid(True, linestyle="--", linewidth=0.5, color="#888888")
+        self.ax.xaxis.grid(False)
+        for side in ("top", "right", "left"):
+            self.ax.spines[side].set_visible(False)
+        self.lock = threading.Lock()
+
+    def render(self, hourly_dataframe: pd.DataFrame, title: str, path: Path) -> Path:
+        x = self._date2num(hourly_dataframe["date"].dt.tz_convert(None).to_numpy())
+        with self.lock:
+            for name, line in self.lines.items():
+                line.set_data(x, hourly_dataframe[name].to_numpy())
+            if self.fill:
+                if self._fill_artist is not None:
+                    self._fill_artist.remove()
+                name, color = self.fill
+                self._fill_artist = self.ax.fill_between(x, hourly_dataframe[name].to_numpy(), color=color, linewidth=2)
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.ax.set_title(title)
+            self.figure.savefig(path)
+        return path
+
+
+@lru_cache(maxsize=None)
+def chart_template(kind: str) -> ChartTemplate:
+    """The per-process template for "temperature" or "cloud" charts."""
+    if kind == "temperature":
+        return ChartTemplate(TEMPERATURE_SERIES)
+    return ChartTemplate(CLOUD_SERIES, fill=CLOUD_FILL)
+
+
+def create_forecast_charts(
+    hourly_dataframe: pd.DataFrame,
+    timestamp: str,
+    site: str = DEFAULT_SITE,
+    renderer: str = DEFAULT_CHART_RENDERER,
+) -> tuple[Path, Path]:
+    if renderer == "seaborn":
+        return create_forecast_charts_seaborn(hourly_dataframe, timestamp, site)
+
+    DATA_PATH.mkdir(exist_ok=True)
+    temperature_path, cloud_path = chart_paths(timestamp, site)
+    chart_template("temperature").render(hourly_dataframe, f"7-Day Forecast {site} - Temp & Rain - {timestamp}", temperature_path)
+    logger.info("Saved Image File. - TEMP")
+    chart_template("cloud").render(hourly_dataframe, f"7-Day Forecast {site} - Cloud Cover - {timestamp}", cloud_path)
+    logger.info("Saved Image File. - CLOUD")
+    return temperature_path, cloud_path
+
+
+def create_forecast_charts_seaborn(hourly_dataframe: pd.DataFrame, timestamp: str, site: str = DEFAULT_SITE) -> tuple[Path, Path]:
     import matplotlib.pyplot as plt
     import seaborn as sns
 
-    temperature_path = DATA_PATH / f"7dayforecast-{timestamp}.png"
-    cloud_path = DATA_PATH / f"7dayforcast-cloud-{timestamp}.png"
+    DATA_PATH.mkdir(exist_ok=True)
+    temperature_path, cloud_path = chart_paths(timestamp, site)
 
-    fig, ax = plt.subplots(figsize=(12, 5))
+    fig, ax = plt.subplots(figsize=CHART_SIZE)
     sns.lineplot(data=hourly_dataframe, x="date", y="temperature_2m", color="#d95442", linewidth=4)
     sns.lineplot(data=hourly_dataframe, x="date", y="apparent_temperature", color="#d7d8d7", linewidth=2)
     sns.lineplot(data=hourly_dataframe, x="date", y="rain", color="#50b2d4", linewidth=3)
@@ -71,12 +337,12 @@ def create_forecast_charts(hourly_dataframe: pd.DataFrame, timestamp: str) -> tu
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
     ax.spines["left"].set_visible(False)
-    plt.title(f"7-Day Forecast London - Temp & Rain - {timestamp}")
+    plt.title(f"7-Day Forecast {site} - Temp & Rain - {timestamp}")
     plt.savefig(temperature_path)
     plt.close(fig)
     logger.info("Saved Image File. - TEMP")
 
-    fig, ax = plt.subplots(figsize=(12, 5))
+    fig, ax = plt.subplots(figsize=CHART_SIZE)
     sns.lineplot(data=hourly_dataframe, x="date", y="cloud_cover", color="#1e293b", linewidth=1)
     plt.fill_between(hourly_dataframe["date"], hourly_dataframe["cloud_cover"], color="#0ea5e9", linewidth=2)
     ax.spines["top"].set_visible(False)
@@ -84,7 +350,7 @@ def create_forecast_charts(hourly_dataframe: pd.DataFrame, timestamp: str) -> tu
     ax.spines["left"].set_visible(False)
     ax.yaxis.grid(True, linestyle="--", linewidth=0.5, color="#888888")
     ax.xaxis.grid(False)
-    plt.title(f"7-Day Forecast London - Cloud Cover - {timestamp}")
+    plt.title(f"7-Day Forecast {site} - Cloud Cover - {timestamp}")
     plt.savefig(cloud_path)
     plt.close(fig)
     logger.info("Saved Image File. - CLOUD")
@@ -99,27 +365,172 @@ def write_blocks(nh: NotionHelper, page_id: str, temperature_path: Path, cloud_p
     logger.info("Image 2 uploaded to Notion")
 
 
-def run_forecast(notion_token: str, database_id: str = DEFAULT_WEATHER_DATABASE_ID) -> dict:
-    current_time = datetime.now()
-    timestamp = current_time.strftime("%Y-%m-%d_%H-%M-%S")
-    notion_date = current_time.strftime("%Y-%m-%d")
+def has_site_property(nh: NotionHelper, database_id: str) -> bool:
+    """Whether the weather database has a SITE_PROPERTY text column; the schema is only read."""
+    with _site_property_lock:
+        if database_id not in _site_property_present:
+            property_type = nh.get_data_source(database_id).get("properties", {}).get(SITE_PROPERTY, {}).get("type")
+            _site_property_present[database_id] = property_type == "rich_text"
+            if not _site_property_present[database_id]:
+                logger.info(
+                    f"Weather database {database_id} has no {SITE_PROPERTY} text property; pages are created "
+                    "without a site and only pages created from this machine are updated in place"
+                )
+        return _site_property_present[database_id]
 
-    hourly_dataframe = fetch_london_hourly_forecast()
-    temperature_path, cloud_path = create_forecast_charts(hourly_dataframe, timestamp)
 
-    nh = NotionHelper(notion_token)
-    output = nh.new_page_to_data_source(
-        database_id,
-        page_properties={"Date": {"date": {"start": notion_date}}},
-    )
+def create_forecast_page(
+    nh: NotionHelper,
+    database_id: str,
+    notion_date: str,
+    temperature_path: Path,
+    cloud_path: Path,
+    site: str | None = None,
+) -> str:
+    page_properties = {"Date": {"date": {"start": notion_date}}}
+    if site is not None:
+        page_properties[SITE_PROPERTY] = {"rich_text": [{"text": {"content": site}}]}
+    output = nh.new_page_to_data_source(database_id, page_properties=page_properties)
     logger.info("Notion Page Created")
     page_id = output["id"]
     write_blocks(nh, page_id, temperature_path, cloud_path)
+    return page_id
+
+
+def replace_forecast_blocks(nh: NotionHelper, page_id: str, temperature_path: Path, cloud_path: Path) -> str:
+    """Trash the blocks on an existing forecast page and embed the new charts."""
+    url = f"https://api.notion.com/v1/blocks/{page_id}/children"
+    block_ids = []
+    cursor = None
+    while True:
+        params = {"page_size": 100, **({"start_cursor": cursor} if cursor else {})}
+        response = nh._make_request("GET", url, params=params)
+        block_ids.extend(block["id"] for block in response.get("results", []))
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            break
+    for block_id in block_ids:
+        nh._make_request("PATCH", f"https://api.notion.com/v1/blocks/{block_id}", {"in_trash": True})
+    logger.info(f"Notion Page Updated ({len(block_ids)} blocks replaced)")
+    write_blocks(nh, page_id, temperature_path, cloud_path)
+    return page_id
+
+
+def find_forecast_page(nh: NotionHelper, database_id: str, site: str, notion_date: str) -> str | None:
+    """
+    Page holding `site`'s forecast for `notion_date`.
+
+    Pages created from this machine are found in the local page index.
+    Otherwise, when the database has SITE_PROPERTY, a single page in Notion
+    with that date and site is accepted, e.g. one created from another
+    machine. Pages without a site are never matched, so another site's page
+    cannot be overwritten.
+    """
+    page_id = forecast_history.page_for(site, notion_date)
+    if page_id or not has_site_property(nh, database_id):
+        return page_id
+    response = nh._make_request(
+        "POST",
+        f"https://api.notion.com/v1/data_sources/{database_id}/query",
+        {
+            "page_size": 2,
+            "filter": {
+                "and": [
+                    {"property": "Date", "date": {"equals": notion_date}},
+                    {"property": SITE_PROPERTY, "rich_text": {"equals": site}},
+                ]
+            },
+        },
+    )
+    results = response.get("results", [])
+    return results[0]["id"] if len(results) == 1 else None
+
+
+def compare_with_previous_run(site: str, hourly_dataframe: pd.DataFrame, run_at: datetime) -> dict | None:
+    """Store this run in the forecast history and summarise how it differs from the previous one."""
+    previous_path = forecast_history.previous_run_path(site, run_at)
+    forecast_history.store_run(site, hourly_dataframe, run_at)
+    if previous_path is None:
+        return None
+    changes = forecast_history.summarize_diff(
+        forecast_history.diff_runs(hourly_dataframe, forecast_history.load_run(previous_path))
+    )
+    logger.info(f"Forecast changes for {site} since {previous_path.stem}: {changes}")
+    return changes
+
+
+def run_forecasts(
+    notion_token: str,
+    database_id: str = DEFAULT_WEATHER_DATABASE_ID,
+    sites: dict[str, tuple[float, float]] | None = None,
+    use_cache: bool = True,
+    renderer: str = DEFAULT_CHART_RENDERER,
+    update_today: bool = False,
+) -> list[dict]:
+    """
+    Create (or update) one forecast page per site.
+
+    All sites are fetched in one Open-Meteo request, charts are rendered in
+    parallel worker processes and the Notion pages are written concurrently.
+    Each run is added to the local forecast history and compared with the
+    previous run for the same site.
+
+    Args:
+        notion_token: Notion integration token
+        database_id: Weather data source to add the pages to
+        sites: Site name -> (latitude, longitude); defaults to London
+        use_cache: Serve fresh cached forecasts instead of calling the API
+        renderer: Chart renderer, one of CHART_RENDERERS
+        update_today: Replace the charts on today's page for a site instead
+            of creating another page, when one exists
+
+    Returns:
+        list: One result dict per site, in the order given
+    """
+    from notion_cache import get_notion_helper
+
+    sites = sites or DEFAULT_SITES
+    current_time = datetime.now()
+    timestamp = current_time.strftime("%Y-%m-%d_%H-%M-%S")
+    notion_date = current_time.strftime("%Y-%m-%d")
+
+    with span("weather.fetch", sites=len(sites), use_cache=use_cache):
+        frames = {site: forecast_dataframe(arrays) for site, arrays in fetch_hourly_forecasts(sites, use_cache=use_cache).items()}
+    with span("weather.history"):
+        changes = {site: compare_with_previous_run(site, frame, current_time) for site, frame in frames.items()}
+    with span("weather.render_charts", sites=len(frames), renderer=renderer):
+        charts = render_site_charts(frames, timestamp, renderer=renderer)
+
+    nh = get_notion_helper(notion_token)
+    site_property = has_site_property(nh, database_id)
+    existing = {site: find_forecast_page(nh, database_id, site, notion_date) for site in sites} if update_today else {}
+
+    def write_page(site: str) -> str:
+        with span("weather.write_page", updated=bool(existing.get(site))):
+            if existing.get(site):
+                return replace_forecast_blocks(nh, existing[site], *charts[site])
+            return create_forecast_page(nh, database_id, notion_date, *charts[site], site=site if site_property else None)
+
+    with ThreadPoolExecutor(max_workers=min(len(sites), 4)) as executor:
+        page_ids = list(executor.map(write_page, list(sites)))
+
+    results = []
+    for site, page_id in zip(sites, page_ids):
+        forecast_history.record_page(site, notion_date, page_id)
+        results.append(
+            {
+                "site": site,
+                "page_id": page_id,
+                "updated": bool(existing.get(site)),
+                "timestamp": timestamp,
+                "temperature_path": charts[site][0],
+                "cloud_path": charts[site][1],
+                "rows": len(frames[site]),
+                "changes": changes[site],
+            }
+        )
+    return results
+
 
-    return {
-        "page_id": page_id,
-        "timestamp": timestamp,
-        "temperature_path": temperature_path,
-        "cloud_path": cloud_path,
-        "rows": len(hourly_dataframe),
-    }
+def run_forecast(notion_token: str, database_id: str = DEFAULT_WEATHER_DATABASE_ID, use_cache: bool = True) -> dict:
+    return run_forecasts(notion_token, database_id, DEFAULT_SITES, use_cache)[0]